@@ -0,0 +1,335 @@
+"""Token-budgeted conversation context.
+
+`BudgetedAgent` fits every prompt in a per model token budget. Tool results from earlier runs are cut first,
+then dropped, then the oldest runs are dropped. Runs that are not sent in full are kept as a rolling summary in
+the session state, extended incrementally as runs leave the history window, and added to the system message.
+
+The system message is assembled so its prefix is byte-identical across requests and users, which lets the provider
+serve it from its prompt cache. Volatile content goes last: the user context, the current time at the granularity
+of `context_datetime_format`, then the summary. The share of prompt tokens served from the cache is kept per run.
+"""
+
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+from agno.agent import Agent
+from agno.memory.agent import AgentRun
+from agno.models.message import Message
+from agno.run.messages import RunMessages
+from agno.utils.log import log_debug, logger
+
+from agents.settings import agent_settings
+
+# Key of the rolling summary in the session state
+SUMMARY_STATE_KEY = "context_summary"
+# Tokens added by the chat format to every message
+MESSAGE_OVERHEAD_TOKENS = 4
+TOOL_OUTPUT_OMITTED = "[tool output omitted to fit the context budget]"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_id: str) -> Optional[tiktoken.Encoding]:
+    """The tiktoken encoding of a model, None if it cannot be loaded, e.g. offline without a tiktoken cache."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_id)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Could not load the tiktoken encoding for {model_id}, estimating token counts: {e}")
+        return None
+
+
+def message_text(message: Message) -> str:
+    content = message.content
+    text = content if isinstance(content, str) else "" if content is None else json.dumps(content, default=str)
+    if message.tool_calls:
+        text += json.dumps(message.tool_calls, default=str)
+    return text
+
+
+class TokenCounter:
+    """Counts tokens with the model's tiktoken encoding, or estimates 4 characters a token without it."""
+
+    def __init__(self, model_id: str):
+        self.encoding = get_encoding(model_id)
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return (len(text) + 3) // 4
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def count_message(self, message: Message) -> int:
+        return self.count(message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """`text` cut to `max_tokens`, with a note of how much was cut."""
+        if self.encoding is None:
+            if len(text) <= max_tokens * 4:
+                return text
+            return f"{text[: max_tokens * 4]}... [{self.count(text) - max_tokens} tokens cut]"
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return f"{self.encoding.decode(tokens[:max_tokens])}... [{len(tokens) - max_tokens} tokens cut]"
+
+
+def _summary_line(counter: TokenCounter, user: Any, assistant: Any, tools: List[str]) -> str:
+    user_text = counter.truncate(" ".join(str(user or "").split()), 60)
+    assistant_text = counter.truncate(" ".join(str(assistant or "").split()), 100)
+    line = f"- User: {user_text} | Assistant: {assistant_text}"
+    if tools:
+        line += f" (tools: {', '.join(sorted(set(tools)))})"
+    return line
+
+
+def summarize_run(counter: TokenCounter, run: AgentRun) -> str:
+    response = run.response
+    tools: List[str] = []
+    for tool in (response.tools or []) if response else []:
+        name = tool.get("tool_name")
+        if name is not None:
+            tools.append(name)
+    return _summary_line(
+        counter, run.message.content if run.message else None, response.content if response else None, tools
+    )
+
+
+def summarize_messages(counter: TokenCounter, messages: List[Message]) -> str:
+    """Summary line of the messages of one history run."""
+    user = next((message.content for message in messages if message.role == "user"), None)
+    assistant = next(
+        (message.content for message in reversed(messages) if message.role == "assistant" and message.content), None
+    )
+    tools = [message.tool_name for message in messages if message.role == "tool" and message.tool_name]
+    return _summary_line(counter, user, assistant, tools)
+
+
+class ContextBuilder:
+    """Fits the messages of a run in a token budget and maintains the rolling summary of earlier runs."""
+
+    def __init__(
+        self,
+        model_id: str,
+        budget: Optional[int] = None,
+        tool_output_tokens: Optional[int] = None,
+        summary_tokens: Optional[int] = None,
+    ):
+        self.counter = TokenCounter(model_id)
+        self.budget: int = budget or agent_settings.context_token_budgets.get(
+            model_id, agent_settings.context_default_token_budget
+        )
+        self.tool_output_tokens: int = tool_output_tokens or agent_settings.context_tool_output_tokens
+        self.summary_tokens: int = summary_tokens or agent_settings.context_summary_tokens
+
+    def update_summary(self, summary: Optional[Dict[str, Any]], runs: List[AgentRun], upto: int) -> Dict[str, Any]:
+        """
+        Extend `summary` with the runs before `upto` it does not cover yet.
+
+        Args:
+            summary (Optional[Dict[str, Any]]): The summary stored with the session, if any.
+            runs (List[AgentRun]): The runs of the session.
+            upto (int): Runs before this index are no longer sent in full.
+
+        Returns:
+            Dict[str, Any]: The number of runs summarized and the summary lines, oldest dropped to fit the budget.
+        """
+        summary = summary or {}
+        summarized = summary.get("runs", 0)
+        lines: List[str] = list(summary.get("lines", []))
+        if summarized > len(runs):
+            summarized, lines = 0, []
+        for run in runs[summarized:upto]:
+            lines.append(summarize_run(self.counter, run))
+        return {"runs": max(summarized, upto), "lines": self.roll(lines)}
+
+    def roll(self, lines: List[str]) -> List[str]:
+        """The most recent `lines` that fit in the summary budget."""
+        kept: List[str] = []
+        total = 0
+        for line in reversed(lines):
+            total += self.counter.count(line) + 1
+            if total > self.summary_tokens:
+                break
+            kept.append(line)
+        return kept[::-1]
+
+    def fit(self, run_messages: RunMessages, summary_lines: List[str]) -> int:
+        """
+        Fit `run_messages` in the token budget, in place, and add the summary to the system message.
+
+        Returns:
+            int: The token count of the assembled messages.
+        """
+        messages = run_messages.messages
+        history = [message for message in messages if message.from_history]
+        # Cut the tool results of earlier runs, they are the bulk of tool-heavy turns
+        for message in history:
+            if message.role == "tool" and isinstance(message.content, str):
+                message.content = self.counter.truncate(message.content, self.tool_output_tokens)
+
+        counts = {id(message): self.counter.count_message(message) for message in messages}
+        total = sum(counts.values()) + self.counter.count("\n".join(summary_lines))
+        # Then drop them, oldest first
+        for message in history:
+            if total <= self.budget:
+                break
+            if message.role == "tool" and message.content != TOOL_OUTPUT_OMITTED:
+                message.content = TOOL_OUTPUT_OMITTED
+                total -= counts[id(message)] - (new_count := self.counter.count_message(message))
+                counts[id(message)] = new_count
+
+        # Then drop the oldest runs, keeping a summary line of each
+        runs: List[List[Message]] = []
+        for message in history:
+            if message.role == "user" or not runs:
+                runs.append([])
+            runs[-1].append(message)
+        dropped_lines: List[str] = []
+        while total > self.budget and runs:
+            run = runs.pop(0)
+            dropped_lines.append(summarize_messages(self.counter, run))
+            dropped = {id(message) for message in run}
+            messages[:] = [message for message in messages if id(message) not in dropped]
+            total -= sum(counts[message_id] for message_id in dropped)
+
+        lines = summary_lines + dropped_lines
+        system_message = run_messages.system_message
+        if lines and system_message is not None and isinstance(system_message.content, str):
+            system_message.content += (
+                "\n\n<summary_of_earlier_conversation>\n" + "\n".join(lines) + "\n</summary_of_earlier_conversation>"
+            )
+            total += self.counter.count("\n".join(dropped_lines)) + 10
+        if total > self.budget:
+            logger.warning(f"Prompt of {total} tokens is over the {self.budget} token budget")
+        return total
+
+
+def cached_tokens_ratio(metrics: Optional[Dict[str, Any]]) -> Optional[float]:
+    """
+    Share of the prompt tokens of a run served from the provider's prompt cache.
+
+    Args:
+        metrics (Optional[Dict[str, Any]]): Metrics of a run, with a list of values per metric.
+
+    Returns:
+        Optional[float]: The ratio, None if the provider did not report prompt tokens.
+    """
+    if not metrics:
+        return None
+    prompt_tokens = sum(metrics.get("prompt_tokens") or metrics.get("input_tokens") or [])
+    if not prompt_tokens:
+        return None
+    return round(cached_tokens(metrics) / prompt_tokens, 3)
+
+
+def cached_tokens(metrics: Optional[Dict[str, Any]]) -> int:
+    """Prompt tokens of a run served from the provider's prompt cache, 0 if the provider did not report any."""
+    if not metrics:
+        return 0
+    return sum((details or {}).get("cached_tokens") or 0 for details in metrics.get("prompt_tokens_details", []))
+
+
+class BudgetedAgent(Agent):
+    """An Agent whose prompts fit in a token budget, with a rolling summary of the runs left out.
+
+    The token count of the last prompt is kept in `prompt_tokens`, the share of the prompt tokens of the last run
+    served from the provider's prompt cache in `cached_tokens_ratio`.
+    """
+
+    prompt_tokens: Optional[int] = None
+    cached_tokens_ratio: Optional[float] = None
+
+    def get_system_message(self) -> Optional[Message]:
+        # Agno adds the current time, to the microsecond, right after the instructions. Leave it out there and add
+        # it after the user context instead, so everything before the user context is the same for every request.
+        add_datetime_to_instructions = self.add_datetime_to_instructions
+        self.add_datetime_to_instructions = False
+        try:
+            system_message = super().get_system_message()
+        finally:
+            self.add_datetime_to_instructions = add_datetime_to_instructions
+
+        datetime_format = agent_settings.context_datetime_format
+        if (
+            add_datetime_to_instructions
+            and datetime_format
+            and system_message is not None
+            and isinstance(system_message.content, str)
+        ):
+            current_time = datetime.now().astimezone().strftime(datetime_format)
+            system_message.content = f"{system_message.content.rstrip()}\n<current_time>{current_time}</current_time>\n"
+        return system_message
+
+    def get_run_messages(self, **kwargs: Any) -> RunMessages:
+        run_messages = super().get_run_messages(**kwargs)
+        if self.model is None:
+            return run_messages
+
+        builder = ContextBuilder(self.model.id)
+        runs = self.memory.runs if self.memory is not None else []
+        # Runs before the history window are only sent as their summary
+        upto = 0
+        if not self.add_history_to_messages:
+            upto = len(runs)
+        elif self.num_history_responses is not None:
+            upto = max(0, len(runs) - self.num_history_responses)
+
+        if self.session_state is None:
+            self.session_state = {}
+        summary = builder.update_summary(self.session_state.get(SUMMARY_STATE_KEY), runs, upto)
+        self.session_state[SUMMARY_STATE_KEY] = summary
+
+        self.prompt_tokens = builder.fit(run_messages, summary["lines"])
+        log_debug(f"Prompt tokens: {self.prompt_tokens} of {builder.budget}")
+        return run_messages
+
+    def get_chat_history(self, num_chats: Optional[int] = None) -> str:
+        """Use this function to get the chat history between the user and agent.
+        Long histories are cut to the most recent messages that fit, older chats are in the conversation summary.
+
+        Args:
+            num_chats: The number of chats to return.
+                Each chat contains 2 messages. One from the user and one from the agent.
+                Default: None
+
+        Returns:
+            str: A JSON of a list of dictionaries representing the chat history.
+
+        Example:
+            - To get the last chat, use num_chats=1.
+            - To get the last 5 chats, use num_chats=5.
+            - To get all chats, use num_chats=None.
+        """
+        result = super().get_chat_history(num_chats)
+        if not result or self.model is None:
+            return result
+
+        counter = TokenCounter(self.model.id)
+        history = json.loads(result)
+        kept: List[Dict[str, Any]] = []
+        total = 0
+        for message in reversed(history):
+            total += counter.count(json.dumps(message))
+            if total > agent_settings.context_chat_history_tokens:
+                break
+            kept.append(message)
+        kept.reverse()
+        if len(kept) < len(history):
+            omitted = {"role": "system", "content": f"{len(history) - len(kept)} earlier messages omitted"}
+            kept.insert(0, omitted)
+        return json.dumps(kept)
+
+    def aggregate_metrics_from_messages(self, messages: List[Message]) -> Dict[str, Any]:
+        # Called once at the end of every run
+        metrics = super().aggregate_metrics_from_messages(messages)
+        self.cached_tokens_ratio = cached_tokens_ratio(metrics)
+        if self.cached_tokens_ratio is not None:
+            logger.info(
+                f"{self.name} run prompt tokens: {sum(metrics.get('prompt_tokens', []))}, "
+                f"cached ratio: {self.cached_tokens_ratio}"
+            )
+        return metrics
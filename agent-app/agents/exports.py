@@ -0,0 +1,230 @@
+"""Streaming exports of data stored in agent sessions.
+
+Rows are read from Postgres with a server-side cursor and encoded one at a time, so memory stays flat however
+many runs or profiles a session holds.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.sql.expression import bindparam, text
+
+from db.session import db_engine
+
+# Tools whose results contain enriched LinkedIn profiles
+PROFILE_TOOLS = ["enrich_linkedin_profile_by_url", "enrich_linkedin_profile_by_email", "find_linkedin_profiles"]
+
+PROFILE_FIELDS = [
+    "linkedin_url",
+    "full_name",
+    "headline",
+    "current_title",
+    "current_company",
+    "location",
+    "emails",
+    "work_emails",
+    "personal_emails",
+    "phones",
+    "skills",
+    "run_id",
+    "source_tool",
+]
+
+
+def iter_tool_results(
+    storage_table: str, session_id: str, tool_names: List[str], run_id: Optional[str] = None, batch_size: int = 100
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the results of the given tools from a session's stored runs, oldest first.
+
+    Args:
+        storage_table (str): Agent storage table in the "ai" schema.
+        session_id (str): The session to read.
+        tool_names (List[str]): Names of the tools to return results for.
+        run_id (Optional[str]): Only return results from this run.
+        batch_size (int): Rows fetched from the server-side cursor at a time.
+
+    Yields:
+        Dict[str, Any]: The run_id, tool_name and content of each tool call.
+    """
+    stmt = text(
+        f"""
+        SELECT run.value -> 'response' ->> 'run_id' AS run_id,
+               tool.value ->> 'tool_name' AS tool_name,
+               tool.value -> 'content' AS content
+        FROM ai.{storage_table} AS s
+        CROSS JOIN LATERAL jsonb_array_elements(coalesce(s.memory -> 'runs', '[]'::jsonb))
+            WITH ORDINALITY AS run(value, run_index)
+        CROSS JOIN LATERAL jsonb_array_elements(coalesce(run.value -> 'response' -> 'tools', '[]'::jsonb))
+            WITH ORDINALITY AS tool(value, tool_index)
+        WHERE s.session_id = :session_id
+          AND tool.value ->> 'tool_name' IN :tool_names
+          AND (CAST(:run_id AS varchar) IS NULL OR run.value -> 'response' ->> 'run_id' = :run_id)
+        ORDER BY run.run_index, tool.tool_index
+        """
+    ).bindparams(bindparam("tool_names", expanding=True))
+    params = {"session_id": session_id, "tool_names": tool_names, "run_id": run_id}
+    with db_engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt, params)
+        for row in result.mappings():
+            yield dict(row)
+
+
+def _join(values: Any) -> Optional[str]:
+    if isinstance(values, list):
+        return "; ".join(str(value) for value in values if value)
+    return values
+
+
+def profiles_from_tool_result(tool_name: str, content: Any) -> Iterator[Dict[str, Any]]:
+    """Flatten the profiles in one tool result into export rows."""
+    # Tools returning strings are stored as JSON strings
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except json.JSONDecodeError:
+            return
+    if not isinstance(content, dict):
+        return
+
+    if tool_name == "find_linkedin_profiles":
+        for profile in content.get("profiles") or []:
+            yield {
+                "linkedin_url": profile.get("linkedin_url"),
+                "full_name": profile.get("name"),
+                "headline": profile.get("headline"),
+                "current_title": profile.get("current_title"),
+                "current_company": profile.get("current_company"),
+                "location": profile.get("location"),
+                "emails": _join(profile.get("emails")),
+                "work_emails": _join(profile.get("work_emails")),
+                "personal_emails": _join(profile.get("personal_emails")),
+                "phones": _join(profile.get("phones")),
+                "skills": _join(profile.get("skills")),
+            }
+    elif content.get("success"):
+        basic_info = content.get("basic_info") or {}
+        contact_info = content.get("contact_info") or {}
+        experience = content.get("experience") or []
+        current_role = experience[0] if experience and isinstance(experience[0], dict) else {}
+        yield {
+            "linkedin_url": content.get("linkedin_url"),
+            "full_name": basic_info.get("full_name"),
+            "headline": basic_info.get("headline"),
+            "current_title": current_role.get("title"),
+            "current_company": current_role.get("company_name") or (content.get("company") or {}).get("name"),
+            "location": basic_info.get("location"),
+            "emails": _join(contact_info.get("emails")),
+            "work_emails": _join(contact_info.get("work_emails")),
+            "personal_emails": _join(contact_info.get("personal_emails")),
+            "phones": _join(contact_info.get("phones")),
+            "skills": _join(content.get("skills")),
+        }
+
+
+def iter_profiles(storage_table: str, session_id: str, run_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the enriched profiles of a session, the first result per LinkedIn url only."""
+    seen_urls = set()
+    for tool_result in iter_tool_results(storage_table, session_id, PROFILE_TOOLS, run_id=run_id):
+        for profile in profiles_from_tool_result(tool_result["tool_name"], tool_result["content"]):
+            url = (profile.get("linkedin_url") or "").rstrip("/").lower()
+            if url and url in seen_urls:
+                continue
+            seen_urls.add(url)
+            yield {**profile, "run_id": tool_result["run_id"], "source_tool": tool_result["tool_name"]}
+
+
+def to_csv(rows: Iterator[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def to_ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def iter_chat_runs(storage_table: str, session_id: str, batch_size: int = 50) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the runs of a session, oldest first.
+
+    Args:
+        storage_table (str): Agent storage table in the "ai" schema.
+        session_id (str): The session to read.
+        batch_size (int): Runs fetched from the server-side cursor at a time.
+
+    Yields:
+        Dict[str, Any]: The run_id, the user message, the response and the tool calls of each run.
+    """
+    stmt = text(
+        f"""
+        SELECT run.value -> 'response' ->> 'run_id' AS run_id,
+               run.value -> 'response' -> 'created_at' AS created_at,
+               run.value -> 'message' -> 'content' AS message,
+               run.value -> 'response' -> 'content' AS response,
+               coalesce(run.value -> 'response' -> 'tools', '[]'::jsonb) AS tools
+        FROM ai.{storage_table} AS s
+        CROSS JOIN LATERAL jsonb_array_elements(coalesce(s.memory -> 'runs', '[]'::jsonb))
+            WITH ORDINALITY AS run(value, run_index)
+        WHERE s.session_id = :session_id
+        ORDER BY run.run_index
+        """
+    )
+    with db_engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            stmt, {"session_id": session_id}
+        )
+        for row in result.mappings():
+            run = dict(row)
+            run["tools"] = [
+                {"tool_name": tool.get("tool_name"), "tool_args": tool.get("tool_args"), "content": tool.get("content")}
+                for tool in run["tools"]
+                if isinstance(tool, dict)
+            ]
+            yield run
+
+
+def _text(content: Any) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, indent=2, default=str)
+
+
+def chat_to_markdown(runs: Iterator[Dict[str, Any]], title: str) -> Iterator[str]:
+    """Encode runs as a markdown transcript, one run per chunk."""
+    yield f"# {title} - Chat History\n\n"
+    for run in runs:
+        parts: List[str] = []
+        if run.get("message") is not None:
+            parts.append(f"### 👤 User\n{_text(run['message'])}\n\n")
+        if run.get("response") is not None or run.get("tools"):
+            parts.append(f"### 🤖 Assistant\n{_text(run.get('response'))}\n\n")
+        if run.get("tools"):
+            parts.append("#### Tool Calls:\n")
+            for i, tool in enumerate(run["tools"]):
+                parts.append(f"**{i + 1}. {tool.get('tool_name') or 'Unknown Tool'}**\n\n")
+                if tool.get("tool_args"):
+                    parts.append(f"Arguments: ```json\n{_text(tool['tool_args'])}\n```\n\n")
+                if tool.get("content") is not None:
+                    parts.append(f"Results: ```\n{_text(tool['content'])}\n```\n\n")
+        yield "".join(parts)
+
+
+def to_json_array(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Encode rows as one JSON array, one row per chunk."""
+    separator = "[\n"
+    for row in rows:
+        yield separator + json.dumps(row, default=str)
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
@@ -5,19 +5,19 @@ from textwrap import dedent
 from typing import Optional
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.storage.agent.postgres import PostgresAgentStorage
-from agno.tools.duckduckgo import DuckDuckGoTools
 
-from db.session import db_url
-from tools import ContactOutLinkedInTool
+from agents.context import BudgetedAgent
+from agents.models import TracedOpenAIChat
+from agents.resources import get_agent_storage
+from tools import ContactOutLinkedInTool, LinkedInDiscoveryTool, WebSearchTools
+from utils.settings import observability_settings
 
 
 def get_linkedin_researcher(
     model_id: str = "gpt-4o",
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
-    debug_mode: bool = True,
+    debug_mode: Optional[bool] = None,
 ) -> Agent:
     """Create a LinkedIn researcher agent with ContactOut LinkedIn extraction capabilities."""
     
@@ -30,19 +30,21 @@ def get_linkedin_researcher(
     # Initialize ContactOut LinkedIn tool
     contactout_tool = ContactOutLinkedInTool(api_token=getenv("CONTACTOUT_API_TOKEN"))
 
-    return Agent(
+    return BudgetedAgent(
         name="LinkedIn Researcher",
         agent_id="linkedin_researcher",
         user_id=user_id,
         session_id=session_id,
-        model=OpenAIChat(id=model_id),
+        model=TracedOpenAIChat(id=model_id),
         # Tools available to the agent
         tools=[
+            # Searches, validates and enriches profiles for a role at a company in a single call
+            LinkedInDiscoveryTool(contactout=contactout_tool),
             contactout_tool,
-            DuckDuckGoTools(),  # For additional research if needed
+            WebSearchTools(),  # For additional research if needed
         ],
         # Storage for the agent
-        storage=PostgresAgentStorage(table_name="linkedin_researcher_sessions", db_url=db_url),
+        storage=get_agent_storage("linkedin_researcher_sessions"),
         # Description of the agent
         description=dedent("""\
             You are LinkedIn Researcher, a specialized AI assistant that combines web search with LinkedIn profile enrichment.
@@ -68,6 +70,13 @@ def get_linkedin_researcher(
         instructions=dedent("""\
             You are a LinkedIn research specialist with a powerful workflow for finding and enriching LinkedIn profiles. Here's your process:
 
+            **Fast Path: Role at a Company**
+            When users request profiles by role/company (e.g., "find recruiters at Company X"):
+            - Call `find_linkedin_profiles(role, company)` once. It runs the searches, extracts and validates the
+              LinkedIn URLs and enriches them with ContactOut, and returns the final profiles.
+            - Summarize the returned profiles. Only fall back to the manual workflow below if it finds nothing
+              or the request is not a role/company lookup.
+
             **Core Workflow:**
 
             **Step 1: Search for LinkedIn Profiles**
@@ -77,6 +86,7 @@ def get_linkedin_researcher(
               - "site:linkedin.com/in/ founder [Company Name]"
               - "site:linkedin.com/in/ [Job Title] [Company Name]"
             - Look for multiple search variations to find comprehensive results
+            - Run the variations in a single `duckduckgo_multi_search(queries)` call instead of one search at a time
             - Extract LinkedIn profile URLs from the search results
 
             **Step 2: Enrich Profiles with ContactOut**
@@ -85,6 +95,9 @@ def get_linkedin_researcher(
             - Compile detailed information for each person found
 
             **Available Tools:**
+
+            0. **LinkedIn Discovery:**
+               - `find_linkedin_profiles(role, company, max_profiles)`: Search, validate and enrich in one call
             
             1. **Web Search (DuckDuckGo):**
                - Primary tool for finding LinkedIn profiles by role/company
@@ -141,6 +154,9 @@ def get_linkedin_researcher(
 
             **Example Workflow:**
             User: "Find recruiters at Microsoft"
+            1. Call `find_linkedin_profiles("recruiter", "Microsoft")` and present the results
+
+            Manual fallback:
             1. Search: "site:linkedin.com/in/ recruiter Microsoft"
             2. Search: "site:linkedin.com/in/ talent acquisition Microsoft"  
             3. Extract LinkedIn URLs from results
@@ -149,16 +165,17 @@ def get_linkedin_researcher(
 
             Remember: You're helping users build professional networks and find business contacts through legitimate research methods.\
         """),
+        # Context about the user, added after the static description and instructions so they stay cacheable
         additional_context=additional_context,
         # Format responses using markdown
         markdown=True,
-        # Add the current date and time to the instructions
+        # Add the current date and hour to the end of the system message
         add_datetime_to_instructions=True,
         # Send the last 3 messages from the chat history
         add_history_to_messages=True,
         num_history_responses=3,
         # Add a tool to read the chat history if needed
         read_chat_history=True,
-        # Show debug logs
-        debug_mode=debug_mode,
+        # Show debug logs, by default in dev only
+        debug_mode=observability_settings.get_agent_debug_mode() if debug_mode is None else debug_mode,
     ) 
\ No newline at end of file
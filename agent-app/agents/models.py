@@ -0,0 +1,63 @@
+"""Models the agents run on."""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List
+
+from agno.models.message import Message
+from agno.models.openai import OpenAIChat
+from agno.tools.function import FunctionCall
+
+from utils.tracing import span, traced_tool
+
+
+def _record_usage(model_span: Any, usage: Any) -> None:
+    if usage is None:
+        return
+    attributes = {"input_tokens": usage.prompt_tokens, "output_tokens": usage.completion_tokens}
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is not None and getattr(details, "cached_tokens", None) is not None:
+        attributes["cached_tokens"] = details.cached_tokens
+    model_span.set_attributes(attributes)
+
+
+@dataclass
+class TracedOpenAIChat(OpenAIChat):
+    """OpenAIChat that traces every model call and the tool calls it asks for."""
+
+    def invoke(self, messages: List[Message]) -> Any:
+        with span("model.invoke", model=self.id, stream=False) as model_span:
+            response = super().invoke(messages)
+            _record_usage(model_span, response.usage)
+            return response
+
+    async def ainvoke(self, messages: List[Message]) -> Any:
+        with span("model.invoke", model=self.id, stream=False) as model_span:
+            response = await super().ainvoke(messages)
+            _record_usage(model_span, response.usage)
+            return response
+
+    def invoke_stream(self, messages: List[Message]) -> Iterator[Any]:
+        with span("model.invoke", model=self.id, stream=True) as model_span:
+            for chunk in super().invoke_stream(messages):
+                # Usage comes with the last chunk
+                _record_usage(model_span, chunk.usage)
+                yield chunk
+
+    # Same signature as OpenAIChat.ainvoke_stream, which agno's Model declares as a coroutine taking *args, **kwargs
+    async def ainvoke_stream(self, messages: List[Message]) -> AsyncIterator[Any]:  # type: ignore[override]
+        with span("model.invoke", model=self.id, stream=True) as model_span:
+            async for chunk in super().ainvoke_stream(messages):
+                _record_usage(model_span, chunk.usage)
+                yield chunk
+
+    def get_function_calls_to_run(
+        self, assistant_message: Message, messages: List[Message], error_response_role: str = "user"
+    ) -> List[FunctionCall]:
+        function_calls = super().get_function_calls_to_run(assistant_message, messages, error_response_role)
+        for function_call in function_calls:
+            function = function_call.function
+            if function.entrypoint is not None:
+                function_call.function = function.model_copy(
+                    update={"entrypoint": traced_tool(function.name, function.entrypoint)}
+                )
+        return function_calls
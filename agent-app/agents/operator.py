@@ -12,6 +12,14 @@ class AgentType(Enum):
     LINKEDIN_RESEARCHER = "linkedin_researcher"
 
 
+# Postgres tables, in the "ai" schema, where each agent stores its sessions
+AGENT_STORAGE_TABLES = {
+    AgentType.SAGE: "sage_sessions",
+    AgentType.SCHOLAR: "scholar_sessions",
+    AgentType.LINKEDIN_RESEARCHER: "linkedin_researcher_sessions",
+}
+
+
 def get_available_agents() -> List[str]:
     """Returns a list of all available agent IDs."""
     return [agent.value for agent in AgentType]
@@ -22,7 +30,7 @@ def get_agent(
     agent_id: Optional[AgentType] = None,
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
-    debug_mode: bool = True,
+    debug_mode: Optional[bool] = None,
 ):
     if agent_id == AgentType.SAGE:
         return get_sage(model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode)
@@ -0,0 +1,54 @@
+"""Heavy agent components shared by every agent built in the process.
+
+Agents themselves are cheap and hold per-session state (session id, memory, run response), so the UI and the API
+build one per browser tab or request. What they are built from, storage and vector db tables with their engine and
+table metadata, is cached here once per process and shared by all of them.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from agno.storage.agent.postgres import PostgresAgentStorage
+from agno.storage.session import Session
+from agno.vectordb.pgvector import SearchType
+
+from db.session import db_engine
+from knowledge import KnowledgeVectorDb
+from utils.tracing import span
+
+# Namespaces, i.e. users, whose vector db is kept per knowledge table
+KNOWLEDGE_NAMESPACES_CACHED = 256
+
+
+class TracedPostgresAgentStorage(PostgresAgentStorage):
+    """PostgresAgentStorage that traces session reads and writes."""
+
+    def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        with span("storage.read", table=self.table_name) as storage_span:
+            session = super().read(session_id, user_id)
+            storage_span.set_attribute("found", session is not None)
+            return session
+
+    def upsert(self, session: Session, create_and_retry: bool = True) -> Optional[Session]:
+        with span("storage.upsert", table=self.table_name):
+            return super().upsert(session, create_and_retry)
+
+
+@lru_cache(maxsize=None)
+def get_agent_storage(table_name: str) -> PostgresAgentStorage:
+    """Session storage for the agents using `table_name`, on the shared database engine."""
+    return TracedPostgresAgentStorage(table_name=table_name, db_engine=db_engine)
+
+
+@lru_cache(maxsize=KNOWLEDGE_NAMESPACES_CACHED)
+def get_knowledge_vector_db(table_name: str, namespace: Optional[str] = None) -> KnowledgeVectorDb:
+    """Hybrid search vector db over `table_name`, scoped to `namespace`, on the shared database engine."""
+    return KnowledgeVectorDb(
+        table_name=table_name, db_engine=db_engine, search_type=SearchType.hybrid, namespace=namespace
+    )
+
+
+def clear_agent_resources() -> None:
+    """Drop the cached components, the next agent built creates them again."""
+    get_agent_storage.cache_clear()
+    get_knowledge_vector_db.cache_clear()
@@ -0,0 +1,214 @@
+"""Cost- and latency-aware model routing for the "auto" model.
+
+`ModelRouter` classifies a request with cheap heuristics into a request class, then picks the cheapest model that
+is good enough for the class and whose recent latency for the class is within the class's latency SLO. A run that
+fails before it produced any output is retried on the next candidate. Every routed run is logged with its model,
+latency, tokens and estimated cost.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agno.agent import Agent, RunResponse
+from agno.utils.log import logger
+
+from agents.models import TracedOpenAIChat
+from agents.settings import agent_settings
+
+# Model option that lets the router pick the model of every request
+AUTO_MODEL = "auto"
+
+RESEARCH_CUES = re.compile(
+    r"\b(search|find|look up|latest|recent|news|today|current|research|papers?|sources?|cite|citations?|"
+    r"linkedin|profiles?|compan(y|ies)|people|who works)\b|https?://",
+    re.IGNORECASE,
+)
+REASONING_CUES = re.compile(
+    r"\b(prove|calculate|compute|solve|derive|step by step|why|compare|analy[sz]e|plan|code|debug|algorithm|"
+    r"math|equation|optimi[sz]e)\b|\d+\s*[-+*/^=]\s*\d+",
+    re.IGNORECASE,
+)
+# Agents that research with tools on every request
+RESEARCH_AGENTS = ("linkedin_researcher",)
+
+
+@dataclass
+class RoutingDecision:
+    """The model picked for a request and the models to fall back to, in order."""
+
+    request_class: str
+    reason: str
+    candidates: List[str]
+    # Models tried so far, the last one served the run
+    tried: List[str] = field(default_factory=list)
+
+    @property
+    def model_id(self) -> str:
+        return self.tried[-1] if self.tried else self.candidates[0]
+
+
+def classify_request(message: str, agent_id: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Classify a request with cheap heuristics.
+
+    Args:
+        message (str): The user message.
+        agent_id (Optional[str]): The agent the message is for.
+
+    Returns:
+        Tuple[str, str]: The request class, "simple", "reasoning" or "research", and why.
+    """
+    if agent_id in RESEARCH_AGENTS:
+        return "research", f"{agent_id} agent"
+    if match := RESEARCH_CUES.search(message):
+        return "research", f"research cue '{match.group(0)}'"
+    if match := REASONING_CUES.search(message):
+        return "reasoning", f"reasoning cue '{match.group(0)}'"
+    words = len(message.split())
+    if words <= agent_settings.routing_simple_max_words:
+        return "simple", f"{words} words"
+    return "research", f"{words} words"
+
+
+def initial_model(model_id: str) -> str:
+    """The model to build an agent on for the model option `model_id`, runs of "auto" agents are routed later."""
+    return agent_settings.routing_default_model if model_id == AUTO_MODEL else model_id
+
+
+def set_model(agent: Agent, model_id: str) -> None:
+    """Run the agent's next runs on `model_id`, keeping its session."""
+    if agent.model is None or agent.model.id != model_id:
+        agent.model = TracedOpenAIChat(id=model_id)
+
+
+class ModelRouter:
+    """Routes requests to the cheapest good enough model, within the latency SLO of their class."""
+
+    def __init__(
+        self,
+        models: Optional[Dict[str, List[str]]] = None,
+        costs: Optional[Dict[str, List[float]]] = None,
+        latency_slos: Optional[Dict[str, float]] = None,
+    ):
+        self.models: Dict[str, List[str]] = models or agent_settings.routing_models
+        self.costs: Dict[str, List[float]] = costs or agent_settings.routing_model_costs
+        self.latency_slos: Dict[str, float] = latency_slos or agent_settings.routing_latency_slos
+        # Moving average of the response time of each model per request class, and when it was last updated
+        self._latency: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._lock = Lock()
+
+    def cost(self, model_id: str, input_tokens: int = 1_000_000, output_tokens: int = 0) -> float:
+        """USD cost of `input_tokens` and `output_tokens` on `model_id`, infinite for models without a price."""
+        if model_id not in self.costs:
+            return float("inf")
+        input_cost, output_cost = self.costs[model_id]
+        return (input_tokens * input_cost + output_tokens * output_cost) / 1_000_000
+
+    def latency(self, request_class: str, model_id: str) -> Optional[float]:
+        """Recent response time of `model_id` for `request_class`, None if it has not run one lately."""
+        with self._lock:
+            latency = self._latency.get((request_class, model_id))
+        if latency is None or time.monotonic() - latency[1] > agent_settings.routing_latency_ttl:
+            return None
+        return latency[0]
+
+    def route(self, message: str, agent_id: Optional[str] = None) -> RoutingDecision:
+        """
+        Pick the model for a request.
+
+        Models good enough for the request class are tried cheapest first. Models whose recent latency for the
+        class is over its SLO go after the ones within it, the other models go last as fallbacks.
+        """
+        request_class, reason = classify_request(message, agent_id)
+        good_enough = sorted(self.models.get(request_class, []), key=self.cost)
+        slo = self.latency_slos.get(request_class)
+        if slo is not None:
+            within_slo = [m for m in good_enough if (self.latency(request_class, m) or 0) <= slo]
+            if within_slo and within_slo[0] != good_enough[0]:
+                reason += f", {good_enough[0]} over the {slo}s SLO"
+            good_enough = within_slo + [m for m in good_enough if m not in within_slo]
+        fallbacks = sorted((m for m in self.costs if m not in good_enough), key=self.cost)
+        candidates = good_enough + fallbacks
+        if not candidates:
+            raise ValueError(f"No model to route {request_class} requests to")
+        return RoutingDecision(request_class=request_class, reason=reason, candidates=candidates)
+
+    def observe(
+        self,
+        decision: RoutingDecision,
+        latency: float,
+        metrics: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Record the response time of the model that ran the request and log the routing decision."""
+        model_id = decision.model_id
+        key = (decision.request_class, model_id)
+        # A failed run counts as twice the SLO, so the next requests prefer another model for a while
+        slo = self.latency_slos.get(decision.request_class)
+        observed = latency if error is None or slo is None else max(latency, 2 * slo)
+        alpha = agent_settings.routing_latency_alpha
+        previous = self.latency(decision.request_class, model_id)
+        with self._lock:
+            average = observed if previous is None else alpha * observed + (1 - alpha) * previous
+            self._latency[key] = (average, time.monotonic())
+
+        if error is not None:
+            logger.warning(
+                f"Routed {decision.request_class} request to {model_id} ({decision.reason}) failed after "
+                f"{latency:.2f}s: {error}"
+            )
+            return
+        metrics = metrics or {}
+        input_tokens = sum(metrics.get("input_tokens", []))
+        output_tokens = sum(metrics.get("output_tokens", []))
+        logger.info(
+            f"Routed {decision.request_class} request to {model_id} ({decision.reason}): {latency:.2f}s, "
+            f"{input_tokens} input and {output_tokens} output tokens, "
+            f"${self.cost(model_id, input_tokens, output_tokens):.4f}, tried {decision.tried}"
+        )
+
+    async def arun(self, agent: Agent, message: str, decision: RoutingDecision) -> RunResponse:
+        """Run `agent` on the decision's model, falling back to the next candidate on errors."""
+        for i, model_id in enumerate(decision.candidates):
+            set_model(agent, model_id)
+            decision.tried.append(model_id)
+            start = time.perf_counter()
+            try:
+                response = await agent.arun(message, stream=False)
+            except Exception as e:
+                self.observe(decision, time.perf_counter() - start, error=e)
+                if i == len(decision.candidates) - 1:
+                    raise
+                continue
+            self.observe(decision, time.perf_counter() - start, response.metrics)
+            return response
+        raise ValueError("No model to run the request on")
+
+    async def astream(self, agent: Agent, message: str, decision: RoutingDecision) -> AsyncIterator[RunResponse]:
+        """Stream `agent`'s response from the decision's model, falling back to the next candidate on errors
+        raised before the first chunk. Errors after it are raised, the response cannot be taken back."""
+        for i, model_id in enumerate(decision.candidates):
+            set_model(agent, model_id)
+            decision.tried.append(model_id)
+            start = time.perf_counter()
+            streamed = False
+            try:
+                run_response = await agent.arun(message, stream=True)
+                async for chunk in run_response:
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                self.observe(decision, time.perf_counter() - start, error=e)
+                if streamed or i == len(decision.candidates) - 1:
+                    raise
+                continue
+            metrics = agent.run_response.metrics if agent.run_response is not None else None
+            self.observe(decision, time.perf_counter() - start, metrics)
+            return
+
+
+# Shared by the API and the UI, so latency observed by one steers the routing of both
+model_router = ModelRouter()
@@ -2,19 +2,19 @@ from textwrap import dedent
 from typing import Optional
 
 from agno.agent import Agent, AgentKnowledge
-from agno.models.openai import OpenAIChat
-from agno.storage.agent.postgres import PostgresAgentStorage
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.vectordb.pgvector import PgVector, SearchType
 
-from db.session import db_url
+from agents.context import BudgetedAgent
+from agents.models import TracedOpenAIChat
+from agents.resources import get_agent_storage, get_knowledge_vector_db
+from tools import WebSearchTools
+from utils.settings import observability_settings
 
 
 def get_sage(
     model_id: str = "gpt-4o",
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
-    debug_mode: bool = True,
+    debug_mode: Optional[bool] = None,
 ) -> Agent:
     additional_context = ""
     if user_id:
@@ -22,19 +22,20 @@ def get_sage(
         additional_context += f"You are interacting with the user: {user_id}"
         additional_context += "</context>"
 
-    return Agent(
+    return BudgetedAgent(
         name="Sage",
         agent_id="sage",
         user_id=user_id,
         session_id=session_id,
-        model=OpenAIChat(id=model_id),
+        model=TracedOpenAIChat(id=model_id),
         # Tools available to the agent
-        tools=[DuckDuckGoTools()],
+        tools=[WebSearchTools()],
         # Storage for the agent
-        storage=PostgresAgentStorage(table_name="sage_sessions", db_url=db_url),
+        storage=get_agent_storage("sage_sessions"),
         # Knowledge base for the agent
         knowledge=AgentKnowledge(
-            vector_db=PgVector(table_name="sage_knowledge", db_url=db_url, search_type=SearchType.hybrid)
+            # Each user only searches and manages their own documents
+            vector_db=get_knowledge_vector_db("sage_knowledge", namespace=user_id)
         ),
         # Description of the agent
         description=dedent("""\
@@ -83,16 +84,17 @@ def get_sage(
 
             7. In case of any uncertainties, clarify limitations and encourage follow-up queries.\
         """),
+        # Context about the user, added after the static description and instructions so they stay cacheable
         additional_context=additional_context,
         # Format responses using markdown
         markdown=True,
-        # Add the current date and time to the instructions
+        # Add the current date and hour to the end of the system message
         add_datetime_to_instructions=True,
         # Send the last 3 messages from the chat history
         add_history_to_messages=True,
         num_history_responses=3,
         # Add a tool to read the chat history if needed
         read_chat_history=True,
-        # Show debug logs
-        debug_mode=debug_mode,
+        # Show debug logs, by default in dev only
+        debug_mode=observability_settings.get_agent_debug_mode() if debug_mode is None else debug_mode,
     )
@@ -0,0 +1,56 @@
+from typing import Dict, List
+
+from pydantic_settings import BaseSettings
+
+
+class AgentSettings(BaseSettings):
+    """Agent settings that can be set using environment variables.
+
+    Reference: https://docs.pydantic.dev/latest/usage/pydantic_settings/
+    """
+
+    # Tokens of conversation context (system message, summary, history and user message) sent per model,
+    # models not listed use the default
+    context_token_budgets: Dict[str, int] = {"gpt-4o": 16000, "o3-mini": 16000}
+    context_default_token_budget: int = 16000
+    # Tool results from earlier runs are cut to this many tokens before anything else is dropped
+    context_tool_output_tokens: int = 400
+    # Tokens kept in the rolling summary of runs no longer sent in full, oldest lines are dropped first
+    context_summary_tokens: int = 800
+    # Tokens returned by the get_chat_history tool
+    context_chat_history_tokens: int = 4000
+    # strftime format of the current time added at the end of the system message. Coarser formats keep the
+    # message identical for longer, an empty format leaves the time out.
+    context_datetime_format: str = "%Y-%m-%d %H:00 %Z"
+
+    # Models good enough for each request class of the "auto" model, the cheapest is tried first
+    routing_models: Dict[str, List[str]] = {
+        "simple": ["o3-mini", "gpt-4o"],
+        "reasoning": ["o3-mini", "gpt-4o"],
+        "research": ["gpt-4o"],
+    }
+    # USD per million input and output tokens. Models not listed for a class are its fallbacks on errors.
+    routing_model_costs: Dict[str, List[float]] = {"gpt-4o": [2.5, 10.0], "o3-mini": [1.1, 4.4]}
+    # Seconds a whole response may take per request class. A model whose recent latency for a class is over
+    # its SLO is only used when no good enough model is within it.
+    routing_latency_slos: Dict[str, float] = {"simple": 8.0, "reasoning": 60.0, "research": 120.0}
+    # Model "auto" agents are built on, before their first run is routed
+    routing_default_model: str = "gpt-4o"
+    # Weight of the latest run in the moving average of a model's latency
+    routing_latency_alpha: float = 0.3
+    # Seconds a model's latency is remembered, a model over the SLO gets another chance once it is forgotten
+    routing_latency_ttl: float = 600.0
+    # Messages up to this many words, without research or reasoning cues, are simple
+    routing_simple_max_words: int = 20
+
+    # Record the tokens, tool calls, ContactOut credits and time of every run in the run_usage table
+    usage_enabled: bool = True
+    # Usage rows are written in the background, this many per insert or every flush interval in seconds
+    usage_batch_size: int = 200
+    usage_flush_interval: float = 2.0
+    # Rows waiting to be written, further rows are dropped with a warning when the database falls behind
+    usage_max_pending: int = 10000
+
+
+# Create AgentSettings object
+agent_settings = AgentSettings()
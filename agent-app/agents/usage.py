@@ -0,0 +1,173 @@
+"""Per-run usage accounting, persisted to the run_usage table.
+
+`track_usage` records the tokens, cached tokens, tool calls, ContactOut credits, estimated cost and wall time of
+an agent run. Rows are handed to `UsageWriter`, which inserts them in batches from a background thread, so a run
+never waits on the database for its accounting. The API aggregates them at /v1/usage.
+"""
+
+import asyncio
+import atexit
+import json
+import math
+import time
+from contextlib import contextmanager
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional
+
+from agno.agent import Agent
+from agno.utils.log import logger
+from sqlalchemy.sql.expression import insert
+
+from agents.context import cached_tokens
+from agents.routing import model_router
+from agents.settings import agent_settings
+from db.session import SessionLocal
+from db.tables import RunUsage
+
+# ContactOut tools that enrich a single profile, one credit per successful call
+CONTACTOUT_PROFILE_TOOLS = ("enrich_linkedin_profile_by_url", "enrich_linkedin_profile_by_email")
+
+
+def contactout_credits(tools: Optional[List[Dict[str, Any]]]) -> int:
+    """Profiles enriched with ContactOut by the tool calls of a run."""
+    credits = 0
+    for tool in tools or []:
+        content = tool.get("content")
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except json.JSONDecodeError:
+                continue
+        if not isinstance(content, dict):
+            continue
+        if tool.get("tool_name") in CONTACTOUT_PROFILE_TOOLS and content.get("success"):
+            credits += 1
+        elif tool.get("tool_name") == "find_linkedin_profiles":
+            credits += len(content.get("profiles") or [])
+    return credits
+
+
+def run_usage(
+    agent_id: str, agent: Agent, source: str, status: str, wall_seconds: float, previous_run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """The run_usage row of the agent's last run. No tokens or tools are counted when the agent's run id is still
+    `previous_run_id`, the run failed before it started and the run response is the one of the previous run."""
+    model_id = agent.model.id if agent.model is not None else None
+    started = agent.run_id is not None and agent.run_id != previous_run_id
+    run_response = agent.run_response if started else None
+    metrics = (run_response.metrics if run_response is not None else None) or {}
+    tools = run_response.tools if run_response is not None else None
+    input_tokens = sum(metrics.get("input_tokens", []))
+    output_tokens = sum(metrics.get("output_tokens", []))
+    cost = model_router.cost(model_id, input_tokens, output_tokens) if model_id is not None else 0.0
+    return {
+        "run_id": agent.run_id if started else None,
+        "session_id": agent.session_id,
+        "user_id": agent.user_id,
+        "agent_id": agent_id,
+        "model": model_id,
+        "source": source,
+        "status": status,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cached_tokens": cached_tokens(metrics),
+        # Only finished calls, a failed run may leave some started
+        "tool_calls": sum(1 for tool in tools or [] if "content" in tool),
+        "contactout_credits": contactout_credits(tools),
+        # Models without a price count as free
+        "cost_usd": cost if math.isfinite(cost) else 0.0,
+        "wall_seconds": round(wall_seconds, 3),
+    }
+
+
+class UsageWriter:
+    """Inserts usage rows in batches from a background thread, started by the first row."""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.batch_size: int = batch_size or agent_settings.usage_batch_size
+        self.flush_interval: float = flush_interval or agent_settings.usage_flush_interval
+        self.queue: Queue = Queue(maxsize=max_pending or agent_settings.usage_max_pending)
+        self.dropped: int = 0
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        # Once, the thread may be started again by rows submitted after a stop
+        atexit.register(self.stop)
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        """Queue a row for writing, never blocks."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="usage-writer", daemon=True)
+                self._thread.start()
+        try:
+            self.queue.put_nowait(row)
+        except Full:
+            self.dropped += 1
+            logger.warning(f"Usage writer is behind, dropped {self.dropped} rows so far")
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            row = self.queue.get()
+            if row is None:
+                break
+            batch = [row]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    row = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with SessionLocal() as sess, sess.begin():
+                sess.execute(insert(RunUsage), batch)
+        except Exception as e:
+            logger.error(f"Could not write {len(batch)} usage rows: {e}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write the queued rows and stop the thread, call when the process exits."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self.queue.put(None)
+        thread.join(timeout)
+
+    async def astop(self, timeout: float = 10.0) -> None:
+        """`stop` in a thread, so the event loop is not blocked while the rows are written, e.g. on app shutdown."""
+        await asyncio.to_thread(self.stop, timeout)
+
+
+# Shared by every run in the process
+usage_writer = UsageWriter()
+
+
+@contextmanager
+def track_usage(agent_id: str, agent: Agent, source: str) -> Iterator[None]:
+    """Record the usage of the agent run made in the block, also when it fails."""
+    start = time.perf_counter()
+    previous_run_id = agent.run_id
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        if agent_settings.usage_enabled:
+            try:
+                row = run_usage(agent_id, agent, source, status, time.perf_counter() - start, previous_run_id)
+                usage_writer.submit(row)
+            except Exception as e:
+                logger.warning(f"Could not record the usage of a {agent_id} run: {e}")
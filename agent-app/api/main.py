@@ -1,13 +1,21 @@
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from agents.usage import usage_writer
+from api.routes.metrics import metrics_router
+from api.routes.playground import lazy_playground
 from api.routes.v1_router import v1_router
 from api.settings import api_settings
+from utils.log import configure_logging
+from utils.metrics import mark_process_dead
 
 
 def create_app() -> FastAPI:
     """Create a FastAPI App"""
 
+    # Log through a queue, as JSON lines outside dev
+    configure_logging()
+
     # Create FastAPI App
     app: FastAPI = FastAPI(
         title=api_settings.title,
@@ -19,6 +27,18 @@ def create_app() -> FastAPI:
 
     # Add v1 router
     app.include_router(v1_router)
+    # Add the playground, its agents are built on its first request
+    app.mount("/v1/playground", lazy_playground)
+    if api_settings.playground_warmup:
+        # Build them in the background once the app has started
+        app.add_event_handler("startup", lazy_playground.start_warm_up)
+
+    # Add Prometheus metrics at /metrics
+    app.include_router(metrics_router)
+    # Drop the live gauges of this worker from the shared samples when it exits
+    app.add_event_handler("shutdown", mark_process_dead)
+    # Write the usage rows still queued before the worker exits
+    app.add_event_handler("shutdown", usage_writer.astop)
 
     # Add Middlewares
     app.add_middleware(
@@ -6,8 +6,21 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from agents.operator import AgentType, get_agent, get_available_agents
+from agents.exports import (
+    PROFILE_FIELDS,
+    chat_to_markdown,
+    iter_chat_runs,
+    iter_profiles,
+    to_csv,
+    to_json_array,
+    to_ndjson,
+)
+from agents.operator import AGENT_STORAGE_TABLES, AgentType, get_agent, get_available_agents
+from agents.routing import AUTO_MODEL, RoutingDecision, model_router
+from agents.usage import track_usage
 from utils.log import logger
+from utils.metrics import track_run
+from utils.tracing import run_span
 
 ######################################################
 ## Router for the Agent Interface
@@ -19,6 +32,18 @@ agents_router = APIRouter(prefix="/agents", tags=["Agents"])
 class Model(str, Enum):
     gpt_4o = "gpt-4o"
     o3_mini = "o3-mini"
+    # Routed per request to the cheapest model good enough for it
+    auto = AUTO_MODEL
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class ChatExportFormat(str, Enum):
+    md = "md"
+    json = "json"
 
 
 @agents_router.get("", response_model=List[str])
@@ -32,23 +57,37 @@ async def list_agents():
     return get_available_agents()
 
 
-async def chat_response_streamer(agent: Agent, message: str) -> AsyncGenerator:
+async def chat_response_streamer(
+    agent_id: AgentType, agent: Agent, message: str, decision: Optional[RoutingDecision] = None
+) -> AsyncGenerator:
     """
     Stream agent responses chunk by chunk.
 
     Args:
+        agent_id: The ID of the agent, to label the run metrics
         agent: The agent instance to interact with
         message: User message to process
+        decision: Routing decision for the "auto" model, with the models to fall back to
 
     Yields:
         Text chunks from the agent response
     """
-    run_response = await agent.arun(message, stream=True)
-    async for chunk in run_response:
-        # chunk.content only contains the text response from the Agent.
-        # For advanced use cases, we should yield the entire chunk
-        # that contains the tool calls and intermediate steps.
-        yield chunk.content
+    with (
+        track_run(agent_id.value, agent) as run,
+        track_usage(agent_id.value, agent, source="api"),
+        run_span(agent_id.value, agent, source="api", stream=True),
+    ):
+        if decision is not None:
+            run_response = model_router.astream(agent, message, decision)
+        else:
+            run_response = await agent.arun(message, stream=True)
+        async for chunk in run_response:
+            if chunk.content:
+                run.first_token()
+            # chunk.content only contains the text response from the Agent.
+            # For advanced use cases, we should yield the entire chunk
+            # that contains the tool calls and intermediate steps.
+            yield chunk.content
 
 
 class RunRequest(BaseModel):
@@ -75,9 +114,14 @@ async def run_agent(agent_id: AgentType, body: RunRequest):
     """
     logger.debug(f"RunRequest: {body}")
 
+    decision: Optional[RoutingDecision] = None
+    if body.model == Model.auto:
+        decision = model_router.route(body.message, agent_id.value)
+
+    model_id = decision.model_id if decision is not None else body.model.value
     try:
         agent: Agent = get_agent(
-            model_id=body.model.value,
+            model_id=model_id,
             agent_id=agent_id,
             user_id=body.user_id,
             session_id=body.session_id,
@@ -87,12 +131,70 @@ async def run_agent(agent_id: AgentType, body: RunRequest):
 
     if body.stream:
         return StreamingResponse(
-            chat_response_streamer(agent, body.message),
+            chat_response_streamer(agent_id, agent, body.message, decision),
             media_type="text/event-stream",
         )
     else:
-        response = await agent.arun(body.message, stream=False)
+        with (
+            track_run(agent_id.value, agent),
+            track_usage(agent_id.value, agent, source="api"),
+            run_span(agent_id.value, agent, source="api", stream=False),
+        ):
+            if decision is not None:
+                response = await model_router.arun(agent, body.message, decision)
+            else:
+                response = await agent.arun(body.message, stream=False)
         # response.content only contains the text response from the Agent.
         # For advanced use cases, we should yield the entire response
         # that contains the tool calls and intermediate steps.
         return response.content
+
+
+@agents_router.get("/{agent_id}/sessions/{session_id}/profiles", status_code=status.HTTP_200_OK)
+def export_profiles(
+    agent_id: AgentType, session_id: str, format: ExportFormat = ExportFormat.csv, run_id: Optional[str] = None
+):
+    """
+    Streams the enriched LinkedIn profiles found in a session as CSV or NDJSON.
+
+    Profiles are read from the tool results stored with the session's runs, one row at a time,
+    so exports of any size use constant memory and never go through the model.
+
+    Args:
+        agent_id: The ID of the agent that ran the research
+        session_id: The research session to export
+        format: "csv" or "ndjson"
+        run_id: Only export profiles from this run
+
+    Returns:
+        A streaming response with one profile per row, de-duplicated by LinkedIn url
+    """
+    profiles = iter_profiles(AGENT_STORAGE_TABLES[agent_id], session_id, run_id=run_id)
+    filename = f"{agent_id.value}-{session_id}-profiles.{format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == ExportFormat.ndjson:
+        return StreamingResponse(to_ndjson(profiles), media_type="application/x-ndjson", headers=headers)
+    return StreamingResponse(to_csv(profiles, PROFILE_FIELDS), media_type="text/csv", headers=headers)
+
+
+@agents_router.get("/{agent_id}/sessions/{session_id}/export", status_code=status.HTTP_200_OK)
+def export_chat(agent_id: AgentType, session_id: str, format: ChatExportFormat = ChatExportFormat.md):
+    """
+    Streams the chat history of a session as a markdown transcript or a JSON array of runs.
+
+    Runs are read from the session's storage one at a time, so exports of any size use constant memory.
+
+    Args:
+        agent_id: The ID of the agent the session belongs to
+        session_id: The session to export
+        format: "md" or "json"
+
+    Returns:
+        A streaming response with the user message, response and tool calls of every run, oldest first
+    """
+    runs = iter_chat_runs(AGENT_STORAGE_TABLES[agent_id], session_id)
+    filename = f"{agent_id.value}_{session_id}.{format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == ChatExportFormat.json:
+        return StreamingResponse(to_json_array(runs), media_type="application/json", headers=headers)
+    return StreamingResponse(chat_to_markdown(runs, agent_id.value), media_type="text/markdown", headers=headers)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response
+
+from utils.metrics import METRICS_CONTENT_TYPE, latest_metrics
+
+######################################################
+## Router for Prometheus metrics
+######################################################
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Returns the app metrics in the Prometheus text format.
+
+    A sync endpoint, so FastAPI serves it from its threadpool and reading the
+    multiprocess sample files never blocks the event loop.
+    """
+    return Response(content=latest_metrics(), media_type=METRICS_CONTENT_TYPE)
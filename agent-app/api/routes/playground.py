@@ -1,23 +1,78 @@
+import asyncio
 from os import getenv
+from threading import Lock
+from typing import Optional
 
-from agno.playground import Playground
+from fastapi import FastAPI
+from starlette.types import Receive, Scope, Send
 
-from agents.sage import get_sage
-from agents.scholar import get_scholar
-from workspace.dev_resources import dev_fastapi
+from api.settings import api_settings
+from utils.log import logger
 
 ######################################################
-## Router for the Playground Interface
+## App for the Playground Interface
 ######################################################
 
-sage_agent = get_sage(debug_mode=True)
-scholar_agent = get_scholar(debug_mode=True)
 
-# Create a playground instance
-playground = Playground(agents=[sage_agent, scholar_agent])
+class LazyPlayground:
+    """ASGI app serving the playground routes, mounted at /v1/playground.
 
-# Register the endpoint where playground routes are served with agno.com
-if getenv("RUNTIME_ENV") == "dev":
-    playground.create_endpoint(f"http://localhost:{dev_fastapi.host_port}")
+    The playground agents, with their storage and vector db, are built on the first playground request or by
+    `warm_up`, not when the API is imported, so workers serve /v1/health as soon as they start.
+    """
 
-playground_router = playground.get_async_router()
+    def __init__(self):
+        self._app: Optional[FastAPI] = None
+        self._lock = Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def get_app(self) -> FastAPI:
+        """The playground app, built on the first call."""
+        with self._lock:
+            if self._app is None:
+                self._app = self._build()
+            return self._app
+
+    def _build(self) -> FastAPI:
+        # agno.playground alone takes a few hundred milliseconds to import
+        from agno.playground import Playground
+
+        from agents.sage import get_sage
+        from agents.scholar import get_scholar
+
+        logger.info("Building the playground agents")
+        # Create a playground instance
+        playground = Playground(agents=[get_sage(), get_scholar()])
+
+        # Register the endpoint where playground routes are served with agno.com
+        if getenv("RUNTIME_ENV") == "dev":
+            playground.create_endpoint(api_settings.playground_endpoint)
+
+        app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+        app.include_router(playground.get_async_router())
+        return app
+
+    async def warm_up(self) -> None:
+        """Build the playground in a thread, the event loop keeps serving meanwhile."""
+        try:
+            await asyncio.to_thread(self.get_app)
+        except Exception as e:
+            logger.error(f"Could not build the playground: {e}")
+
+    def start_warm_up(self) -> None:
+        """Start `warm_up` in the background, call from the running event loop, e.g. as a startup handler."""
+        self._warm_up_task = asyncio.create_task(self.warm_up())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app: FastAPI
+        if self._app is None:
+            app = await asyncio.to_thread(self.get_app)
+        else:
+            app = self._app
+        # The playground routes include their /playground prefix, leave it in the path they are matched on
+        if scope["type"] in ("http", "websocket"):
+            scope = {**scope, "root_path": scope.get("root_path", "").removesuffix("/playground")}
+        await app(scope, receive, send)
+
+
+lazy_playground = LazyPlayground()
@@ -0,0 +1,107 @@
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Date, Integer, cast, func
+from sqlalchemy.sql.expression import select
+
+from db.session import SessionLocal
+from db.tables import RunUsage
+
+######################################################
+## Router for run usage and cost
+######################################################
+
+usage_router = APIRouter(prefix="/usage", tags=["Usage"])
+
+
+class UsageGroup(str, Enum):
+    user = "user"
+    agent = "agent"
+    model = "model"
+    day = "day"
+
+
+class UsageSummary(BaseModel):
+    """Usage of the runs of one group, only the columns grouped by are set."""
+
+    user_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    model: Optional[str] = None
+    day: Optional[date] = None
+    runs: int
+    failed_runs: int
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    tool_calls: int
+    contactout_credits: int
+    cost_usd: float
+    wall_seconds: float
+
+
+# Day of a run in UTC, whatever the time zone of the database session
+RUN_DAY = cast(func.timezone("UTC", RunUsage.created_at), Date)
+GROUP_COLUMNS: Dict[UsageGroup, ColumnElement[Any]] = {
+    UsageGroup.user: RunUsage.user_id.label("user_id"),
+    UsageGroup.agent: RunUsage.agent_id.label("agent_id"),
+    UsageGroup.model: RunUsage.model.label("model"),
+    UsageGroup.day: RUN_DAY.label("day"),
+}
+
+
+@usage_router.get("", response_model=List[UsageSummary], response_model_exclude_none=True)
+def get_usage(
+    group_by: List[UsageGroup] = Query([UsageGroup.user, UsageGroup.agent, UsageGroup.day]),
+    user_id: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    Aggregates the tokens, tool calls, ContactOut credits, cost and time of agent runs.
+
+    The runs are summed in the database, grouped by any of user, agent, model and day (UTC).
+
+    Args:
+        group_by: Columns to group by, user, agent and day by default
+        user_id: Only count the runs of this user
+        agent_id: Only count the runs of this agent
+        since: First day counted, 30 days ago by default
+        until: Last day counted, today by default
+        limit: Maximum number of groups returned
+
+    Returns:
+        One summary per group, most recent day first, then most expensive first
+    """
+    groups: List[ColumnElement[Any]] = [GROUP_COLUMNS[group] for group in dict.fromkeys(group_by)]
+    stmt = select(*groups).add_columns(
+        func.count().label("runs"),
+        func.count().filter(RunUsage.status != "ok").label("failed_runs"),
+        cast(func.sum(RunUsage.input_tokens), Integer).label("input_tokens"),
+        cast(func.sum(RunUsage.output_tokens), Integer).label("output_tokens"),
+        cast(func.sum(RunUsage.cached_tokens), Integer).label("cached_tokens"),
+        cast(func.sum(RunUsage.tool_calls), Integer).label("tool_calls"),
+        cast(func.sum(RunUsage.contactout_credits), Integer).label("contactout_credits"),
+        func.sum(RunUsage.cost_usd).label("cost_usd"),
+        func.sum(RunUsage.wall_seconds).label("wall_seconds"),
+    )
+    # Compare with timestamps rather than RUN_DAY, so the index on created_at is used
+    since = since or datetime.now(timezone.utc).date() - timedelta(days=30)
+    stmt = stmt.where(RunUsage.created_at >= datetime.combine(since, time.min, tzinfo=timezone.utc))
+    if until is not None:
+        stmt = stmt.where(
+            RunUsage.created_at < datetime.combine(until + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+    if user_id is not None:
+        stmt = stmt.where(RunUsage.user_id == user_id)
+    if agent_id is not None:
+        stmt = stmt.where(RunUsage.agent_id == agent_id)
+
+    order_by = [RUN_DAY.desc()] if UsageGroup.day in group_by else []
+    stmt = stmt.group_by(*groups).order_by(*order_by, func.sum(RunUsage.cost_usd).desc()).limit(limit)
+    with SessionLocal() as sess:
+        return [dict(row) for row in sess.execute(stmt).mappings()]
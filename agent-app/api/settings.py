@@ -22,6 +22,11 @@ class ApiSettings(BaseSettings):
     # Set to False to disable docs at /docs and /redoc
     docs_enabled: bool = True
 
+    # Build the playground agents in the background on startup rather than on the first playground request
+    playground_warmup: bool = False
+    # Where agno.com reaches the playground routes in dev, the port of dev_fastapi in workspace/dev_resources.py
+    playground_endpoint: str = "http://localhost:8000"
+
     # Cors origin list to allow requests from.
     # This list is set using the set_cors_origin_list validator
     # which uses the runtime_env variable to set the
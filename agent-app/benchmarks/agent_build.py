@@ -0,0 +1,65 @@
+"""Benchmark building agents the way the Streamlit pages do, once per browser tab.
+
+For each agent, builds one agent with empty component caches, the way every tab did before components were shared,
+then `--tabs` more agents for different users on the warm caches. Reports the build time and the memory allocated
+per agent, measured with tracemalloc. No model is called, the agents are only built.
+
+Usage:
+    python -m benchmarks.agent_build --tabs 20
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Dict
+
+from agents.linkedin_researcher import get_linkedin_researcher
+from agents.resources import clear_agent_resources
+from agents.sage import get_sage
+from agents.scholar import get_scholar
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    agent = build()
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del agent
+    return {"ms": round(elapsed * 1000, 2), "kib": round(allocated / 1024, 1)}
+
+
+def run(num_tabs: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"tabs": num_tabs}
+    for name, get_agent in [
+        ("sage", get_sage),
+        ("scholar", get_scholar),
+        ("linkedin_researcher", get_linkedin_researcher),
+    ]:
+        clear_agent_resources()
+        cold = measure(partial(get_agent, user_id="user-0", debug_mode=False))
+        warm = [measure(partial(get_agent, user_id=f"user-{i}", debug_mode=False)) for i in range(1, num_tabs + 1)]
+        results[name] = {
+            "cold": cold,
+            "warm_mean": {
+                "ms": round(sum(m["ms"] for m in warm) / num_tabs, 2),
+                "kib": round(sum(m["kib"] for m in warm) / num_tabs, 1),
+            },
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tabs", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.tabs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
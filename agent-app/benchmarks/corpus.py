@@ -0,0 +1,133 @@
+"""Deterministic synthetic corpus and embeddings for knowledge base benchmarks.
+
+Nothing here calls OpenAI: embeddings are random projections of the words in a chunk, seeded by the
+word itself, so the same text always gets the same vector and texts sharing words end up close together.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import md5
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from agno.document import Document
+from agno.embedder import Embedder
+from agno.vectordb.pgvector import PgVector
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "qua", "bri", "dor", "fen", "gal", "hum", "jor"]
+
+
+@dataclass
+class HashEmbedder(Embedder):
+    """Embedder that returns a deterministic, normalized bag-of-words projection of the text."""
+
+    dimensions: int = 1536
+
+    def get_embedding(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in text.lower().split():
+            vector += _word_vector(word, self.dimensions)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+@lru_cache(maxsize=65536)
+def _word_vector(word: str, dimensions: int) -> np.ndarray:
+    seed = int(md5(word.encode()).hexdigest()[:8], 16)
+    return np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+
+
+def vocabulary(size: int = 5000, seed: int = 7) -> List[str]:
+    """Return `size` unique pseudo-words built from a fixed syllable list."""
+    rng = random.Random(seed)
+    words: List[str] = []
+    seen = set()
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+@dataclass
+class SyntheticCorpus:
+    """A corpus of chunks grouped into topics, each topic preferring its own subset of the vocabulary."""
+
+    size: int
+    num_topics: int = 200
+    words_per_chunk: int = 80
+    topic_word_ratio: float = 0.6
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        self.words = vocabulary()
+        rng = random.Random(self.seed)
+        self.topics = [rng.sample(self.words, 25) for _ in range(self.num_topics)]
+
+    def documents(self, start: int = 0) -> Iterator[Document]:
+        """Yield chunks `start..size` of the corpus. Chunk `i` is the same on every run."""
+        for i in range(start, self.size):
+            rng = random.Random(self.seed * 1_000_003 + i)
+            topic = self.topics[i % self.num_topics]
+            words = [
+                rng.choice(topic) if rng.random() < self.topic_word_ratio else rng.choice(self.words)
+                for _ in range(self.words_per_chunk)
+            ]
+            yield Document(
+                id=f"chunk-{i}",
+                name=f"doc-{i // 20}",
+                content=" ".join(words),
+                meta_data={"chunk": i, "topic": i % self.num_topics},
+            )
+
+    def queries(self, count: int, terms: int = 3) -> List[str]:
+        """Return `count` queries, each made of a few words from one topic."""
+        return [query for query, _ in self.labeled_queries(count, terms)]
+
+    def labeled_queries(self, count: int, terms: int = 3) -> List[Tuple[str, int]]:
+        """Return the same queries as `queries`, each with the topic its words come from."""
+        rng = random.Random(self.seed + 1)
+        labeled = []
+        for _ in range(count):
+            topic = rng.randrange(self.num_topics)
+            labeled.append((" ".join(rng.sample(self.topics[topic], terms)), topic))
+        return labeled
+
+
+def batched(documents: Iterator[Document], batch_size: int) -> Iterator[List[Document]]:
+    batch: List[Document] = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_corpus(vector_db: PgVector, corpus: SyntheticCorpus, batch_size: int = 1000) -> int:
+    """Insert the chunks missing from the table, so repeated runs reuse an already loaded corpus.
+
+    Returns:
+        int: Number of chunks inserted, 0 if the corpus was already loaded.
+    """
+    vector_db.create()
+    existing = vector_db.get_count()
+    if existing >= corpus.size:
+        print(f"{vector_db.table.fullname}: {existing} chunks already loaded")
+        return 0
+
+    start = time.perf_counter()
+    for batch in batched(corpus.documents(start=existing), batch_size):
+        vector_db.insert(batch, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"{vector_db.table.fullname}: loaded {corpus.size - existing} chunks in {elapsed:.1f}s")
+    return corpus.size - existing
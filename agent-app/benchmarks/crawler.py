@@ -0,0 +1,116 @@
+"""Benchmark the website crawler against a local fixture site.
+
+Generates a site of linked pages with a robots.txt, serves it on localhost with a simulated per-request latency and
+crawls it serially and concurrently. A second concurrent crawl replays the validators of the first, so every page
+should come back as 304 Not Modified. Nothing is written to the database. This only measures timings, what the
+crawler fetches and skips is covered by tests/knowledge/test_crawler.py.
+
+Usage:
+    python -m benchmarks.crawler --pages 500 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from benchmarks.corpus import SyntheticCorpus
+from knowledge.crawler import PageState, WebCrawler
+
+
+def build_site(root: Path, num_pages: int, links_per_page: int = 5) -> None:
+    """Write `num_pages` pages linking to each other, plus a private page that robots.txt disallows."""
+    corpus = SyntheticCorpus(size=num_pages)
+    for document in corpus.documents():
+        i = document.meta_data["chunk"]
+        links = "".join(
+            f'<a href="/page-{(i * links_per_page + n) % num_pages}.html">next</a>'
+            for n in range(1, links_per_page + 1)
+        )
+        (root / f"page-{i}.html").write_text(
+            f"<html><body><nav>{links}<a href='/private/secret.html'>secret</a></nav>"
+            f"<main><h1>Page {i}</h1><p>{document.content}</p></main></body></html>"
+        )
+    (root / "index.html").write_text(root.joinpath("page-0.html").read_text())
+    (root / "private").mkdir()
+    (root / "private" / "secret.html").write_text("<html><body><main>secret</main></body></html>")
+    (root / "robots.txt").write_text("User-agent: *\nDisallow: /private/\n")
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    latency: float = 0.0
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+async def crawl(crawler: WebCrawler, url: str, known: Optional[Dict[str, PageState]] = None) -> Dict[str, Any]:
+    pages = {}
+    start = time.perf_counter()
+    async for page in crawler.crawl(url, known=known):
+        pages[page.url] = page
+    elapsed = time.perf_counter() - start
+    return {
+        "pages": len(pages),
+        "not_modified": sum(page.not_modified for page in pages.values()),
+        "seconds": round(elapsed, 2),
+        "pages_per_second": round(len(pages) / elapsed, 1) if elapsed else None,
+        "_pages": pages,
+    }
+
+
+def run(num_pages: int, latency_ms: float, concurrency: int, per_host_concurrency: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as root:
+        build_site(Path(root), num_pages)
+        handler = type("Handler", (FixtureHandler,), {"latency": latency_ms / 1000})
+        server = ThreadingHTTPServer(("localhost", 0), partial(handler, directory=root))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://localhost:{server.server_address[1]}/"
+        max_pages = num_pages + 10
+        try:
+            serial = asyncio.run(
+                crawl(WebCrawler(max_pages=max_pages, max_depth=num_pages, concurrency=1, per_host_concurrency=1), url)
+            )
+            crawler = WebCrawler(
+                max_pages=max_pages,
+                max_depth=num_pages,
+                concurrency=concurrency,
+                per_host_concurrency=per_host_concurrency,
+            )
+            concurrent = asyncio.run(crawl(crawler, url))
+            known = {
+                page.url: PageState(etag=page.etag, last_modified=page.last_modified, links=page.links)
+                for page in concurrent["_pages"].values()
+            }
+            recrawl = asyncio.run(crawl(crawler, url, known=known))
+        finally:
+            server.shutdown()
+
+    results = {"serial": serial, "concurrent": concurrent, "recrawl": recrawl}
+    for result in results.values():
+        del result["_pages"]
+    return {"pages": num_pages, "latency_ms": latency_ms, **results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-host-concurrency", type=int, default=16)
+    args = parser.parse_args()
+    print(json.dumps(run(args.pages, args.latency_ms, args.concurrency, args.per_host_concurrency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
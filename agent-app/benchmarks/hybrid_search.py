@@ -0,0 +1,85 @@
+"""Benchmark hybrid search latency on the knowledge base at several corpus sizes.
+
+Compares the stock agno `PgVector.hybrid_search`, which computes `to_tsvector` and the vector distance for
+every row, with `KnowledgeVectorDb.hybrid_search`, which fuses candidates from the HNSW and GIN indexes.
+
+Usage:
+    python -m benchmarks.hybrid_search --sizes 100000 1000000
+"""
+
+import argparse
+import json
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+from agno.vectordb.pgvector import PgVector, SearchType
+
+from benchmarks.corpus import HashEmbedder, SyntheticCorpus, load_corpus
+from benchmarks.utils import summarize_latencies
+from db.session import db_url
+from knowledge.vector_db import KnowledgeVectorDb
+
+
+def time_queries(search: Callable[[str], Any], queries: List[str]) -> Dict[str, float]:
+    # Warm up caches and connections before measuring
+    for query in queries[:3]:
+        search(query)
+
+    latencies: List[float] = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append(time.perf_counter() - start)
+    return summarize_latencies(latencies)
+
+
+def run(sizes: List[int], num_queries: int, baseline_queries: int, limit: int, batch_size: int) -> List[Dict]:
+    embedder = HashEmbedder()
+    results = []
+    for size in sizes:
+        corpus = SyntheticCorpus(size=size)
+        table_name = f"bench_hybrid_{size}"
+        knowledge_db = KnowledgeVectorDb(
+            table_name=table_name,
+            db_url=db_url,
+            embedder=embedder,
+            search_type=SearchType.hybrid,
+            cache_searches=False,
+        )
+        if load_corpus(knowledge_db, corpus, batch_size):
+            start = time.perf_counter()
+            knowledge_db.optimize()
+            print(f"{knowledge_db.table.fullname}: built indexes in {time.perf_counter() - start:.1f}s")
+
+        queries = corpus.queries(num_queries)
+        result: Dict[str, Any] = {"size": size, "limit": limit}
+        result["indexed_hybrid"] = time_queries(partial(knowledge_db.hybrid_search, limit=limit), queries)
+        result["indexed_keyword"] = time_queries(partial(knowledge_db.keyword_search, limit=limit), queries)
+        if baseline_queries > 0:
+            baseline_db = PgVector(
+                table_name=table_name, db_url=db_url, embedder=embedder, search_type=SearchType.hybrid
+            )
+            result["agno_hybrid"] = time_queries(
+                partial(baseline_db.hybrid_search, limit=limit), queries[:baseline_queries]
+            )
+        print(json.dumps(result, indent=2))
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200, help="Queries per size for the indexed searches")
+    parser.add_argument(
+        "--baseline-queries", type=int, default=20, help="Queries per size for the agno baseline, 0 to skip"
+    )
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.baseline_queries, args.limit, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
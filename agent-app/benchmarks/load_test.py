@@ -0,0 +1,171 @@
+"""Load test the API offline, against local stand-ins for OpenAI, the web search and ContactOut.
+
+Starts the stand-ins of `benchmarks.mock_servers` and the API with uvicorn, pointed at them, then sends
+`--requests` runs to /v1/agents/{agent_id}/runs, `--concurrency` at a time, each from a new user and session.
+Reports the throughput, the latency and time to first token percentiles of the runs, the resident memory of the
+API processes after the test and the requests each stand-in served.
+
+Only the database is real: start it first with `ag ws up`, or set the DB_* variables. Nothing leaves the
+machine, agno telemetry and monitoring are turned off. The API logs at `--log-level`, WARNING by default, so
+logging does not skew the results.
+
+Usage:
+    python -m benchmarks.load_test --agent sage --requests 200 --concurrency 16 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.mock_servers import add_arguments, mock_env
+from benchmarks.startup import free_port, rss_mb
+from benchmarks.utils import summarize_latencies
+
+
+def wait_for(url: str, process: subprocess.Popen, cmd: List[str], timeout: float = 120.0) -> None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(cmd)} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not respond within {timeout}s")
+
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process and its children, e.g. the uvicorn workers, in MB."""
+    total = rss_mb(pid)
+    if total is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            child_pids = [int(child) for child in children.read().split()]
+    except OSError:
+        child_pids = []
+    return total + sum(process_tree_rss_mb(child) or 0 for child in child_pids)
+
+
+async def run_one(client: httpx.AsyncClient, agent: str, model: str, message: str, n: int) -> Dict[str, Any]:
+    body = {"message": message, "stream": True, "model": model, "user_id": f"load-test-{n}"}
+    start = time.perf_counter()
+    first_token: Optional[float] = None
+    try:
+        async with client.stream("POST", f"/v1/agents/{agent}/runs", json=body) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return {"ok": False, "error": f"HTTP {response.status_code}"}
+            async for text in response.aiter_text():
+                if text and first_token is None:
+                    first_token = time.perf_counter() - start
+    except httpx.HTTPError as e:
+        return {"ok": False, "error": type(e).__name__}
+    return {"ok": True, "latency": time.perf_counter() - start, "time_to_first_token": first_token}
+
+
+async def drive(base_url: str, agent: str, model: str, message: str, num_requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+
+        async def limited(n: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_one(client, agent, model, message, n)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(limited(n) for n in range(num_requests)))
+        return results, time.perf_counter() - start
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mock_port, api_port = free_port(), free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    mock_args = [
+        *("--port", str(mock_port), "--first-token-ms", str(args.first_token_ms), "--token-ms", str(args.token_ms)),
+        *("--tokens", str(args.tokens), "--search-latency-ms", str(args.search_latency_ms)),
+        *("--contactout-latency-ms", str(args.contactout_latency_ms)),
+        *("--contactout-429-ratio", str(args.contactout_429_ratio), "--seed", str(args.seed)),
+        *(("--no-tool-calls",) if args.no_tool_calls else ()),
+    ]
+    env = {**os.environ, **mock_env(mock_url), "LOG_LEVEL": args.log_level}
+    processes: List[subprocess.Popen] = []
+    with tempfile.TemporaryDirectory() as multiproc_dir:
+        if args.workers > 1:
+            # Lets every worker's metrics be scraped, the way the API runs in production
+            env["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+        try:
+            mock_cmd: List[str] = [sys.executable, "-m", "benchmarks.mock_servers", *mock_args]
+            mock = subprocess.Popen(mock_cmd)
+            processes.append(mock)
+            wait_for(f"{mock_url}/health", mock, mock_cmd)
+            api_cmd: List[str] = [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port)]
+            api_cmd += ["--workers", str(args.workers), "--log-level", "warning"]
+            api = subprocess.Popen(api_cmd, env=env)
+            processes.append(api)
+            api_url = f"http://127.0.0.1:{api_port}"
+            wait_for(f"{api_url}/v1/health", api, api_cmd)
+            rss_at_start = process_tree_rss_mb(api.pid)
+
+            results, elapsed = asyncio.run(
+                drive(api_url, args.agent, args.model, args.message, args.requests, args.concurrency)
+            )
+            rss_after = process_tree_rss_mb(api.pid)
+            mock_stats = httpx.get(f"{mock_url}/stats").json()
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait()
+
+    ok = [result for result in results if result["ok"]]
+    errors: Dict[str, int] = {}
+    for result in results:
+        if not result["ok"]:
+            errors[result["error"]] = errors.get(result["error"], 0) + 1
+    return {
+        "agent": args.agent,
+        "model": args.model,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2),
+        "errors": errors,
+        "latency": summarize_latencies([result["latency"] for result in ok]),
+        "time_to_first_token": summarize_latencies(
+            [result["time_to_first_token"] for result in ok if result["time_to_first_token"] is not None]
+        ),
+        "rss_mb": {
+            "after_boot": round(rss_at_start, 1) if rss_at_start is not None else None,
+            "after_test": round(rss_after, 1) if rss_after is not None else None,
+        },
+        "stand_in_requests": mock_stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", default="sage", choices=["sage", "scholar", "linkedin_researcher"])
+    parser.add_argument("--model", default="gpt-4o", choices=["gpt-4o", "o3-mini", "auto"])
+    parser.add_argument("--message", default="What are the latest developments in battery recycling?")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--log-level", default="WARNING")
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark API request throughput under the logging setups.
+
+Serves an endpoint that logs like an agent run in debug mode: an INFO record and a number of DEBUG records
+carrying a prompt sized payload. Requests go through the ASGI app in process. Records are written to /dev/null,
+so the numbers measure formatting and handler overhead on the request path, not the terminal.
+
+Setups:
+    rich_debug_sync     the previous setup, a RichHandler at DEBUG writing in the request path
+    json_queue_info     the prd default, JSON lines through a queue at INFO
+    json_queue_sampled  agents in debug mode in prd, JSON lines through a queue at DEBUG, 1 in 10 kept
+
+Usage:
+    python -m benchmarks.logging_throughput --requests 2000 --concurrency 32 --debug-records 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.utils import summarize_latencies
+from utils.log import get_output_handler, get_queue_handler
+
+
+def build_app(bench_logger: logging.Logger, debug_records: int, payload_chars: int) -> FastAPI:
+    app = FastAPI()
+    payload = "lorem ipsum " * (payload_chars // 12)
+
+    @app.get("/run")
+    async def run() -> Dict[str, str]:
+        bench_logger.info("Running agent for user %s", "bench")
+        for n in range(debug_records):
+            bench_logger.debug("Message %d: %s", n, payload)
+        await asyncio.sleep(0)
+        return {"status": "ok"}
+
+    return app
+
+
+async def drive(app: FastAPI, num_requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/run")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(num_requests)))
+        elapsed = time.perf_counter() - start
+    return {"requests_per_s": round(num_requests / elapsed, 1), **summarize_latencies(latencies)}
+
+
+def setup(name: str, level: int, log_format: str, queued: bool, sample_ratio: float, sink) -> Callable[[], None]:
+    """Configure the `bench.<name>` logger, returns a function that writes what is still queued."""
+    bench_logger = logging.getLogger(f"bench.{name}")
+    bench_logger.handlers.clear()
+    bench_logger.setLevel(level)
+    bench_logger.propagate = False
+    output_handler = get_output_handler(log_format, stream=sink)
+    if not queued:
+        output_handler.setLevel(level)
+        bench_logger.addHandler(output_handler)
+        return lambda: None
+    queue_handler, listener = get_queue_handler(output_handler, sample_ratio)
+    bench_logger.addHandler(queue_handler)
+    return listener.stop
+
+
+def run(num_requests: int, concurrency: int, debug_records: int, payload_chars: int) -> Dict[str, Any]:
+    setups = [
+        ("rich_debug_sync", logging.DEBUG, "rich", False, 1.0),
+        ("json_queue_info", logging.INFO, "json", True, 1.0),
+        ("json_queue_sampled", logging.DEBUG, "json", True, 0.1),
+    ]
+    results: Dict[str, Any] = {
+        "requests": num_requests,
+        "concurrency": concurrency,
+        "debug_records_per_request": debug_records,
+    }
+    with open(os.devnull, "w") as sink:
+        for name, level, log_format, queued, sample_ratio in setups:
+            stop = setup(name, level, log_format, queued, sample_ratio, sink)
+            app = build_app(logging.getLogger(f"bench.{name}"), debug_records, payload_chars)
+            results[name] = asyncio.run(drive(app, num_requests, concurrency))
+            start = time.perf_counter()
+            stop()
+            results[name]["drain_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--debug-records", type=int, default=20)
+    parser.add_argument("--payload-chars", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency, args.debug_records, args.payload_chars), indent=2))
+
+
+if __name__ == "__main__":
+    main()
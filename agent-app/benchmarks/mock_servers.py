@@ -0,0 +1,305 @@
+"""Local stand-ins for the paid APIs the agents call, for load tests that run offline.
+
+One server answers for all of them:
+- /openai/v1: chat completions, streamed token by token with a configurable first-token latency and
+  inter-token delay, and deterministic embeddings. When a request offers the agents' LinkedIn discovery or web
+  search tools, the first answers are tool calls, so runs go through the tools like real ones.
+- /search: canned web and news results as JSON, for `SEARCH_BACKEND_URL`.
+- /contactout/v1: recorded-style LinkedIn profiles, with a share of requests answered by 429s.
+- /stats: the number of requests each stand-in served.
+
+Point the app at it with `OPENAI_BASE_URL`, `SEARCH_BACKEND_URL` and `CONTACTOUT_BASE_URL`, see `mock_env`.
+
+Usage:
+    python -m benchmarks.mock_servers --port 8900 --first-token-ms 300 --token-ms 20 --tokens 150
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+WORDS = (
+    "the agent found several relevant sources and summarized the key points of each one with care so that the "
+    "answer stays short clear and grounded in what the sources actually say about the question"
+).split()
+
+
+@dataclass
+class MockSettings:
+    """Behaviour of the stand-ins, set from the command line."""
+
+    # Seconds before the first token of a completion
+    first_token_latency: float = 0.3
+    # Seconds between tokens
+    token_delay: float = 0.02
+    # Tokens of every text completion
+    tokens: int = 150
+    # Answer with tool calls when the request offers the agents' tools
+    tool_calls: bool = True
+    # Seconds a search takes
+    search_latency: float = 0.2
+    # Seconds a ContactOut lookup takes
+    contactout_latency: float = 0.3
+    # Share of ContactOut lookups answered with 429 Too Many Requests
+    contactout_429_ratio: float = 0.0
+    seed: int = 0
+
+
+class ChatRequest(BaseModel):
+    model: str
+    messages: List[Dict[str, Any]]
+    tools: Optional[List[Dict[str, Any]]] = None
+    stream: bool = False
+    stream_options: Optional[Dict[str, Any]] = None
+
+
+class EmbeddingRequest(BaseModel):
+    model: str
+    input: Union[str, List[str]]
+    dimensions: Optional[int] = None
+
+
+def embedding(text: str, dimensions: int) -> List[float]:
+    """A deterministic unit-length vector for `text`."""
+    rng = random.Random(sha256(text.encode()).digest())
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = sum(x * x for x in vector) ** 0.5
+    return [x / norm for x in vector]
+
+
+def next_tool_call(request: ChatRequest) -> Optional[Dict[str, Any]]:
+    """The tool call a research run would make next: LinkedIn discovery, which searches and calls ContactOut, then
+    one web search. None once they are done or when the request does not offer the tools."""
+    offered = {tool["function"]["name"] for tool in request.tools or []}
+    called = {call["function"]["name"] for message in request.messages for call in message.get("tool_calls") or []}
+    if "find_linkedin_profiles" in offered and "find_linkedin_profiles" not in called:
+        return {"name": "find_linkedin_profiles", "arguments": {"role": "engineering manager", "company": "Acme"}}
+    if "duckduckgo_search" in offered and "duckduckgo_search" not in called:
+        query = next((m["content"] for m in reversed(request.messages) if m["role"] == "user"), "")
+        return {"name": "duckduckgo_search", "arguments": {"query": str(query)[:200], "max_results": 5}}
+    return None
+
+
+def usage(request: ChatRequest, completion_tokens: int) -> Dict[str, int]:
+    prompt_tokens = sum(len(str(message.get("content") or "").split()) for message in request.messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(settings: MockSettings) -> FastAPI:
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+    stats: Counter = Counter()
+    rng = random.Random(settings.seed)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    def get_stats():
+        return dict(stats)
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: ChatRequest):
+        tool_call = next_tool_call(request) if settings.tool_calls else None
+        stats["chat_completions"] += 1
+        stats["tool_calls"] += tool_call is not None
+        completion_id = f"chatcmpl-{uuid4().hex}"
+        text = [f"{WORDS[i % len(WORDS)]} " for i in range(settings.tokens)]
+        call = None
+        if tool_call is not None:
+            call = {
+                "id": f"call_{uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": tool_call["name"], "arguments": json.dumps(tool_call["arguments"])},
+            }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            body = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(body)}\n\n"
+
+        async def stream() -> AsyncIterator[str]:
+            await asyncio.sleep(settings.first_token_latency)
+            if call is not None:
+                yield chunk({"role": "assistant", "tool_calls": [{"index": 0, **call}]})
+                yield chunk({}, "tool_calls")
+            else:
+                for i, token in enumerate(text):
+                    if i:
+                        await asyncio.sleep(settings.token_delay)
+                    yield chunk({"role": "assistant", "content": token} if i == 0 else {"content": token})
+                yield chunk({}, "stop")
+            if (request.stream_options or {}).get("include_usage"):
+                body = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.model,
+                    "choices": [],
+                    "usage": usage(request, 0 if call is not None else len(text)),
+                }
+                yield f"data: {json.dumps(body)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        if request.stream:
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        # As long as the whole stream would have taken
+        generation = 0 if call is not None else settings.token_delay * max(len(text) - 1, 0)
+        await asyncio.sleep(settings.first_token_latency + generation)
+        message: Dict[str, Any] = {"role": "assistant", "content": None if call else "".join(text)}
+        if call is not None:
+            message["tool_calls"] = [call]
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model,
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if call else "stop"}],
+            "usage": usage(request, 0 if call is not None else len(text)),
+        }
+
+    @app.post("/openai/v1/embeddings")
+    def embeddings(request: EmbeddingRequest):
+        texts = [request.input] if isinstance(request.input, str) else request.input
+        stats["embeddings"] += len(texts)
+        dimensions = request.dimensions or 1536
+        return {
+            "object": "list",
+            "model": request.model,
+            "data": [
+                {"object": "embedding", "index": i, "embedding": embedding(text, dimensions)}
+                for i, text in enumerate(texts)
+            ],
+            "usage": {
+                "prompt_tokens": sum(len(t.split()) for t in texts),
+                "total_tokens": sum(len(t.split()) for t in texts),
+            },
+        }
+
+    @app.get("/search/{kind}")
+    async def search(kind: str, q: str, max_results: int = 5):
+        stats[f"search_{kind}"] += 1
+        await asyncio.sleep(settings.search_latency)
+        slug = re.sub(r"\W+", "-", q.casefold()).strip("-")[:40] or "result"
+        results = []
+        for n in range(max_results):
+            url = f"https://www.linkedin.com/in/{slug}-{n}/"
+            result = {"title": f"{q} | Result {n}", "body": f"Profile {n} matching {q}."}
+            results.append(
+                {**result, "url": url, "date": "2026-01-01T00:00:00+00:00"}
+                if kind == "news"
+                else {**result, "href": url}
+            )
+        return results
+
+    @app.get("/contactout/v1/linkedin/enrich")
+    async def contactout_enrich(request: Request):
+        stats["contactout"] += 1
+        await asyncio.sleep(settings.contactout_latency)
+        if rng.random() < settings.contactout_429_ratio:
+            stats["contactout_429"] += 1
+            return JSONResponse({"message": "Too Many Requests"}, status_code=429, headers={"retry-after": "1"})
+        url = request.query_params.get("profile") or ""
+        slug = url.rstrip("/").rsplit("/", 1)[-1] or "someone"
+        name = " ".join(part.capitalize() for part in slug.split("-")[:2])
+        return {
+            "status_code": 200,
+            "profile": {
+                "url": url,
+                "full_name": name,
+                "headline": f"Engineering Manager at Acme | {name}",
+                "industry": "Computer Software",
+                "location": "San Francisco Bay Area",
+                "country": "United States",
+                "summary": f"{name} builds and leads engineering teams.",
+                "email": [f"{slug}@example.com"],
+                "work_email": [f"{slug}@acme.example.com"],
+                "personal_email": [],
+                "phone": [],
+                "github": [],
+                "twitter": [],
+                "company": {"name": "Acme", "domain": "acme.example.com", "size": 500},
+                "experience": [{"title": "Engineering Manager", "company_name": "Acme", "start_date": "2021-03"}],
+                "education": [{"school_name": "State University", "degree": "BSc", "field_of_study": "CS"}],
+                "skills": ["Leadership", "Python", "Distributed Systems"],
+                "languages": ["English"],
+                "certifications": [],
+                "publications": [],
+                "projects": [],
+            },
+        }
+
+    return app
+
+
+def mock_env(base_url: str) -> Dict[str, str]:
+    """Environment that points the app at the stand-ins served at `base_url`, and keeps agno from calling home."""
+    return {
+        "OPENAI_BASE_URL": f"{base_url}/openai/v1",
+        "OPENAI_API_KEY": "mock",
+        "SEARCH_BACKEND_URL": f"{base_url}/search",
+        "CONTACTOUT_BASE_URL": f"{base_url}/contactout/v1",
+        "CONTACTOUT_API_TOKEN": "mock",
+        "AGNO_TELEMETRY": "false",
+        "AGNO_MONITOR": "false",
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--tokens", type=int, default=150)
+    parser.add_argument("--no-tool-calls", action="store_true", help="Only answer with text, never call tools")
+    parser.add_argument("--search-latency-ms", type=float, default=200)
+    parser.add_argument("--contactout-latency-ms", type=float, default=300)
+    parser.add_argument("--contactout-429-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    return MockSettings(
+        first_token_latency=args.first_token_ms / 1000,
+        token_delay=args.token_ms / 1000,
+        tokens=args.tokens,
+        tool_calls=not args.no_tool_calls,
+        search_latency=args.search_latency_ms / 1000,
+        contactout_latency=args.contactout_latency_ms / 1000,
+        contactout_429_ratio=args.contactout_429_ratio,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(settings_from_args(args)), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
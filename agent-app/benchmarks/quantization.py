@@ -0,0 +1,106 @@
+"""Benchmark reduced precision vector indexes for the knowledge base.
+
+Builds a full precision, a halfvec and a binary quantized HNSW index over the same synthetic corpus and reports,
+for each: index size on disk, build time, query latency and recall@k against an exact full precision scan.
+
+Usage:
+    python -m benchmarks.quantization --size 100000 --k 10
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Set
+
+from agno.vectordb.pgvector import HNSW
+from sqlalchemy.sql.expression import text
+
+from benchmarks.corpus import HashEmbedder, SyntheticCorpus, load_corpus
+from benchmarks.utils import summarize_latencies
+from db.session import db_url
+from knowledge.vector_db import VECTOR_STORAGE_TYPES, KnowledgeVectorDb
+
+
+def exact_neighbors(vector_db: KnowledgeVectorDb, query_embedding: List[float], k: int) -> Set[str]:
+    """Return the ids of the true k nearest rows by scanning the table without any index."""
+    stmt = vector_db._vector_candidates(query_embedding, k, filters=None)
+    with vector_db.Session() as sess, sess.begin():
+        sess.execute(text("SET LOCAL enable_indexscan = off"))
+        sess.execute(text("SET LOCAL enable_bitmapscan = off"))
+        return {row.id for row in sess.execute(stmt)}
+
+
+def index_size_bytes(vector_db: KnowledgeVectorDb, index_name: str) -> int:
+    with vector_db.Session() as sess, sess.begin():
+        return sess.execute(
+            text("SELECT pg_relation_size(to_regclass(:name))"), {"name": f'{vector_db.schema}."{index_name}"'}
+        ).scalar_one()
+
+
+def run(size: int, num_queries: int, k: int, rerank_multiplier: int, batch_size: int) -> Dict[str, Any]:
+    embedder = HashEmbedder()
+    corpus = SyntheticCorpus(size=size)
+    table_name = f"bench_quant_{size}"
+
+    full_db = KnowledgeVectorDb(
+        table_name=table_name, db_url=db_url, embedder=embedder, vector_storage="full", cache_searches=False
+    )
+    load_corpus(full_db, corpus, batch_size)
+
+    queries = corpus.queries(num_queries)
+    query_embeddings = [embedder.get_embedding(query) for query in queries]
+    ground_truth = [exact_neighbors(full_db, query_embedding, k) for query_embedding in query_embeddings]
+
+    result: Dict[str, Any] = {"size": size, "k": k, "rerank_multiplier": rerank_multiplier}
+    with full_db.Session() as sess, sess.begin():
+        result["table_bytes"] = sess.execute(
+            text("SELECT pg_table_size(to_regclass(:name))"), {"name": full_db.table.fullname}
+        ).scalar_one()
+
+    for vector_storage in VECTOR_STORAGE_TYPES:
+        index_name = f"{table_name}_hnsw_{vector_storage}_index"
+        vector_db = KnowledgeVectorDb(
+            table_name=table_name,
+            db_url=db_url,
+            embedder=embedder,
+            vector_storage=vector_storage,
+            vector_index=HNSW(name=index_name),
+            rerank_multiplier=rerank_multiplier,
+            cache_searches=False,
+        )
+
+        start = time.perf_counter()
+        vector_db._create_vector_index(force_recreate=True)
+        build_seconds = time.perf_counter() - start
+
+        latencies: List[float] = []
+        recalls: List[float] = []
+        for query, truth in zip(queries, ground_truth):
+            start = time.perf_counter()
+            documents = vector_db.vector_search(query, limit=k)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(len({document.id for document in documents} & truth) / k)
+
+        result[vector_storage] = {
+            "index_bytes": index_size_bytes(vector_db, index_name),
+            "build_seconds": round(build_seconds, 2),
+            f"recall@{k}": round(sum(recalls) / len(recalls), 4),
+            "latency": summarize_latencies(latencies),
+        }
+        print(json.dumps({vector_storage: result[vector_storage]}, indent=2))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank-multiplier", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.size, args.queries, args.k, args.rerank_multiplier, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
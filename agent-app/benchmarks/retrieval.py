@@ -0,0 +1,273 @@
+"""Benchmark knowledge retrieval the way Sage searches, at several corpus sizes, and save the results as JSON.
+
+For every size the synthetic corpus is loaded into its own `ai.bench_retrieval_*` table in the local dev
+database, with deterministic embeddings, and indexed the way `sage_knowledge` is. Then a fixed query set is run
+with each search mode and the benchmark reports:
+- ingest throughput, when the corpus is loaded, and index build time, when the indexes are built
+- latency percentiles of one query at a time, and QPS with `--concurrency` queries at a time
+- recall@k against an exact nearest neighbour scan, and the share of results from the query's own topic
+
+The knowledge settings (fusion, weights, candidates, vector storage) apply as in the app, so export them before
+running to compare tunings. Results go to `benchmarks/results/retrieval-<commit>.json`; pass the file of an earlier
+commit as `--baseline` to print the changes.
+
+Usage:
+    python -m benchmarks.retrieval --sizes 10000 100000 1000000 --queries 200 --k 10
+    python -m benchmarks.retrieval --sizes 100000 --baseline benchmarks/results/retrieval-<commit>.json
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from agno.document import Document
+from agno.vectordb.pgvector import SearchType
+
+from benchmarks.corpus import HashEmbedder, SyntheticCorpus, load_corpus
+from benchmarks.quantization import exact_neighbors
+from benchmarks.utils import summarize_latencies
+from db.session import db_url
+from knowledge.settings import knowledge_settings
+from knowledge.vector_db import KnowledgeVectorDb
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SEARCH_MODES = ("vector", "keyword", "hybrid")
+# Settings that change what or how fast a search returns
+SEARCH_SETTINGS = (
+    "knowledge_content_language",
+    "knowledge_rank_normalization",
+    "knowledge_fusion",
+    "knowledge_vector_score_weight",
+    "knowledge_rrf_k",
+    "knowledge_candidate_multiplier",
+    "knowledge_vector_storage",
+    "knowledge_rerank_multiplier",
+)
+
+
+def git_commit() -> str:
+    """The short hash of HEAD, with "-dirty" when the tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty.strip() else commit
+
+
+def ground_truth(
+    exact_db: KnowledgeVectorDb, embedder: HashEmbedder, size: int, queries: List[str], k: int
+) -> List[Set[str]]:
+    """Ids of the exact k nearest chunks of every query, cached in the results directory since the corpus and
+    queries are the same on every run."""
+    path = RESULTS_DIR / f"ground_truth-{size}-{len(queries)}-{k}.json"
+    if path.exists():
+        return [set(ids) for ids in json.loads(path.read_text())]
+    start = time.perf_counter()
+    truth = [exact_neighbors(exact_db, embedder.get_embedding(query), k) for query in queries]
+    print(
+        f"{exact_db.table.fullname}: exact neighbours of {len(queries)} queries in {time.perf_counter() - start:.1f}s"
+    )
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path.write_text(json.dumps([sorted(ids) for ids in truth]))
+    return truth
+
+
+def measure(
+    search: Callable[[str], List[Document]],
+    labeled_queries: List[Tuple[str, int]],
+    truth: List[Set[str]],
+    k: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    queries = [query for query, _ in labeled_queries]
+    # Warm up caches and connections before measuring
+    for query in queries[:3]:
+        search(query)
+
+    latencies: List[float] = []
+    recalls: List[float] = []
+    topic_precisions: List[float] = []
+    for i, (query, topic) in enumerate(labeled_queries):
+        start = time.perf_counter()
+        documents = search(query)
+        latencies.append(time.perf_counter() - start)
+        if i < len(truth):
+            recalls.append(len({document.id for document in documents} & truth[i]) / k)
+        if documents:
+            on_topic = sum((document.meta_data or {}).get("topic") == topic for document in documents)
+            topic_precisions.append(on_topic / len(documents))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(search, queries))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "qps": round(len(queries) / elapsed, 1),
+        "latency": summarize_latencies(latencies),
+        f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        "topic_precision": round(sum(topic_precisions) / len(topic_precisions), 4) if topic_precisions else None,
+    }
+
+
+def run_size(
+    size: int,
+    num_queries: int,
+    recall_queries: int,
+    k: int,
+    concurrency: int,
+    modes: List[str],
+    batch_size: int,
+    reload: bool,
+    rebuild_indexes: bool,
+) -> Dict[str, Any]:
+    embedder = HashEmbedder()
+    corpus = SyntheticCorpus(size=size)
+    table_name = f"bench_retrieval_{size}"
+    vector_db = KnowledgeVectorDb(
+        table_name=table_name,
+        db_url=db_url,
+        embedder=embedder,
+        search_type=SearchType.hybrid,
+        cache_searches=False,
+    )
+    result: Dict[str, Any] = {"size": size}
+
+    if reload:
+        vector_db.drop()
+    start = time.perf_counter()
+    inserted = load_corpus(vector_db, corpus, batch_size)
+    if inserted:
+        elapsed = time.perf_counter() - start
+        result["ingest"] = {
+            "chunks": inserted,
+            "seconds": round(elapsed, 2),
+            "chunks_per_second": round(inserted / elapsed, 1),
+        }
+
+    if inserted or rebuild_indexes:
+        start = time.perf_counter()
+        vector_db.optimize(force_recreate=True)
+        result["index_build_seconds"] = round(time.perf_counter() - start, 2)
+        print(f"{vector_db.table.fullname}: built indexes in {result['index_build_seconds']}s")
+    else:
+        vector_db.optimize()
+
+    labeled_queries = corpus.labeled_queries(num_queries)
+    exact_db = KnowledgeVectorDb(
+        table_name=table_name, db_url=db_url, embedder=embedder, vector_storage="full", cache_searches=False
+    )
+    truth = ground_truth(exact_db, embedder, size, [query for query, _ in labeled_queries[:recall_queries]], k)
+
+    searches = {
+        "vector": lambda query: vector_db.vector_search(query, limit=k),
+        "keyword": lambda query: vector_db.keyword_search(query, limit=k),
+        "hybrid": lambda query: vector_db.hybrid_search(query, limit=k),
+    }
+    for mode in modes:
+        result[mode] = measure(searches[mode], labeled_queries, truth, k, concurrency)
+        print(json.dumps({"size": size, mode: result[mode]}, indent=2))
+    return result
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Relative change of the main metrics of every size and search mode found in both runs."""
+    k = current["k"]
+    metrics = {
+        "qps": lambda r: r["qps"],
+        "p50_ms": lambda r: r["latency"]["p50_ms"],
+        "p95_ms": lambda r: r["latency"]["p95_ms"],
+        f"recall@{k}": lambda r: r.get(f"recall@{k}"),
+        "topic_precision": lambda r: r.get("topic_precision"),
+    }
+    baseline_sizes = {result["size"]: result for result in baseline["sizes"]}
+    changes = []
+    for result in current["sizes"]:
+        before_size = baseline_sizes.get(result["size"])
+        if before_size is None:
+            continue
+        for mode in SEARCH_MODES:
+            if mode not in result or mode not in before_size:
+                continue
+            for name, get in metrics.items():
+                before, after = get(before_size[mode]), get(result[mode])
+                if before is None or after is None:
+                    continue
+                change = round((after - before) / before * 100, 1) if before else None
+                changes.append(
+                    {
+                        "size": result["size"],
+                        "mode": mode,
+                        "metric": name,
+                        "baseline": before,
+                        "current": after,
+                        "change_pct": change,
+                    }
+                )
+    return changes
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "settings": {name: getattr(knowledge_settings, name) for name in SEARCH_SETTINGS},
+        "queries": args.queries,
+        "recall_queries": min(args.recall_queries, args.queries),
+        "k": args.k,
+        "concurrency": args.concurrency,
+        "sizes": [],
+    }
+    for size in args.sizes:
+        result["sizes"].append(
+            run_size(
+                size,
+                args.queries,
+                args.recall_queries,
+                args.k,
+                args.concurrency,
+                args.modes,
+                args.batch_size,
+                args.reload,
+                args.rebuild_indexes,
+            )
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--recall-queries", type=int, default=50, help="Queries scored for recall, each needs an exact scan once"
+    )
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--modes", nargs="+", default=list(SEARCH_MODES), choices=SEARCH_MODES)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reload", action="store_true", help="Drop and load the corpus again to measure ingest")
+    parser.add_argument("--rebuild-indexes", action="store_true", help="Build the indexes again to time them")
+    parser.add_argument("--output", type=Path, help="Where to save the results, by default under the commit")
+    parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    result = run(args)
+    output = args.output or RESULTS_DIR / f"retrieval-{result['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Saved results to {output}")
+    if args.baseline is not None:
+        print(json.dumps(compare(result, json.loads(args.baseline.read_text())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the shared web search service against a local stand-in search backend.
+
+The stand-in answers every query after a fixed latency with deterministic results, some of them shared between
+queries, and counts the calls it gets. Reports, for a batch of query variations like the ones the LinkedIn
+researcher issues:
+- serial searches, the way agents called DuckDuckGo one tool call at a time
+- one concurrent multi-query search, and the number of results left after de-duplication by url
+- the same multi-query search repeated, served from the cache
+- concurrent identical searches, coalesced into a single backend call
+
+Usage:
+    python -m benchmarks.search --queries 6 --latency-ms 800
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from tools.search import SearchService
+
+
+class StandInBackend:
+    """Search backend that answers after `latency` seconds, results overlap between queries sharing a word."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        words = query.split()
+        return [
+            {
+                "title": f"Result {n} for {words[n % len(words)]}",
+                "href": f"https://www.linkedin.com/in/{words[n % len(words)]}-{n}/",
+                "body": f"{query} result {n}",
+            }
+            for n in range(max_results)
+        ]
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return [{**result, "url": result.pop("href")} for result in self.text(query, max_results)]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return round(time.perf_counter() - start, 3)
+
+
+def run(num_queries: int, latency_ms: float, max_results: int) -> Dict[str, Any]:
+    roles = ["recruiter", "talent acquisition", "hiring manager", "founder", "ceo", "engineering manager"]
+    queries = [f"site:linkedin.com/in/ {roles[i % len(roles)]} acme {i // len(roles)}" for i in range(num_queries)]
+    result: Dict[str, Any] = {"queries": num_queries, "latency_ms": latency_ms}
+
+    backend = StandInBackend(latency_ms / 1000)
+    service = SearchService(backend=backend, db_cache=False, max_workers=num_queries)
+    result["serial_seconds"] = timed(lambda: [service.backend.text(query, max_results) for query in queries])
+
+    merged: List[Dict[str, Any]] = []
+
+    def multi_search() -> None:
+        merged[:], _ = service.search_many(queries, max_results)
+
+    backend.calls = 0
+    result["multi_search_seconds"] = timed(multi_search)
+    result["multi_search_results"] = {"total": num_queries * max_results, "unique_urls": len(merged)}
+    result["cached_multi_search_seconds"] = timed(multi_search)
+    result["backend_calls"] = backend.calls
+
+    backend.calls = 0
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        result["coalesced_seconds"] = timed(
+            lambda: list(executor.map(lambda _: service.search("site:linkedin.com/in/ cto globex"), range(8)))
+        )
+    result["coalesced_backend_calls"] = backend.calls
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--max-results", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.queries, args.latency_ms, args.max_results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark API cold start: import time of `api.main` and time until /v1/health responds.
+
+Imports `api.main` in a fresh interpreter with `-X importtime` and reports the total import time and the imports
+with the highest cumulative time, indented by depth. Then starts uvicorn the way the container does, polls
+/v1/health and reports the time from process start to the first successful response, and the resident memory of
+the server then. Every run uses a new process, so caches do not carry over.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --top 15
+"""
+
+import argparse
+import json
+import re
+import socket
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) of every import made by importing `module`, nested ones indented."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times.append((match.group(3)[1:] + match.group(4), int(match.group(1)), int(match.group(2))))
+    return times
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB, None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def boot(timeout: float = 120.0) -> Tuple[float, Optional[float]]:
+    """Seconds from starting uvicorn to the first 200 from /v1/health, and the resident memory of the server then."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/v1/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - start, rss_mb(process.pid)
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"/v1/health did not respond within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(num_runs: int, top: int) -> Dict[str, Any]:
+    imports = import_times("api.main")
+    api_main = next((cumulative for name, _, cumulative in imports if name == "api.main"), None)
+    slowest = sorted(imports, key=lambda item: item[2], reverse=True)[1 : top + 1]
+    boots = [boot() for _ in range(num_runs)]
+    health = [seconds for seconds, _ in boots]
+    rss = [mb for _, mb in boots if mb is not None]
+    return {
+        "import_api_main_ms": round(api_main / 1000, 1) if api_main is not None else None,
+        "slowest_imports_ms": {name: round(cumulative / 1000, 1) for name, _, cumulative in slowest},
+        "time_to_health_ms": {
+            "runs": num_runs,
+            "median": round(median(health) * 1000, 1),
+            "min": round(min(health) * 1000, 1),
+            "max": round(max(health) * 1000, 1),
+        },
+        "rss_after_boot_mb": round(median(rss), 1) if rss else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.top), indent=2))
+
+
+if __name__ == "__main__":
+    main()
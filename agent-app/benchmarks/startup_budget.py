@@ -0,0 +1,96 @@
+"""Check API and UI startup against a budget, exits with status 1 when any check fails.
+
+Fails when:
+- importing `api.main` or the UI chat engine loads a module of the workspace or infra tooling, e.g. `workspace`,
+  `agno.docker`, `agno.aws` or boto3,
+- the median import time of `api.main` is over `--max-import-ms`,
+- the resident memory of the API once /v1/health responds is over `--max-rss-mb`.
+
+The same checks run with the default budget in tests/test_startup_budget.py. The budget is meant to catch
+regressions rather than to be tight:
+
+Usage:
+    python -m benchmarks.startup_budget --max-import-ms 3000 --max-rss-mb 300
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from statistics import median
+from typing import Any, Dict, List
+
+from benchmarks.startup import boot, import_times
+
+# Runtime processes must not import these, they are for building and deploying the app
+FORBIDDEN_MODULES = ("workspace", "agno.docker", "agno.aws", "agno.infra", "agno.cli", "boto3", "botocore", "docker")
+RUNTIME_MODULES = ("api.main", "ui.chat")
+# Default budget, also enforced by tests/test_startup_budget.py
+MAX_IMPORT_MS = 3000
+MAX_RSS_MB = 300
+
+
+def imported_modules(module: str) -> List[str]:
+    """Modules loaded by importing `module` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def forbidden_imports(module: str) -> List[str]:
+    return sorted(
+        name
+        for name in imported_modules(module)
+        if any(name == forbidden or name.startswith(f"{forbidden}.") for forbidden in FORBIDDEN_MODULES)
+    )
+
+
+def median_import_ms(module: str, num_runs: int) -> float:
+    """Median cumulative import time of `module` in fresh interpreters, in ms."""
+    import_ms = []
+    for _ in range(num_runs):
+        cumulative = next(cumulative for name, _, cumulative in import_times(module) if name == module)
+        import_ms.append(cumulative / 1000)
+    return median(import_ms)
+
+
+def run(max_import_ms: float, max_rss_mb: float, num_runs: int) -> Dict[str, Any]:
+    failures = []
+    for module in RUNTIME_MODULES:
+        forbidden = forbidden_imports(module)
+        if forbidden:
+            failures.append(f"{module} imports {', '.join(forbidden[:10])}")
+
+    import_ms = median_import_ms("api.main", num_runs)
+    if import_ms > max_import_ms:
+        failures.append(f"api.main imports in {import_ms:.0f} ms, over the {max_import_ms:.0f} ms budget")
+
+    _, rss = boot()
+    if rss is not None and rss > max_rss_mb:
+        failures.append(f"The API uses {rss:.0f} MB after boot, over the {max_rss_mb:.0f} MB budget")
+
+    return {
+        "import_api_main_ms": round(import_ms, 1),
+        "rss_after_boot_mb": round(rss, 1) if rss is not None else None,
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-import-ms", type=float, default=MAX_IMPORT_MS)
+    parser.add_argument("--max-rss-mb", type=float, default=MAX_RSS_MB)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    result = run(args.max_import_ms, args.max_rss_mb, args.runs)
+    print(json.dumps(result, indent=2))
+    if result["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
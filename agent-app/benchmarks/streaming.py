@@ -0,0 +1,66 @@
+"""Benchmark repainting a streamed response in the UI, per token against the coalescing `StreamRenderer`.
+
+Streams a synthetic answer token by token at a fixed inter-token delay into a stand-in container that counts the
+markdown updates and the characters they send to the browser. Nothing is rendered and no model is called.
+
+Usage:
+    python -m benchmarks.streaming --tokens 2000 --token-ms 5
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from ui.streaming import StreamRenderer
+
+
+class CountingContainer:
+    """Stands in for `st.empty()`, counting updates and the characters they would send."""
+
+    def __init__(self):
+        self.updates = 0
+        self.chars_sent = 0
+
+    def markdown(self, body: str) -> None:
+        self.updates += 1
+        self.chars_sent += len(body)
+
+
+def run(num_tokens: int, token_ms: float) -> Dict[str, Any]:
+    tokens = [f"word{n % 97} " for n in range(num_tokens)]
+
+    per_token = CountingContainer()
+    response = ""
+    for token in tokens:
+        time.sleep(token_ms / 1000)
+        response += token
+        per_token.markdown(response)
+
+    coalesced = CountingContainer()
+    renderer = StreamRenderer(coalesced, tool_calls_container=None)
+    for token in tokens:
+        time.sleep(token_ms / 1000)
+        renderer.add(token)
+    renderer.flush()
+    assert renderer.response == response
+
+    return {
+        "tokens": num_tokens,
+        "response_chars": len(response),
+        "per_token": {"updates": per_token.updates, "chars_sent": per_token.chars_sent},
+        "coalesced": {"updates": coalesced.updates, "chars_sent": coalesced.chars_sent},
+        "traffic_ratio": round(coalesced.chars_sent / per_token.chars_sent, 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--token-ms", type=float, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.tokens, args.token_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Add stored tsvector column and GIN index to sage_knowledge
+
+Revision ID: 3f9c1a7b2d40
+Revises:
+Create Date: 2026-10-19 09:12:44.318204
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f9c1a7b2d40"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ai.sage_knowledge is created lazily by the agent on first use, new tables already get the column.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('ai.sage_knowledge') IS NOT NULL THEN
+                ALTER TABLE ai.sage_knowledge
+                    ADD COLUMN IF NOT EXISTS content_tsv tsvector
+                    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(content, ''))) STORED;
+                CREATE INDEX IF NOT EXISTS idx_sage_knowledge_content_tsv
+                    ON ai.sage_knowledge USING gin (content_tsv);
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ai.idx_sage_knowledge_content_tsv")
+    op.execute("ALTER TABLE IF EXISTS ai.sage_knowledge DROP COLUMN IF EXISTS content_tsv")
@@ -0,0 +1,37 @@
+"""Create search_results table
+
+Revision ID: 5e8a3c2f7b14
+Revises: c51d7e0a9f26
+Create Date: 2026-10-19 14:48:12.220561
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5e8a3c2f7b14"
+down_revision = "c51d7e0a9f26"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_results",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("query", sa.String(), nullable=False),
+        sa.Column("results", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        schema="public",
+    )
+    op.create_index(
+        op.f("ix_public_search_results_created_at"), "search_results", ["created_at"], unique=False, schema="public"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_public_search_results_created_at"), table_name="search_results", schema="public")
+    op.drop_table("search_results", schema="public")
@@ -0,0 +1,37 @@
+"""Add namespace column and index to sage_knowledge
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9c1a7b2d40
+Create Date: 2026-10-19 11:37:05.562914
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2e4d6f1a93"
+down_revision = "3f9c1a7b2d40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows loaded before namespaces were added stay in the default namespace ''.
+    # Hash partitioning (KNOWLEDGE_PARTITIONS) only applies to tables created after this migration.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('ai.sage_knowledge') IS NOT NULL THEN
+                ALTER TABLE ai.sage_knowledge ADD COLUMN IF NOT EXISTS namespace varchar NOT NULL DEFAULT '';
+                CREATE INDEX IF NOT EXISTS idx_sage_knowledge_namespace_name
+                    ON ai.sage_knowledge (namespace, name);
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ai.idx_sage_knowledge_namespace_name")
+    op.execute("ALTER TABLE IF EXISTS ai.sage_knowledge DROP COLUMN IF EXISTS namespace")
@@ -0,0 +1,47 @@
+"""Create ingestion_jobs table
+
+Revision ID: 9d4f2b6e1c37
+Revises: 5e8a3c2f7b14
+Create Date: 2026-10-19 16:05:41.318907
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d4f2b6e1c37"
+down_revision = "5e8a3c2f7b14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("namespace", sa.String(), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("chunks_parsed", sa.Integer(), nullable=False),
+        sa.Column("chunks_embedded", sa.Integer(), nullable=False),
+        sa.Column("chunks_stored", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="public",
+    )
+    op.create_index(
+        op.f("ix_public_ingestion_jobs_created_at"), "ingestion_jobs", ["created_at"], unique=False, schema="public"
+    )
+    op.create_index(
+        op.f("ix_public_ingestion_jobs_namespace"), "ingestion_jobs", ["namespace"], unique=False, schema="public"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_public_ingestion_jobs_namespace"), table_name="ingestion_jobs", schema="public")
+    op.drop_index(op.f("ix_public_ingestion_jobs_created_at"), table_name="ingestion_jobs", schema="public")
+    op.drop_table("ingestion_jobs", schema="public")
@@ -0,0 +1,35 @@
+"""Add kind and pages_crawled columns to ingestion_jobs
+
+Revision ID: a4c7e2f91b08
+Revises: e7a1c4d9b253
+Create Date: 2026-10-19 19:12:48.207615
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a4c7e2f91b08"
+down_revision = "e7a1c4d9b253"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Jobs created before crawls ran in the background are all uploads
+    op.add_column(
+        "ingestion_jobs",
+        sa.Column("kind", sa.String(), server_default="file", nullable=False),
+        schema="public",
+    )
+    op.add_column(
+        "ingestion_jobs",
+        sa.Column("pages_crawled", sa.Integer(), server_default="0", nullable=False),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_jobs", "pages_crawled", schema="public")
+    op.drop_column("ingestion_jobs", "kind", schema="public")
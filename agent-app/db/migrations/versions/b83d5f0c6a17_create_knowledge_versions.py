@@ -0,0 +1,31 @@
+"""Create knowledge_versions table
+
+Revision ID: b83d5f0c6a17
+Revises: a4c7e2f91b08
+Create Date: 2026-10-19 21:04:37.518204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b83d5f0c6a17"
+down_revision = "a4c7e2f91b08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_versions",
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_versions", schema="public")
@@ -0,0 +1,40 @@
+"""Create crawled_pages table
+
+Revision ID: c51d7e0a9f26
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-19 13:05:21.904377
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c51d7e0a9f26"
+down_revision = "8b2e4d6f1a93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crawled_pages",
+        sa.Column("namespace", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("site", sa.String(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(), nullable=True),
+        sa.Column("links", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("num_chunks", sa.Integer(), nullable=False),
+        sa.Column("crawled_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("namespace", "url"),
+        schema="public",
+    )
+    op.create_index(op.f("ix_public_crawled_pages_site"), "crawled_pages", ["site"], unique=False, schema="public")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_public_crawled_pages_site"), table_name="crawled_pages", schema="public")
+    op.drop_table("crawled_pages", schema="public")
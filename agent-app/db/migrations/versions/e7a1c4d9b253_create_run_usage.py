@@ -0,0 +1,50 @@
+"""Create run_usage table
+
+Revision ID: e7a1c4d9b253
+Revises: 9d4f2b6e1c37
+Create Date: 2026-10-19 18:22:07.514093
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7a1c4d9b253"
+down_revision = "9d4f2b6e1c37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_usage",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.String(), nullable=True),
+        sa.Column("session_id", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("agent_id", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("cached_tokens", sa.Integer(), nullable=False),
+        sa.Column("tool_calls", sa.Integer(), nullable=False),
+        sa.Column("contactout_credits", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("wall_seconds", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="public",
+    )
+    op.create_index(op.f("ix_public_run_usage_agent_id"), "run_usage", ["agent_id"], unique=False, schema="public")
+    op.create_index(op.f("ix_public_run_usage_created_at"), "run_usage", ["created_at"], unique=False, schema="public")
+    op.create_index(op.f("ix_public_run_usage_user_id"), "run_usage", ["user_id"], unique=False, schema="public")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_public_run_usage_user_id"), table_name="run_usage", schema="public")
+    op.drop_index(op.f("ix_public_run_usage_created_at"), table_name="run_usage", schema="public")
+    op.drop_index(op.f("ix_public_run_usage_agent_id"), table_name="run_usage", schema="public")
+    op.drop_table("run_usage", schema="public")
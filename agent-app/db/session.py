@@ -1,13 +1,41 @@
+import time
 from typing import Generator
 
+from sqlalchemy import event
 from sqlalchemy.engine import Engine, create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
 
 from db.settings import db_settings
+from utils.metrics import db_pool_checked_out, db_pool_checkouts, db_pool_wait_seconds
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection, including opening a new one."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - start)
+
 
 # Create SQLAlchemy Engine using a database URL
 db_url: str = db_settings.get_db_url()
-db_engine: Engine = create_engine(db_url, pool_pre_ping=True)
+db_engine: Engine = create_engine(db_url, pool_pre_ping=True, poolclass=InstrumentedQueuePool)
+
+
+@event.listens_for(db_engine, "checkout")
+def _on_checkout(*args) -> None:
+    db_pool_checkouts.inc()
+    db_pool_checked_out.inc()
+
+
+@event.listens_for(db_engine, "checkin")
+def _on_checkin(*args) -> None:
+    db_pool_checked_out.dec()
+
 
 # Create a SessionLocal class
 SessionLocal: sessionmaker[Session] = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
@@ -19,6 +19,9 @@ class DbSettings(BaseSettings):
     db_driver: str = "postgresql+psycopg"
     # Create/Upgrade database on startup using alembic
     migrate_db: bool = False
+    # Used when RUNTIME_ENV is not set, the database of dev_db in workspace/dev_resources.py on localhost.
+    # Read from here so the app never imports the workspace and its docker tooling.
+    db_local_url: str = "postgresql+psycopg://ai:ai@localhost:5432/ai"
 
     def get_db_url(self) -> str:
         db_url = "{}://{}{}@{}:{}/{}".format(
@@ -31,12 +34,8 @@ class DbSettings(BaseSettings):
         )
         # Use local database if RUNTIME_ENV is not set
         if "None" in db_url and getenv("RUNTIME_ENV") is None:
-            from workspace.dev_resources import dev_db
-
             # logger.debug("Using local connection")
-            local_db_url = dev_db.get_db_connection_local()
-            if local_db_url:
-                db_url = local_db_url
+            db_url = self.db_local_url
 
         # Validate database connection
         if "None" in db_url or db_url is None:
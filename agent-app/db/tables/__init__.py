@@ -1 +1,6 @@
 from db.tables.base import Base
+from db.tables.crawled_page import CrawledPage
+from db.tables.ingestion_job import IngestionJob
+from db.tables.knowledge_version import KnowledgeVersion
+from db.tables.run_usage import RunUsage
+from db.tables.search_result import SearchResult
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class CrawledPage(Base):
+    """Last crawl of a web page loaded into a knowledge base, used for conditional requests on re-crawl."""
+
+    __tablename__ = "crawled_pages"
+
+    # Knowledge namespace the page was loaded into, and the page url after redirects
+    namespace: Mapped[str] = mapped_column(String, primary_key=True)
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    # Url the crawl started from, also the name of the page's documents in the knowledge base
+    site: Mapped[str] = mapped_column(String, index=True)
+    etag: Mapped[Optional[str]] = mapped_column(String)
+    last_modified: Mapped[Optional[str]] = mapped_column(String)
+    content_hash: Mapped[Optional[str]] = mapped_column(String)
+    # Links on the page, so an unchanged page still leads the crawl to the pages it links to
+    links: Mapped[List[str]] = mapped_column(JSONB, default=list)
+    num_chunks: Mapped[int] = mapped_column(Integer, default=0)
+    crawled_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
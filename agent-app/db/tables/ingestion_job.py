@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class IngestionJob(Base):
+    """A document or website loaded into a knowledge base in the background, see `knowledge.jobs.IngestionJobRunner`."""
+
+    __tablename__ = "ingestion_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    # Knowledge table and namespace the document is loaded into
+    table_name: Mapped[str] = mapped_column(String)
+    namespace: Mapped[str] = mapped_column(String, index=True)
+    # "file" for an uploaded document, "crawl" for a website, whose start url is then the file name
+    kind: Mapped[str] = mapped_column(String, default="file", server_default="file")
+    file_name: Mapped[str] = mapped_column(String)
+    # One of "queued", "running", "done" or "failed"
+    status: Mapped[str] = mapped_column(String, default="queued")
+    # Pages fetched so far, for crawls
+    pages_crawled: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    chunks_parsed: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_embedded: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_stored: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[Optional[str]] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class KnowledgeVersion(Base):
+    """Bumped on every write to a knowledge table, so every process drops its cached searches, see `knowledge.cache`."""
+
+    __tablename__ = "knowledge_versions"
+
+    # Full name of the knowledge table, e.g. "ai.sage_knowledge"
+    table_name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
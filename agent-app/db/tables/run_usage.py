@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class RunUsage(Base):
+    """Tokens, tool calls, ContactOut credits and time used by one agent run, see `agents.usage`."""
+
+    __tablename__ = "run_usage"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[Optional[str]] = mapped_column(String)
+    session_id: Mapped[Optional[str]] = mapped_column(String)
+    user_id: Mapped[Optional[str]] = mapped_column(String, index=True)
+    agent_id: Mapped[str] = mapped_column(String, index=True)
+    # Model that served the run, the last one tried for routed runs
+    model: Mapped[Optional[str]] = mapped_column(String)
+    # "api" or "ui"
+    source: Mapped[str] = mapped_column(String)
+    # "ok" or "error"
+    status: Mapped[str] = mapped_column(String)
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    # Input tokens served from the provider's prompt cache
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    tool_calls: Mapped[int] = mapped_column(Integer, default=0)
+    # Profiles enriched with ContactOut, one credit each
+    contactout_credits: Mapped[int] = mapped_column(Integer, default=0)
+    # Estimated from the model prices in `routing_model_costs`, 0 for models without a price
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+    wall_seconds: Mapped[float] = mapped_column(Float)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
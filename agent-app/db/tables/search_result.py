@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, List
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class SearchResult(Base):
+    """Cached web search results shared by every process, see `tools.search.SearchService`."""
+
+    __tablename__ = "search_results"
+
+    # Hash of the search kind, normalized query and number of results
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    query: Mapped[str] = mapped_column(String)
+    results: Mapped[List[Any]] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
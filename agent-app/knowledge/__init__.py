@@ -0,0 +1,5 @@
+"""Knowledge base components for the agent app."""
+
+from knowledge.vector_db import KnowledgeVectorDb
+
+__all__ = ["KnowledgeVectorDb"]
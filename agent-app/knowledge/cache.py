@@ -0,0 +1,113 @@
+"""Process-wide caches for knowledge base searches and query embeddings.
+
+Agents are rebuilt per request, so the caches live at module level and are shared by every vector db instance
+in the process. Search results are keyed on the knowledge version of their table. Every write or delete bumps it
+in the knowledge_versions table, so the API drops its cached searches when the UI loads or deletes documents.
+A process reads the version again at most every `knowledge_version_ttl` seconds, which bounds how long it serves
+searches cached before another process wrote. Its own writes are seen at once. If the version cannot be read or
+bumped, e.g. before the migration is applied, other processes only see the write once their cached searches
+expire, after `knowledge_search_cache_ttl` seconds.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple
+
+from agno.embedder import Embedder
+from agno.utils.log import logger
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import func, select
+
+from db.tables import KnowledgeVersion
+from knowledge.settings import knowledge_settings
+from utils.cache import TTLCache
+
+search_cache = TTLCache(
+    maxsize=knowledge_settings.knowledge_search_cache_size,
+    ttl=knowledge_settings.knowledge_search_cache_ttl,
+    name="knowledge_search",
+)
+embedding_cache = TTLCache(maxsize=knowledge_settings.knowledge_embedding_cache_size, name="query_embedding")
+
+# Last version of each table read from or written to Postgres, with when it was read
+_versions: Dict[str, Tuple[int, float]] = {}
+# Writes made by this process, so they invalidate its searches even when the version could not be bumped
+_local_writes: DefaultDict[str, int] = defaultdict(int)
+_versions_lock = Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share cache entries."""
+    return " ".join(query.casefold().split())
+
+
+def knowledge_version(table: str, session_factory: Callable[[], Session]) -> Tuple[int, int]:
+    """The version of `table` to key its cached searches on, read from Postgres once per `knowledge_version_ttl`."""
+    now = monotonic()
+    read = _versions.get(table)
+    if read is None or now - read[1] >= knowledge_settings.knowledge_version_ttl:
+        stmt = select(KnowledgeVersion.version).where(KnowledgeVersion.table_name == table)
+        try:
+            with session_factory() as sess:
+                version = sess.execute(stmt).scalar_one_or_none() or 0
+        except Exception as e:
+            logger.warning(f"Could not read the knowledge version of {table}: {e}")
+            version = read[0] if read is not None else 0
+        read = _versions[table] = (version, now)
+    return read[0], _local_writes[table]
+
+
+def bump_knowledge_version(table: str, session_factory: Callable[[], Session]) -> None:
+    """Invalidate the cached searches on `table` in every process, call once a write to it is committed."""
+    with _versions_lock:
+        _local_writes[table] += 1
+    insert_stmt = postgresql.insert(KnowledgeVersion).values(table_name=table, version=1)
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[KnowledgeVersion.table_name],
+        set_={"version": KnowledgeVersion.version + 1, "updated_at": func.now()},
+    ).returning(KnowledgeVersion.version)
+    try:
+        with session_factory() as sess, sess.begin():
+            version = sess.execute(upsert_stmt).scalar_one()
+    except Exception as e:
+        logger.warning(
+            f"Could not bump the knowledge version of {table}, other processes may serve stale searches: {e}"
+        )
+        return
+    _versions[table] = (version, monotonic())
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """Embedder that caches query embeddings of the embedder it wraps.
+
+    Only `get_embedding`, which vector dbs use for queries, is cached. Document embeddings go through
+    `get_embedding_and_usage` and are not worth keeping in memory.
+    """
+
+    embedder: Optional[Embedder] = None
+
+    def __post_init__(self) -> None:
+        if self.embedder is None:
+            raise ValueError("CachedEmbedder requires an embedder to wrap")
+        self.dimensions = self.embedder.dimensions
+
+    def _cache_key(self, text: str) -> Tuple[Any, ...]:
+        return (type(self.embedder).__name__, getattr(self.embedder, "id", None), self.dimensions, text)
+
+    def get_embedding(self, text: str) -> List[float]:
+        assert self.embedder is not None
+        key = self._cache_key(text)
+        embedding = embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.embedder.get_embedding(text)
+            if embedding:
+                embedding_cache.set(key, embedding)
+        return embedding
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        assert self.embedder is not None
+        return self.embedder.get_embedding_and_usage(text)
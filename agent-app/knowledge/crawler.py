@@ -0,0 +1,451 @@
+"""Concurrent website crawler that streams pages into a knowledge base.
+
+`WebCrawler` fetches the pages of a site over a shared connection pool, with a cap on concurrent requests per host,
+robots.txt support and url and content de-duplication. Re-crawls send the ETag and Last-Modified of the previous
+crawl, so unchanged pages cost a 304 instead of a download and re-embedding.
+
+`ingest_website` chunks pages as they arrive and embeds and upserts them in batches in a worker thread,
+while the crawl goes on.
+"""
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from hashlib import md5
+from typing import AsyncIterator, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from agno.document import Document
+from agno.document.chunking.fixed import FixedSizeChunking
+from agno.document.chunking.strategy import ChunkingStrategy
+from agno.utils.log import log_debug, logger
+from bs4 import BeautifulSoup, Tag
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import select
+
+from db.session import SessionLocal
+from db.tables import CrawledPage
+from knowledge.settings import knowledge_settings
+from knowledge.vector_db import KnowledgeVectorDb
+
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".css", ".js", ".xml", ".ico")
+
+
+@dataclass
+class PageState:
+    """What the previous crawl of a page returned."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    num_chunks: int = 0
+
+
+@dataclass
+class Page:
+    url: str
+    depth: int
+    content: str = ""
+    links: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # True if the server answered a conditional request with 304, `content` is then empty
+    not_modified: bool = False
+
+    @property
+    def content_hash(self) -> str:
+        return md5(self.content.encode()).hexdigest()
+
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    unchanged: int = 0
+    # Chunks of new or changed pages, and how many of them are embedded and stored so far
+    chunks: int = 0
+    stored: int = 0
+
+
+class WebCrawler:
+    """Crawls the pages of a site reachable from a start url, breadth first and concurrently."""
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        user_agent: Optional[str] = None,
+        respect_robots: bool = True,
+    ):
+        """
+        Initialize the WebCrawler.
+
+        Args:
+            max_pages (Optional[int]): Maximum number of pages to fetch.
+            max_depth (Optional[int]): Maximum number of links followed from the start url.
+            concurrency (Optional[int]): Maximum number of requests in flight, also the connection pool size.
+            per_host_concurrency (Optional[int]): Maximum number of requests in flight per host.
+            timeout (Optional[float]): Request timeout in seconds.
+            user_agent (Optional[str]): User agent sent with requests and matched against robots.txt.
+            respect_robots (bool): Skip urls disallowed by the site's robots.txt and honour its crawl delay.
+
+        Unset arguments fall back to `knowledge_settings`.
+        """
+        self.max_pages: int = max_pages or knowledge_settings.knowledge_crawl_max_pages
+        self.max_depth: int = max_depth if max_depth is not None else knowledge_settings.knowledge_crawl_max_depth
+        self.concurrency: int = concurrency or knowledge_settings.knowledge_crawl_concurrency
+        self.per_host_concurrency: int = per_host_concurrency or knowledge_settings.knowledge_crawl_per_host_concurrency
+        self.timeout: float = timeout or knowledge_settings.knowledge_crawl_timeout
+        self.user_agent: str = user_agent or knowledge_settings.knowledge_crawl_user_agent
+        self.respect_robots: bool = respect_robots
+
+    def _get_primary_domain(self, url: str) -> str:
+        # Same scope as agno's WebsiteReader: the start url's domain and its subdomains
+        return ".".join(urlparse(url).netloc.split(".")[-2:])
+
+    async def crawl(self, start_url: str, known: Optional[Dict[str, PageState]] = None) -> AsyncIterator[Page]:
+        """
+        Crawl the site of `start_url`, yielding pages as they are fetched.
+
+        Args:
+            start_url (str): The url to start from.
+            known (Optional[Dict[str, PageState]]): Pages from a previous crawl, by url, for conditional requests.
+
+        Yields:
+            Page: Fetched pages, in completion order. Pages that failed to load are skipped.
+        """
+        known = known or {}
+        primary_domain = self._get_primary_domain(start_url)
+        frontier: asyncio.Queue[Tuple[str, int]] = asyncio.Queue()
+        # Bounded, so fetching pauses while the consumer falls behind
+        results: asyncio.Queue[Optional[Page]] = asyncio.Queue(maxsize=self.concurrency * 2)
+        scheduled: Set[str] = set()
+        content_hashes: Set[str] = set()
+        host_semaphores: DefaultDict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.per_host_concurrency)
+        )
+        robots: Dict[str, asyncio.Task] = {}
+
+        def schedule(url: str, depth: int) -> None:
+            url = urldefrag(url).url
+            parsed = urlparse(url)
+            if (
+                url in scheduled
+                or len(scheduled) >= self.max_pages
+                or depth > self.max_depth
+                or parsed.scheme not in ("http", "https")
+                or not parsed.netloc.endswith(primary_domain)
+                or parsed.path.lower().endswith(SKIPPED_EXTENSIONS)
+            ):
+                return
+            scheduled.add(url)
+            frontier.put_nowait((url, depth))
+
+        async def get_robots(client: httpx.AsyncClient, url: str) -> Optional[RobotFileParser]:
+            if not self.respect_robots:
+                return None
+            parsed = urlparse(url)
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            # One robots.txt request per host, shared by every worker that needs it
+            if origin not in robots:
+                robots[origin] = asyncio.create_task(self._fetch_robots(client, origin))
+            return await robots[origin]
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    page = await self._fetch_page(
+                        client,
+                        url,
+                        depth,
+                        state=known.get(url),
+                        robots=await get_robots(client, url),
+                        host_semaphore=host_semaphores[urlparse(url).netloc],
+                    )
+                    if page is None:
+                        continue
+                    # Redirect targets count as visited too
+                    scheduled.add(page.url)
+                    if not page.not_modified:
+                        # The same content under another url, e.g. "/" and "/index.html"
+                        if page.content_hash in content_hashes:
+                            continue
+                        content_hashes.add(page.content_hash)
+                    for link in page.links:
+                        schedule(link, depth + 1)
+                    await results.put(page)
+                except Exception as e:
+                    logger.warning(f"Failed to crawl: {url}: {e}")
+                finally:
+                    frontier.task_done()
+
+        async def close_results() -> None:
+            await frontier.join()
+            await results.put(None)
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            limits=limits, timeout=self.timeout, follow_redirects=True, headers={"User-Agent": self.user_agent}
+        ) as client:
+            schedule(start_url, 0)
+            tasks = [asyncio.create_task(worker(client)) for _ in range(self.concurrency)]
+            tasks.append(asyncio.create_task(close_results()))
+            try:
+                while (page := await results.get()) is not None:
+                    yield page
+            finally:
+                for task in [*tasks, *robots.values()]:
+                    task.cancel()
+                await asyncio.gather(*tasks, *robots.values(), return_exceptions=True)
+
+    async def _fetch_robots(self, client: httpx.AsyncClient, origin: str) -> Optional[RobotFileParser]:
+        try:
+            response = await client.get(f"{origin}/robots.txt")
+        except httpx.HTTPError as e:
+            log_debug(f"Could not fetch robots.txt for {origin}: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        return parser
+
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        depth: int,
+        state: Optional[PageState],
+        robots: Optional[RobotFileParser],
+        host_semaphore: asyncio.Semaphore,
+    ) -> Optional[Page]:
+        if robots is not None and not robots.can_fetch(self.user_agent, url):
+            log_debug(f"Disallowed by robots.txt: {url}")
+            return None
+
+        headers = {}
+        if state is not None:
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+
+        async with host_semaphore:
+            log_debug(f"Crawling: {url}")
+            response = await client.get(url, headers=headers)
+            crawl_delay = robots.crawl_delay(self.user_agent) if robots is not None else None
+            if crawl_delay:
+                await asyncio.sleep(float(crawl_delay))
+
+        if response.status_code == 304 and state is not None:
+            return Page(
+                url=url,
+                depth=depth,
+                links=state.links,
+                etag=state.etag,
+                last_modified=state.last_modified,
+                not_modified=True,
+            )
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "html"):
+            return None
+
+        final_url = urldefrag(str(response.url)).url
+        # Parsing is CPU bound, keep it off the event loop so other requests keep flowing
+        content, links = await asyncio.to_thread(self._parse, response.text, final_url)
+        if not content:
+            return None
+        return Page(
+            url=final_url,
+            depth=depth,
+            content=content,
+            links=links,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    def _parse(self, html: str, url: str) -> Tuple[str, List[str]]:
+        """Return the main text of the page and the absolute urls it links to."""
+        soup = BeautifulSoup(html, "html.parser")
+        links = [urljoin(url, str(link["href"])) for link in soup.find_all("a", href=True) if isinstance(link, Tag)]
+        for element in soup(["script", "style", "nav", "header", "footer", "noscript"]):
+            element.decompose()
+
+        main = soup.find("article") or soup.find("main")
+        if main is None:
+            for class_name in ["content", "main-content", "post-content"]:
+                main = soup.find(class_=class_name)
+                if main is not None:
+                    break
+        main = main or soup.body or soup
+        return main.get_text(strip=True, separator=" "), links
+
+
+def load_page_states(namespace: str, site: str) -> Dict[str, PageState]:
+    """Return the pages of `site` crawled into `namespace` before, by url."""
+    stmt = select(CrawledPage).where(CrawledPage.namespace == namespace, CrawledPage.site == site)
+    with SessionLocal() as sess:
+        return {
+            page.url: PageState(
+                etag=page.etag,
+                last_modified=page.last_modified,
+                content_hash=page.content_hash,
+                links=page.links or [],
+                num_chunks=page.num_chunks,
+            )
+            for page in sess.scalars(stmt)
+        }
+
+
+def save_page_states(namespace: str, site: str, states: Dict[str, PageState]) -> None:
+    if not states:
+        return
+    rows = [
+        {
+            "namespace": namespace,
+            "url": url,
+            "site": site,
+            "etag": state.etag,
+            "last_modified": state.last_modified,
+            "content_hash": state.content_hash,
+            "links": state.links,
+            "num_chunks": state.num_chunks,
+        }
+        for url, state in states.items()
+    ]
+    insert_stmt = postgresql.insert(CrawledPage)
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[CrawledPage.namespace, CrawledPage.url],
+        set_={
+            column: insert_stmt.excluded[column]
+            for column in ("site", "etag", "last_modified", "content_hash", "links", "num_chunks")
+        },
+    )
+    with SessionLocal() as sess, sess.begin():
+        sess.execute(upsert_stmt, rows)
+
+
+def write_batch(
+    vector_db: KnowledgeVectorDb,
+    documents: List[Document],
+    stale_ids: List[str],
+    states: Dict[str, PageState],
+    site: str,
+    embed_concurrency: int,
+) -> None:
+    """Embed `documents` concurrently, upsert them, drop chunks pages no longer have and record the pages."""
+    if documents:
+        with ThreadPoolExecutor(max_workers=embed_concurrency) as executor:
+            list(executor.map(lambda document: document.embed(embedder=vector_db.embedder), documents))
+        vector_db.upsert(documents, batch_size=len(documents))
+    if stale_ids:
+        vector_db.delete_ids(stale_ids)
+    # Record the pages last, so pages whose chunks failed to load are fetched again on the next crawl
+    save_page_states(vector_db.namespace, site, states)
+
+
+async def ingest_website(
+    url: str,
+    vector_db: KnowledgeVectorDb,
+    crawler: Optional[WebCrawler] = None,
+    chunking_strategy: Optional[ChunkingStrategy] = None,
+    batch_size: Optional[int] = None,
+    embed_concurrency: Optional[int] = None,
+    on_progress: Optional[Callable[[CrawlStats], None]] = None,
+) -> CrawlStats:
+    """
+    Crawl the site of `url` into `vector_db`, writing batches of chunks while the crawl goes on.
+
+    Pages are stored as documents named `url` with their page url in `meta_data["url"]`, like agno's WebsiteReader,
+    so the whole site can be deleted from the knowledge base at once.
+
+    Args:
+        url (str): The url to start the crawl from.
+        vector_db (KnowledgeVectorDb): Knowledge base to load the pages into, in its namespace.
+        crawler (Optional[WebCrawler]): Crawler to use, defaults to one configured from `knowledge_settings`.
+        chunking_strategy (Optional[ChunkingStrategy]): How pages are split into chunks.
+        batch_size (Optional[int]): Number of chunks embedded and upserted per write.
+        embed_concurrency (Optional[int]): Number of chunks embedded concurrently within a write.
+        on_progress (Optional[Callable[[CrawlStats], None]]): Called after every page and every write.
+
+    Returns:
+        CrawlStats: Number of pages crawled, pages unchanged since the last crawl and chunks written.
+    """
+    crawler = crawler or WebCrawler()
+    chunking_strategy = chunking_strategy or FixedSizeChunking()
+    batch_size = batch_size or knowledge_settings.knowledge_crawl_batch_size
+    embed_concurrency = embed_concurrency or knowledge_settings.knowledge_crawl_embed_concurrency
+
+    await asyncio.to_thread(vector_db.create)
+    known = await asyncio.to_thread(load_page_states, vector_db.namespace, url)
+    stats = CrawlStats()
+    documents: List[Document] = []
+    stale_ids: List[str] = []
+    states: Dict[str, PageState] = {}
+    # At most one write runs at a time, overlapping with the crawl
+    pending_write: Optional[asyncio.Task] = None
+
+    async def write(documents: List[Document], stale_ids: List[str], states: Dict[str, PageState]) -> None:
+        await asyncio.to_thread(write_batch, vector_db, documents, stale_ids, states, url, embed_concurrency)
+        stats.stored += len(documents)
+        if on_progress is not None:
+            on_progress(stats)
+
+    async def flush() -> None:
+        nonlocal documents, stale_ids, states, pending_write
+        if pending_write is not None:
+            await pending_write
+        pending_write = asyncio.create_task(write(documents, stale_ids, states))
+        documents, stale_ids, states = [], [], {}
+
+    try:
+        async for page in crawler.crawl(url, known=known):
+            stats.pages += 1
+            previous = known.get(page.url)
+            if page.not_modified or (previous is not None and previous.content_hash == page.content_hash):
+                stats.unchanged += 1
+                if previous is not None and not page.not_modified:
+                    # Same content, but the validators may have changed
+                    states[page.url] = PageState(
+                        etag=page.etag,
+                        last_modified=page.last_modified,
+                        content_hash=page.content_hash,
+                        links=page.links,
+                        num_chunks=previous.num_chunks,
+                    )
+            else:
+                chunks = chunking_strategy.chunk(
+                    Document(name=url, id=page.url, meta_data={"url": page.url}, content=page.content)
+                )
+                documents.extend(chunks)
+                stats.chunks += len(chunks)
+                if previous is not None and previous.num_chunks > len(chunks):
+                    stale_ids.extend(f"{page.url}_{n}" for n in range(len(chunks) + 1, previous.num_chunks + 1))
+                states[page.url] = PageState(
+                    etag=page.etag,
+                    last_modified=page.last_modified,
+                    content_hash=page.content_hash,
+                    links=page.links,
+                    num_chunks=len(chunks),
+                )
+
+            if len(documents) >= batch_size:
+                await flush()
+            if on_progress is not None:
+                on_progress(stats)
+
+        if documents or stale_ids or states:
+            await flush()
+    finally:
+        if pending_write is not None:
+            await pending_write
+
+    log_debug(f"Crawled {stats.pages} pages from {url}: {stats.unchanged} unchanged, {stats.chunks} chunks written")
+    return stats
@@ -0,0 +1,269 @@
+"""Background loading of uploaded documents and crawled websites into a knowledge base.
+
+`IngestionJobRunner` parses, embeds and stores uploads, and crawls websites, in a bounded pool of worker threads,
+so a large upload or a whole-site crawl neither blocks the page that submitted it nor stops when the browser
+refreshes. Job state and progress are kept in the `ingestion_jobs` table, where the UI polls them.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, List, Optional
+from uuid import uuid4
+
+from agno.document import Document
+from agno.document.reader import Reader
+from agno.utils.log import log_debug, logger
+from sqlalchemy.sql.expression import select, update
+
+from db.session import SessionLocal
+from db.tables import IngestionJob
+from knowledge.crawler import CrawlStats, ingest_website
+from knowledge.settings import knowledge_settings
+from knowledge.vector_db import KnowledgeVectorDb
+
+# Jobs that are still waiting or loading
+ACTIVE_STATUSES = ("queued", "running")
+# Seconds between progress updates of a crawl, which reports every page
+CRAWL_PROGRESS_INTERVAL = 1.0
+STALE_JOB_ERROR = "Interrupted, the job stopped making progress"
+
+
+def reader_for(file_name: str) -> Optional[Reader]:
+    """The reader for an uploaded file, by extension, or None if the file type is not supported.
+
+    Readers are imported on first use, with their parsing libraries, so pages load without them.
+    """
+    file_type = file_name.split(".")[-1].lower()
+    if file_type == "pdf":
+        from agno.document.reader.pdf_reader import PDFReader
+
+        return PDFReader()
+    elif file_type == "csv":
+        from agno.document.reader.csv_reader import CSVReader
+
+        return CSVReader()
+    elif file_type == "txt":
+        from agno.document.reader.text_reader import TextReader
+
+        return TextReader()
+    elif file_type == "docx":
+        from agno.document.reader.docx_reader import DocxReader
+
+        return DocxReader()
+    return None
+
+
+def update_job(job_id: str, **values: Any) -> None:
+    with SessionLocal() as sess, sess.begin():
+        sess.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(**values))
+
+
+def _stale_before() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=knowledge_settings.knowledge_ingest_stale_after)
+
+
+def get_jobs(table_name: str, namespace: str, limit: int = 5) -> List[IngestionJob]:
+    """The most recent jobs loading into `table_name` for `namespace`, newest first.
+
+    Active jobs without progress for `knowledge_ingest_stale_after` seconds are returned as failed.
+    """
+    stmt = (
+        select(IngestionJob)
+        .where(IngestionJob.table_name == table_name, IngestionJob.namespace == namespace)
+        .order_by(IngestionJob.created_at.desc())
+        .limit(limit)
+    )
+    with SessionLocal() as sess:
+        jobs = list(sess.execute(stmt).scalars())
+    stale_before = _stale_before()
+    for job in jobs:
+        # Left behind by a process that restarted or a worker that died, it will never finish
+        if job.status in ACTIVE_STATUSES and job.updated_at < stale_before:
+            job.status = "failed"
+            job.error = STALE_JOB_ERROR
+    return jobs
+
+
+def fail_stale_jobs() -> None:
+    """Mark active jobs without progress for `knowledge_ingest_stale_after` seconds as failed."""
+    stmt = (
+        update(IngestionJob)
+        .where(IngestionJob.status.in_(ACTIVE_STATUSES), IngestionJob.updated_at < _stale_before())
+        .values(status="failed", error=STALE_JOB_ERROR)
+    )
+    with SessionLocal() as sess, sess.begin():
+        sess.execute(stmt)
+
+
+class IngestionJobRunner:
+    """Loads uploaded documents and crawled websites into knowledge bases in a bounded pool of worker threads."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        embed_concurrency: Optional[int] = None,
+    ):
+        self.max_workers: int = max_workers or knowledge_settings.knowledge_ingest_workers
+        self.batch_size: int = batch_size or knowledge_settings.knowledge_ingest_batch_size
+        self.embed_concurrency: int = embed_concurrency or knowledge_settings.knowledge_ingest_embed_concurrency
+        self._pending = BoundedSemaphore(max_pending or knowledge_settings.knowledge_ingest_max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Jobs of an earlier run of the process are still queued or running in the table
+                try:
+                    fail_stale_jobs()
+                except Exception as e:
+                    logger.warning(f"Could not mark stale ingestion jobs as failed: {e}")
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest")
+            return self._executor
+
+    def submit(self, vector_db: KnowledgeVectorDb, file_name: str, content: bytes) -> str:
+        """
+        Queue an uploaded file to be loaded into `vector_db`, in its namespace.
+
+        Args:
+            vector_db (KnowledgeVectorDb): Knowledge base to load the document into.
+            file_name (str): Name of the uploaded file, its extension selects the reader.
+            content (bytes): Content of the uploaded file.
+
+        Returns:
+            str: The id of the job.
+
+        Raises:
+            ValueError: If the file type is not supported.
+            RuntimeError: If too many uploads are already waiting or loading.
+        """
+        reader = reader_for(file_name)
+        if reader is None:
+            raise ValueError(f"Unsupported file type: {file_name}")
+        return self._queue(vector_db, "file", file_name, self._run, reader, file_name, content)
+
+    def submit_crawl(self, vector_db: KnowledgeVectorDb, url: str) -> str:
+        """
+        Queue a crawl of the site of `url` into `vector_db`, in its namespace.
+
+        Args:
+            vector_db (KnowledgeVectorDb): Knowledge base to load the pages into.
+            url (str): The url to start the crawl from.
+
+        Returns:
+            str: The id of the job.
+
+        Raises:
+            RuntimeError: If too many uploads and crawls are already waiting or loading.
+        """
+        return self._queue(vector_db, "crawl", url, self._run_crawl, url)
+
+    def _queue(self, vector_db: KnowledgeVectorDb, kind: str, name: str, run: Callable[..., None], *args: Any) -> str:
+        if not self._pending.acquire(blocking=False):
+            raise RuntimeError("Too many documents are loading, try again when one has finished")
+
+        job_id = str(uuid4())
+        try:
+            with SessionLocal() as sess, sess.begin():
+                sess.add(
+                    IngestionJob(
+                        id=job_id,
+                        table_name=vector_db.table_name,
+                        namespace=vector_db.namespace,
+                        kind=kind,
+                        file_name=name,
+                        status="queued",
+                        pages_crawled=0,
+                        chunks_parsed=0,
+                        chunks_embedded=0,
+                        chunks_stored=0,
+                    )
+                )
+            self.executor.submit(run, job_id, vector_db, *args)
+        except Exception:
+            self._pending.release()
+            raise
+        log_debug(f"Queued {kind} ingestion job {job_id} for {name}")
+        return job_id
+
+    def _run(self, job_id: str, vector_db: KnowledgeVectorDb, reader: Reader, file_name: str, content: bytes) -> None:
+        try:
+            update_job(job_id, status="running")
+            file = BytesIO(content)
+            file.name = file_name
+            documents: List[Document] = reader.read(file)
+            if not documents:
+                raise ValueError("Could not read document")
+            update_job(job_id, chunks_parsed=len(documents))
+
+            vector_db.create()
+            embedded = stored = 0
+            with ThreadPoolExecutor(max_workers=self.embed_concurrency) as embed_executor:
+                for start in range(0, len(documents), self.batch_size):
+                    batch = documents[start : start + self.batch_size]
+                    list(embed_executor.map(lambda document: document.embed(embedder=vector_db.embedder), batch))
+                    embedded += len(batch)
+                    update_job(job_id, chunks_embedded=embedded)
+                    vector_db.upsert(batch, batch_size=len(batch))
+                    stored += len(batch)
+                    update_job(job_id, chunks_stored=stored)
+            update_job(job_id, status="done")
+            log_debug(f"Ingestion job {job_id} stored {stored} chunks of {file_name}")
+        except Exception as e:
+            self._fail(job_id, file_name, e)
+        finally:
+            self._pending.release()
+
+    def _run_crawl(self, job_id: str, vector_db: KnowledgeVectorDb, url: str) -> None:
+        last_update = 0.0
+
+        def record_progress(stats: CrawlStats) -> None:
+            nonlocal last_update
+            if time.monotonic() - last_update < CRAWL_PROGRESS_INTERVAL:
+                return
+            last_update = time.monotonic()
+            update_job(
+                job_id,
+                pages_crawled=stats.pages,
+                chunks_parsed=stats.chunks,
+                chunks_embedded=stats.stored,
+                chunks_stored=stats.stored,
+            )
+
+        try:
+            update_job(job_id, status="running")
+            # Pages unchanged since the last crawl of the site are skipped
+            stats = asyncio.run(ingest_website(url, vector_db, on_progress=record_progress))
+            if not stats.pages:
+                raise ValueError("Could not read website")
+            update_job(
+                job_id,
+                status="done",
+                pages_crawled=stats.pages,
+                chunks_parsed=stats.chunks,
+                chunks_embedded=stats.stored,
+                chunks_stored=stats.stored,
+            )
+            log_debug(f"Ingestion job {job_id} crawled {stats.pages} pages of {url} ({stats.unchanged} unchanged)")
+        except Exception as e:
+            self._fail(job_id, url, e)
+        finally:
+            self._pending.release()
+
+    def _fail(self, job_id: str, name: str, error: Exception) -> None:
+        logger.error(f"Ingestion job {job_id} for {name} failed: {error}")
+        try:
+            update_job(job_id, status="failed", error=str(error))
+        except Exception as update_error:
+            logger.error(f"Could not record the failure of ingestion job {job_id}: {update_error}")
+
+
+# Shared by every page in the process, so jobs outlive the browser session that submitted them
+ingestion_jobs = IngestionJobRunner()
@@ -0,0 +1,64 @@
+from pydantic_settings import BaseSettings
+
+
+class KnowledgeSettings(BaseSettings):
+    """Knowledge base settings that can be set using environment variables.
+
+    Reference: https://docs.pydantic.dev/latest/usage/pydantic_settings/
+    """
+
+    # Language used to build the stored tsvector column and the tsquery
+    knowledge_content_language: str = "english"
+    # Normalization flags passed to ts_rank_cd. 32 scales the rank into [0, 1)
+    # so it can be fused with the vector similarity score.
+    # See: https://www.postgresql.org/docs/current/textsearch-controls.html#TEXTSEARCH-RANKING
+    knowledge_rank_normalization: int = 32
+    # How vector and keyword candidates are fused in hybrid search: "weighted" or "rrf"
+    knowledge_fusion: str = "weighted"
+    # Weight of the vector similarity score in weighted fusion, keyword rank gets 1 - weight
+    knowledge_vector_score_weight: float = 0.5
+    # Smoothing constant for reciprocal rank fusion
+    knowledge_rrf_k: int = 60
+    # Number of candidates fetched from each index per requested result
+    knowledge_candidate_multiplier: int = 4
+    # Precision of the vectors in the ANN index: "full" (vector), "half" (halfvec) or "binary" (bit).
+    # Reduced precision indexes are re-ranked with the full precision embedding kept in the table.
+    knowledge_vector_storage: str = "full"
+    # Number of reduced precision candidates re-ranked per requested candidate
+    knowledge_rerank_multiplier: int = 4
+    # Number of search results kept in the process-wide search cache, 0 disables it
+    knowledge_search_cache_size: int = 1024
+    # Seconds a cached search result is served for
+    knowledge_search_cache_ttl: int = 300
+    # Seconds the knowledge version of a table is reused before it is read again from Postgres, bounds how long
+    # a process serves cached searches after another process writes to the table
+    knowledge_version_ttl: float = 2.0
+    # Number of query embeddings kept in the process-wide embedding cache, 0 disables it
+    knowledge_embedding_cache_size: int = 4096
+    # Number of hash partitions on the namespace column for new knowledge tables, 0 keeps a single table.
+    # Existing tables are not repartitioned.
+    knowledge_partitions: int = 0
+    # Website crawler used by "Add URL to Knowledge Base"
+    knowledge_crawl_max_pages: int = 500
+    knowledge_crawl_max_depth: int = 3
+    # Concurrent requests in total and per host, the total is also the size of the connection pool
+    knowledge_crawl_concurrency: int = 16
+    knowledge_crawl_per_host_concurrency: int = 4
+    knowledge_crawl_timeout: float = 15.0
+    knowledge_crawl_user_agent: str = "agent-app-crawler"
+    # Chunks embedded and upserted per write, and chunks embedded concurrently within a write
+    knowledge_crawl_batch_size: int = 64
+    knowledge_crawl_embed_concurrency: int = 8
+    # Documents uploaded in the UI are loaded by this many background workers per process
+    knowledge_ingest_workers: int = 2
+    # Uploads waiting or loading at once per process, further uploads are refused until one finishes
+    knowledge_ingest_max_pending: int = 16
+    # Chunks embedded and stored per progress update, and chunks embedded concurrently within a batch
+    knowledge_ingest_batch_size: int = 32
+    knowledge_ingest_embed_concurrency: int = 4
+    # Seconds without progress after which a queued or running job counts as failed, e.g. after a restart
+    knowledge_ingest_stale_after: int = 600
+
+
+# Create KnowledgeSettings object
+knowledge_settings = KnowledgeSettings()
@@ -0,0 +1,751 @@
+"""PgVector extension with namespaces, index-backed keyword search, hybrid fusion and reduced precision indexes."""
+
+import json
+from dataclasses import replace
+from hashlib import md5
+from typing import Any, Dict, List, Optional
+
+from agno.document import Document
+from agno.utils.log import log_debug, logger
+from agno.vectordb.distance import Distance
+from agno.vectordb.pgvector import HNSW, Ivfflat, PgVector
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import Column, Computed, Index, Table
+from sqlalchemy.sql.expression import ColumnElement, Select, bindparam, cast, delete, func, literal, select, text
+from sqlalchemy.types import String
+
+from knowledge.cache import (
+    CachedEmbedder,
+    bump_knowledge_version,
+    knowledge_version,
+    normalize_query,
+    search_cache,
+)
+from knowledge.settings import knowledge_settings
+from utils.tracing import span
+
+FUSION_METHODS = ("weighted", "rrf")
+VECTOR_STORAGE_TYPES = ("full", "half", "binary")
+# Namespace of rows written without one, e.g. rows loaded before namespaces were added
+DEFAULT_NAMESPACE = ""
+
+
+class KnowledgeVectorDb(PgVector):
+    """PgVector table with namespaces, index-backed keyword search and configurable hybrid score fusion.
+
+    Every row belongs to a namespace, e.g. a user id, stored in an indexed `namespace` column. An instance only
+    reads, counts and deletes the rows of its own namespace, and the namespace is part of every search query so
+    Postgres only scans that namespace. Document ids are prefixed with the namespace, so the same content loaded
+    into two namespaces is stored twice instead of being moved between them. With `partitions` set, new tables are
+    hash partitioned on the namespace.
+
+    The table gets a `content_tsv` column generated from `content` and stored on write, with a GIN index on it.
+    Hybrid search fetches the top candidates from the vector index and from the GIN index separately and
+    fuses them, instead of scoring every row in the table on both signals.
+
+    With `vector_storage="half"` or `"binary"` the HNSW index is built over a halfvec cast or a binary quantization
+    of the embedding, which makes it 2x or 32x smaller. The full precision embedding stays in the table and is used
+    to re-rank the shortlist the index returns.
+
+    Searches and query embeddings are served from process-wide caches, see `knowledge.cache`. Writes and deletes
+    through this class invalidate the cached searches on the table, in every process.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        fusion: Optional[str] = None,
+        vector_score_weight: Optional[float] = None,
+        rrf_k: Optional[int] = None,
+        rank_normalization: Optional[int] = None,
+        candidate_multiplier: Optional[int] = None,
+        content_language: Optional[str] = None,
+        vector_storage: Optional[str] = None,
+        rerank_multiplier: Optional[int] = None,
+        cache_searches: bool = True,
+        namespace: Optional[str] = None,
+        partitions: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the KnowledgeVectorDb instance.
+
+        Args:
+            table_name (str): Name of the table to store vector data.
+            fusion (Optional[str]): How to fuse vector and keyword candidates, "weighted" or "rrf".
+            vector_score_weight (Optional[float]): Weight of the vector score, keyword rank gets 1 - weight.
+            rrf_k (Optional[int]): Smoothing constant for reciprocal rank fusion.
+            rank_normalization (Optional[int]): Normalization flags passed to ts_rank_cd.
+            candidate_multiplier (Optional[int]): Candidates fetched from each index per requested result.
+            content_language (Optional[str]): Language for the stored tsvector column and the tsquery.
+            vector_storage (Optional[str]): Precision of the vectors in the ANN index, "full", "half" or "binary".
+            rerank_multiplier (Optional[int]): Reduced precision candidates re-ranked per requested candidate.
+            cache_searches (bool): Serve repeated searches and query embeddings from the process-wide caches.
+            namespace (Optional[str]): Namespace this instance reads and writes, such as a user id.
+            partitions (Optional[int]): Number of hash partitions on the namespace for new tables, 0 to disable.
+            **kwargs: Passed through to PgVector.
+
+        Unset arguments fall back to `knowledge_settings`.
+        """
+        self.fusion: str = fusion or knowledge_settings.knowledge_fusion
+        if self.fusion not in FUSION_METHODS:
+            raise ValueError(f"fusion must be one of {FUSION_METHODS}, got '{self.fusion}'")
+        self.rrf_k: int = rrf_k if rrf_k is not None else knowledge_settings.knowledge_rrf_k
+        self.rank_normalization: int = (
+            rank_normalization if rank_normalization is not None else knowledge_settings.knowledge_rank_normalization
+        )
+        self.candidate_multiplier: int = max(
+            candidate_multiplier or knowledge_settings.knowledge_candidate_multiplier, 1
+        )
+
+        self.vector_storage: str = vector_storage or knowledge_settings.knowledge_vector_storage
+        if self.vector_storage not in VECTOR_STORAGE_TYPES:
+            raise ValueError(f"vector_storage must be one of {VECTOR_STORAGE_TYPES}, got '{self.vector_storage}'")
+        self.rerank_multiplier: int = max(rerank_multiplier or knowledge_settings.knowledge_rerank_multiplier, 1)
+        self.cache_searches: bool = cache_searches
+        self.namespace: str = namespace or DEFAULT_NAMESPACE
+        self.partitions: int = partitions if partitions is not None else knowledge_settings.knowledge_partitions
+        if self.partitions < 0:
+            raise ValueError("partitions must not be negative")
+
+        _vector_score_weight = (
+            vector_score_weight if vector_score_weight is not None else knowledge_settings.knowledge_vector_score_weight
+        )
+        if not 0 <= _vector_score_weight <= 1:
+            raise ValueError("vector_score_weight must be between 0 and 1")
+
+        super().__init__(
+            table_name=table_name,
+            vector_score_weight=_vector_score_weight,
+            content_language=content_language or knowledge_settings.knowledge_content_language,
+            **kwargs,
+        )
+
+        if self.quantized:
+            if not isinstance(self.vector_index, HNSW):
+                raise ValueError("Reduced precision vector storage requires an HNSW index")
+            # PgVector mutates the index config to set its name, so work on a copy of the shared default
+            self.vector_index = self.vector_index.model_copy()
+            if self.vector_index.name is None:
+                self.vector_index.name = f"{self.table_name}_hnsw_{self.vector_storage}_index"
+
+        if self.cache_searches and not isinstance(self.embedder, CachedEmbedder):
+            self.embedder = CachedEmbedder(embedder=self.embedder)
+
+    @property
+    def quantized(self) -> bool:
+        return self.vector_storage != "full"
+
+    @property
+    def tsv_index_name(self) -> str:
+        return f"idx_{self.table_name}_content_tsv"
+
+    def get_table_v1(self) -> Table:
+        """Add the namespace column, the stored tsvector column and their indexes to the PgVector table."""
+        table = super().get_table_v1()
+        # Rows written by PgVector.insert pick up the namespace of this instance from the column default.
+        # A partitioned table needs the partition key in its primary key.
+        table.append_column(
+            Column(
+                "namespace",
+                String,
+                nullable=False,
+                default=self.namespace,
+                server_default=text(f"'{DEFAULT_NAMESPACE}'"),
+                primary_key=self.partitions > 0,
+            ),
+            replace_existing=True,
+        )
+        Index(f"idx_{self.table_name}_namespace_name", table.c.namespace, table.c.name)
+        if self.partitions > 0:
+            table.dialect_options["postgresql"]["partition_by"] = "HASH (namespace)"
+        table.append_column(
+            Column(
+                "content_tsv",
+                postgresql.TSVECTOR,
+                Computed(f"to_tsvector('{self.content_language}'::regconfig, coalesce(content, ''))", persisted=True),
+            ),
+            replace_existing=True,
+        )
+        Index(self.tsv_index_name, table.c.content_tsv, postgresql_using="gin")
+        return table
+
+    def create(self) -> None:
+        """Create the table if it does not exist, along with its hash partitions."""
+        table_exists = self.table_exists()
+        super().create()
+        if table_exists or self.partitions == 0:
+            return
+        with self.Session() as sess, sess.begin():
+            for remainder in range(self.partitions):
+                log_debug(f"Creating partition {remainder} of table: {self.table_name}")
+                sess.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS {self.schema}."{self.table_name}_p{remainder}" '
+                        f"PARTITION OF {self.table.fullname} "
+                        f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {remainder});"
+                    )
+                )
+
+    def _create_hnsw_index(self, sess: Session, table_fullname: str, index_distance: str) -> None:
+        """
+        Create an HNSW index on the embedding, or on its halfvec cast or binary quantization.
+
+        Args:
+            sess (Session): SQLAlchemy session.
+            table_fullname (str): Fully qualified table name.
+            index_distance (str): Operator class for full precision vectors.
+        """
+        if not self.quantized:
+            return super()._create_hnsw_index(sess, table_fullname, index_distance)
+
+        vector_index = self.vector_index
+        if not isinstance(vector_index, HNSW):
+            raise ValueError("Reduced precision vector storage requires an HNSW index")
+        if self.vector_storage == "half":
+            index_column = f"(embedding::halfvec({self.dimensions})) {index_distance.replace('vector_', 'halfvec_')}"
+        else:
+            index_column = f"(binary_quantize(embedding)::bit({self.dimensions})) bit_hamming_ops"
+
+        log_debug(
+            f"Creating {self.vector_storage} precision HNSW index '{vector_index.name}' on table "
+            f"'{table_fullname}' with m: {vector_index.m}, ef_construction: {vector_index.ef_construction}"
+        )
+        create_index_sql = text(
+            f'CREATE INDEX "{vector_index.name}" ON {table_fullname} '
+            f"USING hnsw ({index_column}) "
+            f"WITH (m = :m, ef_construction = :ef_construction);"
+        )
+        sess.execute(create_index_sql, {"m": vector_index.m, "ef_construction": vector_index.ef_construction})
+
+    def _create_gin_index(self, force_recreate: bool = False) -> None:
+        """
+        Create the GIN index on the stored tsvector column if it is missing.
+
+        Args:
+            force_recreate (bool): If True, existing index will be dropped and recreated.
+        """
+        if force_recreate:
+            self._drop_index(self.tsv_index_name)
+        with self.Session() as sess, sess.begin():
+            log_debug(f"Creating GIN index '{self.tsv_index_name}' on table '{self.table.fullname}'.")
+            sess.execute(
+                text(
+                    f'CREATE INDEX IF NOT EXISTS "{self.tsv_index_name}" ON {self.table.fullname} '
+                    "USING GIN (content_tsv);"
+                )
+            )
+
+    def _columns(self) -> List[ColumnElement]:
+        return [
+            self.table.c.id,
+            self.table.c.name,
+            self.table.c.meta_data,
+            self.table.c.content,
+            self.table.c.embedding,
+            self.table.c.usage,
+        ]
+
+    def _apply_filters(self, stmt: Select, filters: Optional[Dict[str, Any]]) -> Select:
+        stmt = stmt.where(self.table.c.namespace == self.namespace)
+        if filters is not None:
+            stmt = stmt.where(self.table.c.filters.contains(filters))
+        return stmt
+
+    def _ts_query(self, query: str) -> ColumnElement:
+        processed_query = self.enable_prefix_matching(query) if self.prefix_match else query
+        return func.websearch_to_tsquery(
+            cast(literal(self.content_language), postgresql.REGCONFIG), bindparam("query", value=processed_query)
+        )
+
+    def _text_rank(self, ts_query: ColumnElement) -> ColumnElement:
+        return func.ts_rank_cd(self.table.c.content_tsv, ts_query, self.rank_normalization)
+
+    def _vector_distance(
+        self, query_embedding: List[float], embedding: Optional[ColumnElement] = None
+    ) -> ColumnElement:
+        """Exact distance between `embedding` (the table column by default) and the query."""
+        embedding = self.table.c.embedding if embedding is None else embedding
+        if self.distance == Distance.l2:
+            return embedding.l2_distance(query_embedding)
+        if self.distance == Distance.max_inner_product:
+            return embedding.max_inner_product(query_embedding)
+        return embedding.cosine_distance(query_embedding)
+
+    def _index_expression(self) -> ColumnElement:
+        """The expression the vector index is built on, queries must order by the same expression to use it."""
+        if self.vector_storage == "half":
+            return cast(self.table.c.embedding, HALFVEC(self.dimensions))
+        if self.vector_storage == "binary":
+            return cast(func.binary_quantize(self.table.c.embedding), BIT(self.dimensions))
+        return self.table.c.embedding
+
+    def _index_distance(self, query_embedding: List[float]) -> ColumnElement:
+        """Distance computed on the indexed representation, used to pick the shortlist."""
+        if self.vector_storage == "binary":
+            query_vector = cast(literal(query_embedding, VECTOR(self.dimensions)), VECTOR(self.dimensions))
+            query_bits = cast(func.binary_quantize(query_vector), BIT(self.dimensions))
+            return self._index_expression().hamming_distance(query_bits)
+        return self._vector_distance(query_embedding, self._index_expression())
+
+    def _vector_candidates(
+        self, query_embedding: List[float], num_candidates: int, filters: Optional[Dict[str, Any]]
+    ) -> Select:
+        """Select the ids and exact distances of the `num_candidates` nearest rows, ordered by distance."""
+        if not self.quantized:
+            distance = self._vector_distance(query_embedding)
+            stmt = self._apply_filters(select(self.table.c.id, distance.label("distance")), filters)
+            return stmt.order_by(distance).limit(num_candidates)
+
+        # Shortlist with the reduced precision index, then re-rank with the full precision embedding
+        index_distance = self._index_distance(query_embedding)
+        shortlist = (
+            self._apply_filters(select(self.table.c.id, self.table.c.embedding), filters)
+            .order_by(index_distance)
+            .limit(num_candidates * self.rerank_multiplier)
+            .subquery("shortlist")
+        )
+        distance = self._vector_distance(query_embedding, shortlist.c.embedding)
+        return select(shortlist.c.id, distance.label("distance")).order_by(distance).limit(num_candidates)
+
+    def _index_candidates(self, num_candidates: int) -> int:
+        """Number of rows the vector index scan has to return for `num_candidates` results."""
+        return num_candidates * self.rerank_multiplier if self.quantized else num_candidates
+
+    def _vector_score(self, distance: ColumnElement) -> ColumnElement:
+        """Map a distance to a similarity score in [0, 1], larger is better."""
+        if self.distance == Distance.max_inner_product:
+            # pgvector returns the negative inner product, normalized embeddings keep it within [-1, 1]
+            return (1 - distance) / 2
+        return 1 / (1 + distance)
+
+    def _set_search_params(self, sess: Session, num_candidates: int) -> None:
+        """Make sure the vector index scan returns enough rows for `num_candidates` results."""
+        if isinstance(self.vector_index, Ivfflat):
+            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.vector_index.probes}"))
+        elif isinstance(self.vector_index, HNSW):
+            ef_search = max(self.vector_index.ef_search, self._index_candidates(num_candidates))
+            sess.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    def _to_documents(self, results) -> List[Document]:
+        return [
+            Document(
+                id=result.id,
+                name=result.name,
+                meta_data=result.meta_data,
+                content=result.content,
+                embedder=self.embedder,
+                embedding=result.embedding,
+                usage=result.usage,
+            )
+            for result in results
+        ]
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Perform a search based on the configured search type, serving repeated searches from the cache.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        with span(
+            "knowledge.search", table=self.table_name, namespace=self.namespace, search_type=self.search_type.value
+        ) as search_span:
+            if not self.cache_searches:
+                search_results = super().search(query=query, limit=limit, filters=filters)
+                search_span.set_attribute("results", len(search_results))
+                return search_results
+
+            query = normalize_query(query)
+            cache_key = (
+                self.table.fullname,
+                self.namespace,
+                knowledge_version(self.table.fullname, self.Session),
+                self.search_type.value,
+                query,
+                json.dumps(filters, sort_keys=True, default=str),
+                limit,
+            )
+            cached_results = search_cache.get(cache_key)
+            search_span.set_attribute("cache_hit", cached_results is not None)
+            if cached_results is not None:
+                log_debug(f"Search cache hit for query: {query}")
+                search_span.set_attribute("results", len(cached_results))
+                return list(cached_results)
+
+            search_results = super().search(query=query, limit=limit, filters=filters)
+            # Errors also return no results, so only cache searches that found something
+            if search_results:
+                search_cache.set(cache_key, search_results)
+            search_span.set_attribute("results", len(search_results))
+            return search_results
+
+    def _document_id(self, document: Document) -> str:
+        """The id PgVector would store for `document`, prefixed with the namespace."""
+        return self._namespaced_id(document.id or md5(self._clean_content(document.content).encode()).hexdigest())
+
+    def _namespaced_id(self, _id: str) -> str:
+        if self.namespace == DEFAULT_NAMESPACE or _id.startswith(f"{self.namespace}:"):
+            return _id
+        return f"{self.namespace}:{_id}"
+
+    def _namespaced(self, documents: List[Document]) -> List[Document]:
+        return [replace(document, id=self._document_id(document)) for document in documents]
+
+    def insert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 100
+    ) -> None:
+        try:
+            super().insert(documents=self._namespaced(documents), filters=filters, batch_size=batch_size)
+        finally:
+            bump_knowledge_version(self.table.fullname, self.Session)
+
+    def upsert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 100
+    ) -> None:
+        """
+        Upsert documents into the namespace of this instance.
+
+        PgVector conflicts on `id` alone, which a partitioned table cannot have a unique index on,
+        so conflicts are resolved on the primary key instead.
+
+        Args:
+            documents (List[Document]): List of documents to upsert.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the documents.
+            batch_size (int): Number of documents to upsert in each batch.
+        """
+        try:
+            with self.Session() as sess:
+                documents = self._namespaced(documents)
+                for i in range(0, len(documents), batch_size):
+                    batch_records = []
+                    for doc in documents[i : i + batch_size]:
+                        try:
+                            # Documents embedded ahead of time, e.g. concurrently by the crawler, are not embedded again
+                            if doc.embedding is None:
+                                doc.embed(embedder=self.embedder)
+                            cleaned_content = self._clean_content(doc.content)
+                            batch_records.append(
+                                {
+                                    "id": doc.id,
+                                    "namespace": self.namespace,
+                                    "name": doc.name,
+                                    "meta_data": doc.meta_data,
+                                    "filters": filters,
+                                    "content": cleaned_content,
+                                    "embedding": doc.embedding,
+                                    "usage": doc.usage,
+                                    "content_hash": md5(cleaned_content.encode()).hexdigest(),
+                                }
+                            )
+                        except Exception as e:
+                            logger.error(f"Error processing document '{doc.name}': {e}")
+                    if not batch_records:
+                        continue
+
+                    insert_stmt = postgresql.insert(self.table).values(batch_records)
+                    upsert_stmt = insert_stmt.on_conflict_do_update(
+                        index_elements=[column.name for column in self.table.primary_key.columns],
+                        set_={
+                            column: insert_stmt.excluded[column]
+                            for column in (
+                                "name",
+                                "meta_data",
+                                "filters",
+                                "content",
+                                "embedding",
+                                "usage",
+                                "content_hash",
+                            )
+                        },
+                    )
+                    try:
+                        sess.execute(upsert_stmt)
+                        sess.commit()
+                        log_debug(f"Upserted batch of {len(batch_records)} documents.")
+                    except Exception as e:
+                        logger.error(f"Error with batch starting at index {i}: {e}")
+                        sess.rollback()
+                        raise
+        except Exception as e:
+            logger.error(f"Error upserting documents: {e}")
+            raise
+        finally:
+            bump_knowledge_version(self.table.fullname, self.Session)
+
+    def delete(self) -> bool:
+        """
+        Delete all records in the namespace of this instance.
+
+        Returns:
+            bool: True if deletion was successful, False otherwise.
+        """
+        return self._delete_where(self.table.c.namespace == self.namespace)
+
+    def delete_document(self, name: str) -> bool:
+        """
+        Delete every chunk of the document called `name` in the namespace of this instance.
+
+        Args:
+            name (str): Name of the document, as set by the reader that loaded it.
+
+        Returns:
+            bool: True if deletion was successful, False otherwise.
+        """
+        return self._delete_where((self.table.c.namespace == self.namespace) & (self.table.c.name == name))
+
+    def delete_ids(self, ids: List[str]) -> bool:
+        """
+        Delete the chunks with the given document ids in the namespace of this instance.
+
+        Args:
+            ids (List[str]): Document ids as passed to insert or upsert, without the namespace prefix.
+
+        Returns:
+            bool: True if deletion was successful, False otherwise.
+        """
+        namespaced_ids = [self._namespaced_id(_id) for _id in ids]
+        return self._delete_where((self.table.c.namespace == self.namespace) & self.table.c.id.in_(namespaced_ids))
+
+    def _delete_where(self, condition: ColumnElement) -> bool:
+        try:
+            with self.Session() as sess, sess.begin():
+                result = sess.execute(delete(self.table).where(condition))
+                log_debug(f"Deleted {result.rowcount} records from table '{self.table.fullname}'.")
+                return True
+        except Exception as e:
+            logger.error(f"Error deleting rows from table '{self.table.fullname}': {e}")
+            return False
+        finally:
+            bump_knowledge_version(self.table.fullname, self.Session)
+
+    def document_names(self) -> List[str]:
+        """
+        List the names of the documents in the namespace of this instance.
+
+        Returns:
+            List[str]: Document names in alphabetical order.
+        """
+        stmt = (
+            select(self.table.c.name)
+            .where(self.table.c.namespace == self.namespace, self.table.c.name.is_not(None))
+            .distinct()
+            .order_by(self.table.c.name)
+        )
+        try:
+            with self.Session() as sess, sess.begin():
+                return list(sess.execute(stmt).scalars())
+        except Exception as e:
+            logger.error(f"Error listing documents in table '{self.table.fullname}': {e}")
+            return []
+
+    def get_count(self) -> int:
+        """
+        Get the number of records in the namespace of this instance.
+
+        Returns:
+            int: The number of records in the namespace.
+        """
+        stmt = select(func.count()).select_from(self.table).where(self.table.c.namespace == self.namespace)
+        try:
+            with self.Session() as sess, sess.begin():
+                return int(sess.execute(stmt).scalar() or 0)
+        except Exception as e:
+            logger.error(f"Error getting count from table '{self.table.fullname}': {e}")
+            return 0
+
+    def _record_exists(self, column, value) -> bool:
+        """Check if a record with the given column value exists in the namespace of this instance."""
+        stmt = select(1).where(column == value, self.table.c.namespace == self.namespace).limit(1)
+        try:
+            with self.Session() as sess, sess.begin():
+                return sess.execute(stmt).first() is not None
+        except Exception as e:
+            logger.error(f"Error checking if record exists: {e}")
+            return False
+
+    def drop(self) -> None:
+        try:
+            super().drop()
+        finally:
+            bump_knowledge_version(self.table.fullname, self.Session)
+
+    def vector_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Perform a vector similarity search, re-ranking reduced precision candidates with the full embedding.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        try:
+            query_embedding = self.embedder.get_embedding(query)
+            if query_embedding is None:
+                logger.error(f"Error getting embedding for Query: {query}")
+                return []
+
+            candidates = self._vector_candidates(query_embedding, limit, filters).subquery("candidates")
+            stmt = (
+                select(*self._columns())
+                .join_from(self.table, candidates, self.table.c.id == candidates.c.id)
+                .where(self.table.c.namespace == self.namespace)
+                .order_by(candidates.c.distance)
+            )
+            log_debug(f"Vector search query: {stmt}")
+
+            try:
+                with self.Session() as sess, sess.begin():
+                    self._set_search_params(sess, limit)
+                    results = sess.execute(stmt).fetchall()
+            except Exception as e:
+                logger.error(f"Error performing semantic search: {e}")
+                logger.error("Table might not exist, creating for future use")
+                self.create()
+                return []
+
+            search_results = self._to_documents(results)
+            if self.reranker:
+                search_results = self.reranker.rerank(query=query, documents=search_results)
+            return search_results
+        except Exception as e:
+            logger.error(f"Error during vector search: {e}")
+            return []
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Perform a keyword search using the GIN index on the stored tsvector column.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        try:
+            ts_query = self._ts_query(query)
+            text_rank = self._text_rank(ts_query)
+            stmt = select(*self._columns()).where(self.table.c.content_tsv.op("@@")(ts_query))
+            stmt = self._apply_filters(stmt, filters).order_by(text_rank.desc()).limit(limit)
+            log_debug(f"Keyword search query: {stmt}")
+
+            try:
+                with self.Session() as sess, sess.begin():
+                    results = sess.execute(stmt).fetchall()
+            except Exception as e:
+                logger.error(f"Error performing keyword search: {e}")
+                logger.error("Table might not exist, creating for future use")
+                self.create()
+                return []
+
+            return self._to_documents(results)
+        except Exception as e:
+            logger.error(f"Error during keyword search: {e}")
+            return []
+
+    def hybrid_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Perform a hybrid search by fusing the top vector and keyword candidates.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        try:
+            query_embedding = self.embedder.get_embedding(query)
+            if query_embedding is None:
+                logger.error(f"Error getting embedding for Query: {query}")
+                return []
+
+            stmt = self._hybrid_search_stmt(query, query_embedding, limit, filters)
+            log_debug(f"Hybrid search query: {stmt}")
+
+            try:
+                with self.Session() as sess, sess.begin():
+                    self._set_search_params(sess, limit * self.candidate_multiplier)
+                    results = sess.execute(stmt).fetchall()
+            except Exception as e:
+                logger.error(f"Error performing hybrid search: {e}")
+                return []
+
+            search_results = self._to_documents(results)
+            if self.reranker:
+                search_results = self.reranker.rerank(query=query, documents=search_results)
+            return search_results
+        except Exception as e:
+            logger.error(f"Error during hybrid search: {e}")
+            return []
+
+    def _hybrid_search_stmt(
+        self, query: str, query_embedding: List[float], limit: int, filters: Optional[Dict[str, Any]]
+    ) -> Select:
+        num_candidates = limit * self.candidate_multiplier
+
+        # Top candidates from the vector index
+        vector_candidates_sq = self._vector_candidates(query_embedding, num_candidates, filters).subquery(
+            "vector_candidates"
+        )
+        vector_ranked = select(
+            vector_candidates_sq.c.id,
+            vector_candidates_sq.c.distance,
+            func.row_number().over(order_by=vector_candidates_sq.c.distance).label("vector_rank"),
+        ).subquery("vector_ranked")
+
+        # Top candidates from the GIN index
+        ts_query = self._ts_query(query)
+        text_rank = self._text_rank(ts_query)
+        keyword_candidates = select(self.table.c.id, text_rank.label("text_rank")).where(
+            self.table.c.content_tsv.op("@@")(ts_query)
+        )
+        keyword_candidates_sq = (
+            self._apply_filters(keyword_candidates, filters)
+            .order_by(text_rank.desc())
+            .limit(num_candidates)
+            .subquery("keyword_candidates")
+        )
+        keyword_ranked = select(
+            keyword_candidates_sq.c.id,
+            keyword_candidates_sq.c.text_rank,
+            func.row_number().over(order_by=keyword_candidates_sq.c.text_rank.desc()).label("keyword_rank"),
+        ).subquery("keyword_ranked")
+
+        # Fuse the two candidate lists, a document missing from one list gets no score from it
+        text_rank_weight = 1 - self.vector_score_weight
+        if self.fusion == "rrf":
+            vector_part = self.vector_score_weight / (self.rrf_k + vector_ranked.c.vector_rank)
+            keyword_part = text_rank_weight / (self.rrf_k + keyword_ranked.c.keyword_rank)
+        else:
+            vector_part = self.vector_score_weight * self._vector_score(vector_ranked.c.distance)
+            keyword_part = text_rank_weight * keyword_ranked.c.text_rank
+        hybrid_score = func.coalesce(vector_part, 0) + func.coalesce(keyword_part, 0)
+
+        fused = (
+            select(
+                func.coalesce(vector_ranked.c.id, keyword_ranked.c.id).label("id"), hybrid_score.label("hybrid_score")
+            )
+            .select_from(vector_ranked.join(keyword_ranked, vector_ranked.c.id == keyword_ranked.c.id, full=True))
+            .subquery("fused")
+        )
+        return (
+            select(*self._columns(), fused.c.hybrid_score)
+            .join_from(self.table, fused, self.table.c.id == fused.c.id)
+            .where(self.table.c.namespace == self.namespace)
+            .order_by(fused.c.hybrid_score.desc())
+            .limit(limit)
+        )
@@ -26,6 +26,16 @@ if [[ "$WAIT_FOR_REDIS" = true || "$WAIT_FOR_REDIS" = True ]]; then
     -timeout 300s
 fi
 
+############################################################################
+# Prometheus multiprocess samples
+############################################################################
+
+if [[ -n "$PROMETHEUS_MULTIPROC_DIR" ]]; then
+  # Samples left by a previous container would be counted again
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 ############################################################################
 # Migrate database
 ############################################################################
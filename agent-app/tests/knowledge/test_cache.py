@@ -0,0 +1,111 @@
+from typing import Any, Dict, Optional
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from knowledge import cache
+from knowledge.cache import bump_knowledge_version, knowledge_version
+
+TABLE = "ai.sage_knowledge"
+
+
+class FakeKnowledgeVersions:
+    """The knowledge_versions table shared by every process, in memory, behind a fake session factory."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, int] = {}
+        self.fail = False
+
+    def __call__(self) -> "FakeKnowledgeVersions":
+        if self.fail:
+            raise ConnectionError("database down")
+        return self
+
+    def __enter__(self) -> "FakeKnowledgeVersions":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def begin(self) -> "FakeKnowledgeVersions":
+        return self
+
+    def execute(self, stmt: Any) -> "FakeKnowledgeVersions":
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        if stmt.is_insert:
+            self.bump(params["table_name"])
+            self.result: Optional[int] = self.rows[params["table_name"]]
+        else:
+            self.result = self.rows.get(params["table_name_1"])
+        return self
+
+    def bump(self, table: str) -> None:
+        """A write committed by any process."""
+        self.rows[table] = self.rows.get(table, 0) + 1
+
+    def scalar_one(self) -> Any:
+        assert self.result is not None
+        return self.result
+
+    def scalar_one_or_none(self) -> Any:
+        return self.result
+
+
+@pytest.fixture
+def versions() -> Any:
+    # Passed where a session factory is expected
+    return FakeKnowledgeVersions()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache, "monotonic", clock)
+    # A fresh process
+    monkeypatch.setattr(cache, "_versions", {})
+    monkeypatch.setattr(cache, "_local_writes", cache.defaultdict(int))
+    monkeypatch.setattr(cache.knowledge_settings, "knowledge_version_ttl", 2.0)
+    return clock
+
+
+def test_writes_from_other_processes_are_seen_once_the_version_is_read_again(clock: Clock, versions: Any) -> None:
+    before = knowledge_version(TABLE, versions)
+
+    # E.g. the UI deletes a document
+    versions.bump(TABLE)
+    clock.now += 1
+    assert knowledge_version(TABLE, versions) == before
+
+    clock.now += 1
+    assert knowledge_version(TABLE, versions) != before
+
+
+def test_own_writes_are_seen_at_once(clock: Clock, versions: Any) -> None:
+    before = knowledge_version(TABLE, versions)
+
+    bump_knowledge_version(TABLE, versions)
+
+    assert knowledge_version(TABLE, versions) != before
+    assert versions.rows[TABLE] == 1
+    assert knowledge_version("ai.scholar_knowledge", versions) == (0, 0)
+
+
+def test_own_writes_are_seen_when_the_version_cannot_be_bumped(clock: Clock, versions: Any) -> None:
+    before = knowledge_version(TABLE, versions)
+
+    versions.fail = True
+    bump_knowledge_version(TABLE, versions)
+    clock.now += 5
+    after = knowledge_version(TABLE, versions)
+
+    assert after != before
+    # The last version read is kept while Postgres is down
+    assert after[0] == before[0]
@@ -0,0 +1,218 @@
+import asyncio
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pytest
+from agno.document import Document
+from agno.document.chunking.fixed import FixedSizeChunking
+
+from knowledge import crawler
+from knowledge.crawler import Page, PageState, WebCrawler, ingest_website
+
+
+class Site:
+    """Pages served by the fixture server, by path, and the requests it received."""
+
+    def __init__(self) -> None:
+        self.robots: Optional[str] = None
+        # path -> (html, headers)
+        self.pages: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self.requests: List[Tuple[str, Dict[str, str], float]] = []
+        self.base_url = ""
+
+    def add(self, path: str, body: str, links: Tuple[str, ...] = (), headers: Optional[Dict[str, str]] = None) -> None:
+        anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+        self.pages[path] = (f"<html><body><main><p>{body}</p>{anchors}</main></body></html>", headers or {})
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def requested(self, path: str) -> List[Dict[str, str]]:
+        """Headers of every request for `path`."""
+        return [headers for requested, headers, _ in self.requests if requested == path]
+
+
+@pytest.fixture
+def site() -> Iterator[Site]:
+    site = Site()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            site.requests.append((self.path, dict(self.headers), time.monotonic()))
+            if self.path == "/robots.txt" and site.robots is not None:
+                self._send(200, site.robots, {"Content-Type": "text/plain"})
+                return
+            if self.path not in site.pages:
+                self._send(404, "", {})
+                return
+            html, headers = site.pages[self.path]
+            etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+            if (etag and self.headers.get("If-None-Match") == etag) or (
+                last_modified and self.headers.get("If-Modified-Since") == last_modified
+            ):
+                self._send(304, "", headers)
+                return
+            self._send(200, html, {"Content-Type": "text/html", **headers})
+
+        def _send(self, status: int, body: str, headers: Dict[str, str]) -> None:
+            content = body.encode()
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(content)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    site.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(site: Site, known: Optional[Dict[str, PageState]] = None, **options) -> List[Page]:
+    async def collect() -> List[Page]:
+        return [page async for page in WebCrawler(**options).crawl(site.url("/"), known=known)]
+
+    return asyncio.run(collect())
+
+
+def test_skips_urls_disallowed_by_robots_txt(site: Site) -> None:
+    site.robots = "User-agent: *\nDisallow: /private\n"
+    site.add("/", "Home", links=("/public", "/private/secret"))
+    site.add("/public", "Public page")
+    site.add("/private/secret", "Secret page")
+
+    pages = crawl(site)
+
+    assert sorted(page.url for page in pages) == [site.url("/"), site.url("/public")]
+    assert site.requested("/private/secret") == []
+    # One robots.txt request, shared by every page of the host
+    assert len(site.requested("/robots.txt")) == 1
+
+
+def test_ignores_robots_txt_when_asked(site: Site) -> None:
+    site.robots = "User-agent: *\nDisallow: /private\n"
+    site.add("/", "Home", links=("/private/secret",))
+    site.add("/private/secret", "Secret page")
+
+    pages = crawl(site, respect_robots=False)
+
+    assert site.url("/private/secret") in {page.url for page in pages}
+    assert site.requested("/robots.txt") == []
+
+
+def test_waits_the_crawl_delay_between_requests_to_a_host(site: Site) -> None:
+    site.robots = "User-agent: *\nCrawl-delay: 1\n"
+    site.add("/", "Home", links=("/a",))
+    site.add("/a", "Page a")
+
+    crawl(site, concurrency=4)
+
+    times = [at for path, _, at in site.requests if path in ("/", "/a")]
+    assert len(times) == 2
+    assert times[1] - times[0] >= 0.9
+
+
+def test_fetches_every_url_once_and_skips_duplicate_content(site: Site) -> None:
+    site.add("/", "Home", links=("/a", "/a#section", "/a", "/b", "/index.html"))
+    site.pages["/index.html"] = site.pages["/"]
+    site.add("/a", "Page a", links=("/", "/b"))
+    site.add("/b", "Page b", links=("/a#top",))
+
+    pages = crawl(site)
+
+    for path in ("/", "/a", "/b", "/index.html"):
+        assert len(site.requested(path)) == 1, path
+    urls = [page.url for page in pages]
+    assert len(urls) == len(set(urls))
+    # "/" and "/index.html" serve the same content, only the first one fetched is kept
+    assert len({site.url("/"), site.url("/index.html")} & set(urls)) == 1
+    assert {site.url("/a"), site.url("/b")} <= set(urls)
+
+
+def test_recrawl_sends_validators_and_keeps_links_of_unchanged_pages(site: Site) -> None:
+    site.add("/", "Home", links=("/a", "/b"), headers={"ETag": '"home-v1"'})
+    site.add("/a", "Page a", headers={"ETag": '"a-v1"'})
+    site.add("/b", "Page b", headers={"Last-Modified": "Mon, 19 Oct 2026 10:00:00 GMT"})
+
+    first = crawl(site)
+    known = {
+        page.url: PageState(
+            etag=page.etag, last_modified=page.last_modified, content_hash=page.content_hash, links=page.links
+        )
+        for page in first
+    }
+    site.requests.clear()
+    second = crawl(site, known=known)
+
+    assert site.requested("/")[0]["If-None-Match"] == '"home-v1"'
+    assert site.requested("/a")[0]["If-None-Match"] == '"a-v1"'
+    assert site.requested("/b")[0]["If-Modified-Since"] == "Mon, 19 Oct 2026 10:00:00 GMT"
+    # Every page answered 304, the links of the previous crawl still lead to /a and /b
+    assert {page.url for page in second} == {site.url("/"), site.url("/a"), site.url("/b")}
+    assert all(page.not_modified and page.content == "" for page in second)
+
+
+class FakeEmbedder:
+    def get_embedding_and_usage(self, text: str):
+        return [float(len(text))], None
+
+
+class FakeVectorDb:
+    """The parts of `KnowledgeVectorDb` that `ingest_website` uses, in memory."""
+
+    namespace = "test"
+
+    def __init__(self) -> None:
+        self.embedder = FakeEmbedder()
+        self.documents: Dict[str, Document] = {}
+
+    def create(self) -> None:
+        pass
+
+    def upsert(self, documents: List[Document], batch_size: int) -> None:
+        for document in documents:
+            assert document.id is not None and document.embedding is not None
+            self.documents[document.id] = document
+
+    def delete_ids(self, ids: List[str]) -> None:
+        for id in ids:
+            self.documents.pop(id, None)
+
+
+def test_recrawl_removes_chunks_a_page_no_longer_has(site: Site, monkeypatch: pytest.MonkeyPatch) -> None:
+    saved: Dict[str, PageState] = {}
+    monkeypatch.setattr(crawler, "load_page_states", lambda namespace, url: dict(saved))
+    monkeypatch.setattr(crawler, "save_page_states", lambda namespace, url, states: saved.update(states))
+    vector_db = FakeVectorDb()
+
+    def ingest() -> crawler.CrawlStats:
+        return asyncio.run(
+            ingest_website(site.url("/"), vector_db, chunking_strategy=FixedSizeChunking(chunk_size=20))  # type: ignore[arg-type]
+        )
+
+    site.add("/", "Home", links=("/long",))
+    site.add("/long", " ".join(["sentence"] * 12), headers={"ETag": '"v1"'})
+    first = ingest()
+    long_chunks = sorted(id for id in vector_db.documents if id.startswith(site.url("/long")))
+    assert first.pages == 2 and first.stored == first.chunks
+    assert len(long_chunks) > 2
+    assert saved[site.url("/long")].num_chunks == len(long_chunks)
+
+    site.add("/long", "sentence", headers={"ETag": '"v2"'})
+    second = ingest()
+
+    assert second.unchanged == 1
+    assert sorted(id for id in vector_db.documents if id.startswith(site.url("/long"))) == [f"{site.url('/long')}_1"]
+    assert saved[site.url("/long")].num_chunks == 1
+    assert saved[site.url("/long")].etag == '"v2"'
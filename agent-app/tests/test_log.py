@@ -0,0 +1,50 @@
+import json
+import logging
+from io import StringIO
+from typing import Any, Dict, List
+
+from utils.log import get_output_handler, get_queue_handler
+
+
+def log_json(log: Any) -> List[Dict[str, Any]]:
+    """Run `log` with a logger writing JSON lines through the queue, return the lines written."""
+    stream = StringIO()
+    queue_handler, listener = get_queue_handler(get_output_handler("json", stream), debug_sample_ratio=1.0)
+    _logger = logging.getLogger("tests.log")
+    _logger.addHandler(queue_handler)
+    _logger.propagate = False
+    _logger.setLevel(logging.DEBUG)
+    try:
+        log(_logger)
+    finally:
+        _logger.removeHandler(queue_handler)
+        listener.stop()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_exceptions_are_formatted_by_the_listener_into_their_own_key() -> None:
+    def log(_logger: logging.Logger) -> None:
+        try:
+            raise ValueError("bad row")
+        except ValueError:
+            _logger.exception("Could not write %d rows", 3, extra={"table": "run_usage"})
+
+    [entry] = log_json(log)
+
+    assert entry["message"] == "Could not write 3 rows"
+    assert entry["exception"].startswith("Traceback (most recent call last):")
+    assert entry["exception"].endswith("ValueError: bad row")
+    assert entry["level"] == "ERROR"
+    assert entry["table"] == "run_usage"
+
+
+def test_messages_are_resolved_when_logged() -> None:
+    def log(_logger: logging.Logger) -> None:
+        rows = [1]
+        _logger.info("Rows: %s", rows)
+        rows.append(2)
+
+    [entry] = log_json(log)
+
+    assert entry["message"] == "Rows: [1]"
+    assert "exception" not in entry
@@ -0,0 +1,38 @@
+"""Startup budget of the runtime processes, see `benchmarks.startup_budget`."""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.startup import boot
+from benchmarks.startup_budget import (
+    MAX_IMPORT_MS,
+    MAX_RSS_MB,
+    RUNTIME_MODULES,
+    forbidden_imports,
+    median_import_ms,
+)
+
+APP_DIR = Path(__file__).parents[1]
+
+
+@pytest.fixture(autouse=True)
+def in_app_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The modules are imported, and the API started, in fresh interpreters from the app directory
+    monkeypatch.chdir(APP_DIR)
+
+
+@pytest.mark.parametrize("module", RUNTIME_MODULES)
+def test_runtime_does_not_import_workspace_or_infra_tooling(module: str) -> None:
+    assert forbidden_imports(module) == []
+
+
+def test_api_import_time_is_within_budget() -> None:
+    assert median_import_ms("api.main", num_runs=3) <= MAX_IMPORT_MS
+
+
+def test_api_memory_after_boot_is_within_budget() -> None:
+    _, rss = boot()
+    if rss is None:
+        pytest.skip("Resident memory is only measured where /proc is available")
+    assert rss <= MAX_RSS_MB
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List
+
+from tools.contactout_linkedin import ContactOutLinkedInTool
+from tools.linkedin_discovery import LinkedInDiscoveryTool
+from tools.search import SearchService
+from utils import tracing
+
+
+class StubBackend:
+    """Finds the same two profiles for every query."""
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return [
+            {"title": "Ada - Recruiter - Acme", "href": "https://www.linkedin.com/in/ada"},
+            {"title": "Grace - Recruiter - Acme", "href": "https://www.linkedin.com/in/grace"},
+        ]
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return []
+
+
+class StubContactOut(ContactOutLinkedInTool):
+    def enrich_linkedin_profile_by_url(self, linkedin_url: str) -> Dict[str, Any]:
+        tracing.set_span_attributes(http_status=200)
+        return {"success": True, "basic_info": {"full_name": linkedin_url.rsplit("/", 1)[-1]}}
+
+
+def discovery() -> LinkedInDiscoveryTool:
+    search = SearchService(backend=StubBackend(), cache_size=100, cache_ttl=60, db_cache=False)
+    return LinkedInDiscoveryTool(contactout=StubContactOut(api_token="token"), search=search)
+
+
+def test_discover_enriches_the_ranked_profiles() -> None:
+    result = discovery().discover("recruiter", "Acme", max_profiles=1)
+
+    assert result["candidates_found"] == 2
+    assert result["profiles"] == [{"linkedin_url": "https://www.linkedin.com/in/ada", "name": "ada"}]
+    assert result["failed_queries"] == []
+
+
+def test_discover_traces_each_enrichment_under_the_tool_span(spans: Any) -> None:
+    with tracing.span("tool.find_linkedin_profiles"):
+        discovery().discover("recruiter", "Acme")
+
+    *child_spans, tool_span = spans.get_finished_spans()
+    enrich_spans = [span for span in child_spans if span.name == "contactout.enrich"]
+    assert tool_span.name == "tool.find_linkedin_profiles"
+    # Run in the pool's threads, still children of the tool span, each with the status of its own call
+    assert all(span.parent.span_id == tool_span.context.span_id for span in child_spans)
+    assert sorted(span.attributes["linkedin_url"] for span in enrich_spans) == [
+        "https://www.linkedin.com/in/ada",
+        "https://www.linkedin.com/in/grace",
+    ]
+    assert all(span.attributes["http_status"] == 200 for span in enrich_spans)
@@ -0,0 +1,250 @@
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import utils.cache
+from tools import search
+from tools.search import SearchService
+from utils import tracing
+
+
+class StubBackend:
+    """Search backend with canned results per query, counting its calls."""
+
+    def __init__(self, results: Optional[Dict[str, List[Dict[str, Any]]]] = None, delay: float = 0.0):
+        self.results = results or {}
+        self.delay = delay
+        self.calls: List[Tuple[str, str, int]] = []
+        self.release = Event()
+        self.release.set()
+        self._lock = Lock()
+
+    def _search(self, kind: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls.append((kind, query, max_results))
+        self.release.wait(timeout=5)
+        time.sleep(self.delay)
+        if query == "fail":
+            raise RuntimeError("backend down")
+        default = [{"title": query, "href": f"https://example.com/{query}"}]
+        return self.results.get(query, default)[:max_results]
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return self._search("text", query, max_results)
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return self._search("news", query, max_results)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(utils.cache, "monotonic", clock)
+    return clock
+
+
+def service(backend: StubBackend, **options: Any) -> SearchService:
+    return SearchService(backend=backend, **{"cache_size": 100, "cache_ttl": 60, "db_cache": False, **options})
+
+
+def test_serves_repeated_searches_from_the_cache_until_they_expire(clock: Clock) -> None:
+    backend = StubBackend()
+    searches = service(backend)
+
+    first = searches.search("battery recycling")
+    # Same search, the query is normalized
+    assert searches.search("  Battery   RECYCLING ") == first
+    assert len(backend.calls) == 1
+
+    clock.now += 59
+    searches.search("battery recycling")
+    assert len(backend.calls) == 1
+
+    clock.now += 2
+    assert searches.search("battery recycling") == first
+    assert len(backend.calls) == 2
+
+
+def test_caches_kinds_and_result_counts_separately(clock: Clock) -> None:
+    backend = StubBackend()
+    searches = service(backend)
+
+    searches.search("tariffs", max_results=5)
+    searches.search("tariffs", max_results=3)
+    searches.search("tariffs", max_results=5, kind="news")
+
+    assert backend.calls == [("text", "tariffs", 5), ("text", "tariffs", 3), ("news", "tariffs", 5)]
+    with pytest.raises(ValueError):
+        searches.search("tariffs", kind="images")
+
+
+def test_coalesces_concurrent_identical_searches_into_one_backend_call() -> None:
+    backend = StubBackend()
+    backend.release.clear()
+    searches = service(backend)
+    results: List[List[Dict[str, Any]]] = []
+
+    threads = [Thread(target=lambda: results.append(searches.search("agno agents"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every thread reach the search before the backend answers
+    time.sleep(0.2)
+    backend.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(backend.calls) == 1
+    assert len(results) == 8
+    assert all(result == results[0] for result in results)
+    assert searches._in_flight == {}
+
+
+def test_search_many_deduplicates_queries_and_merges_results_by_url() -> None:
+    backend = StubBackend(
+        {
+            "a": [
+                {"title": "Shared", "href": "https://example.com/shared"},
+                {"title": "Only a", "href": "https://example.com/a"},
+            ],
+            "b": [
+                {"title": "Shared again", "href": "https://example.com/shared/#intro"},
+                {"title": "No url"},
+                {"title": "Only b", "href": "https://example.com/b"},
+            ],
+        }
+    )
+    searches = service(backend)
+
+    results, failed = searches.search_many(["a", "b", "a", "  ", "fail"])
+
+    assert sorted(query for _, query, _ in backend.calls) == ["a", "b", "fail"]
+    assert failed == ["fail"]
+    # In query then rank order, the first result for a url is kept with every query that found it
+    assert [(result["title"], result["queries"]) for result in results] == [
+        ("Shared", ["a", "b"]),
+        ("Only a", ["a"]),
+        ("Only b", ["b"]),
+    ]
+
+
+def test_search_many_runs_queries_concurrently() -> None:
+    backend = StubBackend(delay=0.2)
+    searches = service(backend, max_workers=4)
+
+    start = time.perf_counter()
+    results, failed = searches.search_many(["a", "b", "c", "d"])
+
+    assert time.perf_counter() - start < 0.6
+    assert len(results) == 4 and failed == []
+
+
+class FakeSearchResults:
+    """The search_results table, in memory, behind a fake `SessionLocal`."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, Tuple[List[Any], datetime]] = {}
+        self.fail = False
+
+    def __call__(self) -> "FakeSearchResults":
+        if self.fail:
+            raise ConnectionError("database down")
+        return self
+
+    def __enter__(self) -> "FakeSearchResults":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def begin(self) -> "FakeSearchResults":
+        return self
+
+    def execute(self, stmt: Any) -> "FakeSearchResults":
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        self.result = None
+        if stmt.is_insert:
+            self.rows[params["key"]] = (params["results"], datetime.now(timezone.utc))
+        else:
+            row = self.rows.get(params["key_1"])
+            if row is not None and row[1] > params["created_at_1"]:
+                self.result = row[0]
+        return self
+
+    def scalar_one_or_none(self) -> Any:
+        return self.result
+
+
+@pytest.fixture
+def search_results(monkeypatch: pytest.MonkeyPatch) -> FakeSearchResults:
+    table = FakeSearchResults()
+    monkeypatch.setattr(search, "SessionLocal", table)
+    return table
+
+
+def test_db_cache_shares_results_between_processes(search_results: FakeSearchResults) -> None:
+    first_backend, second_backend = StubBackend(), StubBackend()
+
+    first = service(first_backend, db_cache=True).search("pgvector")
+    # A new service has an empty in-process cache, like another worker
+    second = service(second_backend, db_cache=True).search("pgvector")
+
+    assert second == first
+    assert len(first_backend.calls) == 1
+    assert second_backend.calls == []
+    assert len(search_results.rows) == 1
+
+
+def test_db_cache_ignores_expired_results(search_results: FakeSearchResults) -> None:
+    service(StubBackend(), db_cache=True).search("pgvector")
+    key = next(iter(search_results.rows))
+    results, _ = search_results.rows[key]
+    search_results.rows[key] = (results, datetime.now(timezone.utc) - timedelta(seconds=61))
+
+    backend = StubBackend()
+    service(backend, db_cache=True).search("pgvector")
+
+    assert len(backend.calls) == 1
+    # Written again, fresh
+    assert search_results.rows[key][1] > datetime.now(timezone.utc) - timedelta(seconds=5)
+
+
+def test_db_cache_failures_fall_back_to_the_backend(search_results: FakeSearchResults) -> None:
+    search_results.fail = True
+    backend = StubBackend()
+
+    results = service(backend, db_cache=True).search("pgvector")
+
+    assert results == [{"title": "pgvector", "href": "https://example.com/pgvector"}]
+    assert len(backend.calls) == 1
+
+
+def test_search_many_traces_each_search_under_the_current_span(spans: Any) -> None:
+    searches = service(StubBackend(), max_workers=4)
+    searches.search("a")
+    spans.clear()
+
+    with tracing.span("tool.search"):
+        searches.search_many(["a", "b", "c"])
+
+    *search_spans, tool_span = spans.get_finished_spans()
+    assert tool_span.name == "tool.search"
+    assert all(span.name == "web.search" for span in search_spans)
+    # Run in the pool's threads, still children of the tool span
+    assert all(span.parent.span_id == tool_span.context.span_id for span in search_spans)
+    assert sorted((span.attributes["query"], span.attributes["cache_hit"]) for span in search_spans) == [
+        ("a", True),
+        ("b", False),
+        ("c", False),
+    ]
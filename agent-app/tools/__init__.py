@@ -1,5 +1,7 @@
 """Custom tools for the agent app."""
 
 from tools.contactout_linkedin import ContactOutLinkedInTool
+from tools.linkedin_discovery import LinkedInDiscoveryTool
+from tools.search import SearchService, WebSearchTools, search_service
 
-__all__ = ["ContactOutLinkedInTool"] 
\ No newline at end of file
+__all__ = ["ContactOutLinkedInTool", "LinkedInDiscoveryTool", "SearchService", "WebSearchTools", "search_service"] 
\ No newline at end of file
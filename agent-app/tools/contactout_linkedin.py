@@ -7,16 +7,25 @@ from urllib.parse import urlparse
 import requests
 from agno.tools import Toolkit
 from agno.utils.log import logger
+from requests.adapters import HTTPAdapter
+
+from tools.settings import tool_settings
+from utils.tracing import set_span_attributes
+
+# Keep-alive connections to the ContactOut API, shared by every tool instance in the process
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_maxsize=tool_settings.linkedin_enrich_max_workers))
 
 
 class ContactOutLinkedInTool(Toolkit):
     """A tool for extracting LinkedIn profile information using ContactOut API."""
 
-    def __init__(self, api_token: Optional[str] = None):
+    def __init__(self, api_token: Optional[str] = None, session: Optional[requests.Session] = None):
         super().__init__(name="contactout_linkedin_tool")
         
         self.api_token = api_token or getenv("CONTACTOUT_API_TOKEN")
-        self.base_url = "https://api.contactout.com/v1"
+        self.base_url = tool_settings.contactout_base_url
+        self.session = session or http_session
         
         # Register tool functions
         self.register(self.enrich_linkedin_profile_by_url)
@@ -69,7 +78,8 @@ class ContactOutLinkedInTool(Toolkit):
             params = {"profile": linkedin_url}
             headers = self._get_headers()
             
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
+            set_span_attributes(http_status=response.status_code)
             response.raise_for_status()
             
             data = response.json()
@@ -151,7 +161,8 @@ class ContactOutLinkedInTool(Toolkit):
             params = {"email": email}
             headers = self._get_headers()
             
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
+            set_span_attributes(http_status=response.status_code)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1,163 @@
+"""LinkedIn discovery pipeline: role and company in, enriched profiles out, in one tool call."""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug
+
+from tools.contactout_linkedin import ContactOutLinkedInTool
+from tools.search import SearchService, search_service
+from tools.settings import tool_settings
+from utils.tracing import span, submit_in_context
+
+LINKEDIN_PROFILE_URL = re.compile(r"https?://(?:[a-z]{2,3}\.)?linkedin\.com/in/([A-Za-z0-9\-_%]+)", re.IGNORECASE)
+
+# Alternative titles searched along with the requested role
+ROLE_VARIANTS = {
+    "recruiter": ["recruiter", "talent acquisition", "technical recruiter", "hiring manager"],
+    "founder": ["founder", "co-founder", "ceo"],
+    "ceo": ["ceo", "chief executive officer", "founder"],
+    "cto": ["cto", "chief technology officer", "vp engineering"],
+    "hr": ["hr", "human resources", "people operations"],
+}
+# Values kept per contact field (emails, phones) and skills kept per profile
+MAX_CONTACT_VALUES = 3
+MAX_SKILLS = 10
+
+
+def query_variants(role: str, company: str) -> List[str]:
+    roles = ROLE_VARIANTS.get(role.strip().lower(), [role.strip()])
+    return [f'site:linkedin.com/in/ {variant} "{company.strip()}"' for variant in roles] + [
+        f"site:linkedin.com/in/ {role.strip()} {company.strip()}"
+    ]
+
+
+def extract_profile_urls(result: Dict[str, Any]) -> List[str]:
+    """Return the LinkedIn profile urls in a search result, normalized to https://www.linkedin.com/in/<slug>."""
+    text = " ".join(str(result.get(field) or "") for field in ("href", "url", "body"))
+    return [f"https://www.linkedin.com/in/{slug}" for slug in LINKEDIN_PROFILE_URL.findall(text)]
+
+
+def compact_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields worth summarizing from a ContactOut profile, drop empty ones."""
+    basic_info = profile.get("basic_info") or {}
+    contact_info = profile.get("contact_info") or {}
+    experience = profile.get("experience") or []
+    current_role = experience[0] if experience and isinstance(experience[0], dict) else {}
+    compact = {
+        "name": basic_info.get("full_name"),
+        "headline": basic_info.get("headline"),
+        "location": basic_info.get("location"),
+        "current_title": current_role.get("title"),
+        "current_company": current_role.get("company_name") or (profile.get("company") or {}).get("name"),
+        "emails": (contact_info.get("emails") or [])[:MAX_CONTACT_VALUES],
+        "work_emails": (contact_info.get("work_emails") or [])[:MAX_CONTACT_VALUES],
+        "personal_emails": (contact_info.get("personal_emails") or [])[:MAX_CONTACT_VALUES],
+        "phones": (contact_info.get("phones") or [])[:MAX_CONTACT_VALUES],
+        "skills": (profile.get("skills") or [])[:MAX_SKILLS],
+    }
+    return {key: value for key, value in compact.items() if value}
+
+
+class LinkedInDiscoveryTool(Toolkit):
+    """Finds and enriches LinkedIn profiles for a role at a company without a model turn per step.
+
+    Searches the query variants concurrently, extracts profile urls with a regex, validates and de-duplicates them,
+    enriches the best matches in parallel with ContactOut and returns only the compact result set.
+    """
+
+    def __init__(
+        self,
+        contactout: Optional[ContactOutLinkedInTool] = None,
+        search: Optional[SearchService] = None,
+        max_workers: Optional[int] = None,
+    ):
+        super().__init__(name="linkedin_discovery")
+
+        self.contactout = contactout or ContactOutLinkedInTool()
+        self.search = search or search_service
+        self.max_workers: int = max_workers or tool_settings.linkedin_enrich_max_workers
+
+        self.register(self.find_linkedin_profiles)
+
+    def discover(self, role: str, company: str, max_profiles: int = 5) -> Dict[str, Any]:
+        """
+        Run the discovery pipeline.
+
+        Args:
+            role (str): Role to look for, e.g. "recruiter".
+            company (str): Company the people work at.
+            max_profiles (int): Maximum number of profiles to enrich.
+
+        Returns:
+            Dict[str, Any]: The queries run, the enriched profiles and the candidates that could not be enriched.
+        """
+        queries = query_variants(role, company)
+        results, failed_queries = self.search.search_many(queries, max_results=10)
+
+        # Rank candidates by how many queries found them, then by whether the snippet mentions the company
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            for url in extract_profile_urls(result):
+                if not self.contactout._validate_linkedin_url(url):
+                    continue
+                candidate = candidates.setdefault(
+                    url.lower(), {"linkedin_url": url, "title": result.get("title"), "hits": 0, "mentions": False}
+                )
+                candidate["hits"] += len(result.get("queries", [])) or 1
+                text = f"{result.get('title', '')} {result.get('body', '')}".lower()
+                candidate["mentions"] = candidate["mentions"] or company.strip().lower() in text
+        ranked = sorted(candidates.values(), key=lambda c: (c["mentions"], c["hits"]), reverse=True)[:max_profiles]
+        log_debug(f"LinkedIn discovery found {len(candidates)} candidates for {role} at {company}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [submit_in_context(executor, self.enrich, c["linkedin_url"]) for c in ranked]
+            enriched = [future.result() for future in futures]
+
+        profiles: List[Dict[str, Any]] = []
+        not_enriched: List[Dict[str, Any]] = []
+        for candidate, profile in zip(ranked, enriched):
+            if profile.get("success"):
+                profiles.append({"linkedin_url": candidate["linkedin_url"], **compact_profile(profile)})
+            else:
+                not_enriched.append(
+                    {
+                        "linkedin_url": candidate["linkedin_url"],
+                        "title": candidate["title"],
+                        "error": profile.get("error"),
+                    }
+                )
+        return {
+            "role": role,
+            "company": company,
+            "queries": queries,
+            "failed_queries": failed_queries,
+            "candidates_found": len(candidates),
+            "profiles": profiles,
+            "not_enriched": not_enriched,
+        }
+
+    def enrich(self, linkedin_url: str) -> Dict[str, Any]:
+        """Enrich one profile with ContactOut, in its own span so its time shows apart from the searches."""
+        with span("contactout.enrich", linkedin_url=linkedin_url) as enrich_span:
+            profile = self.contactout.enrich_linkedin_profile_by_url(linkedin_url)
+            enrich_span.set_attribute("success", bool(profile.get("success")))
+            return profile
+
+    def find_linkedin_profiles(self, role: str, company: str, max_profiles: int = 5) -> str:
+        """Use this function to find people with a role at a company on LinkedIn and get their enriched profiles.
+        It runs the LinkedIn searches, extracts and validates the profile urls and enriches them with ContactOut
+        in one call, so do not repeat those steps with other tools.
+
+        Args:
+            role (str): The role to look for, e.g. "recruiter", "founder" or "engineering manager".
+            company (str): The company the people work at.
+            max_profiles (optional, default=5): The maximum number of profiles to return.
+
+        Returns:
+            The enriched profiles, plus profiles that were found but could not be enriched.
+        """
+        return json.dumps(self.discover(role, company, max_profiles))
@@ -0,0 +1,300 @@
+"""Cached, coalesced and parallel web search shared by all agents."""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import urldefrag
+
+import httpx
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, logger
+from duckduckgo_search import DDGS
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import select
+
+from db.session import SessionLocal
+from db.tables import SearchResult
+from tools.settings import tool_settings
+from utils.cache import TTLCache
+from utils.metrics import record_cache_lookup
+from utils.tracing import span, submit_in_context
+
+SEARCH_KINDS = ("text", "news")
+
+
+class SearchBackend(Protocol):
+    """Where search results come from. Results are dicts with at least a url under `href` or `url`."""
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]: ...
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]: ...
+
+
+class DuckDuckGoBackend:
+    def __init__(self, timeout: Optional[int] = None):
+        self.timeout: int = timeout or tool_settings.search_timeout
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return DDGS(timeout=self.timeout).text(keywords=query, max_results=max_results)
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return DDGS(timeout=self.timeout).news(keywords=query, max_results=max_results)
+
+
+class HttpSearchBackend:
+    """Search backend that GETs results as JSON from `{base_url}/{kind}`, see `search_backend_url`."""
+
+    def __init__(self, base_url: str, timeout: Optional[int] = None):
+        self.base_url: str = base_url.rstrip("/")
+        self.client = httpx.Client(timeout=timeout or tool_settings.search_timeout)
+
+    def _get(self, kind: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        response = self.client.get(f"{self.base_url}/{kind}", params={"q": query, "max_results": max_results})
+        response.raise_for_status()
+        return response.json()
+
+    def text(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return self._get("text", query, max_results)
+
+    def news(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        return self._get("news", query, max_results)
+
+
+def default_backend() -> SearchBackend:
+    if tool_settings.search_backend_url:
+        return HttpSearchBackend(tool_settings.search_backend_url)
+    return DuckDuckGoBackend()
+
+
+def result_url(result: Dict[str, Any]) -> Optional[str]:
+    """The url of a search result without its fragment and trailing slash, used to de-duplicate results."""
+    url = result.get("href") or result.get("url")
+    if not url:
+        return None
+    return urldefrag(url).url.rstrip("/")
+
+
+class SearchService:
+    """Serves web searches from an in-process cache, then optionally Postgres, then the backend.
+
+    Concurrent requests for the same search share one backend call. `search_many` runs queries concurrently
+    and merges their results by url.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SearchBackend] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+        db_cache: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.backend: SearchBackend = backend or default_backend()
+        self.cache_ttl: int = cache_ttl if cache_ttl is not None else tool_settings.search_cache_ttl
+        self.cache = TTLCache(
+            maxsize=cache_size if cache_size is not None else tool_settings.search_cache_size,
+            ttl=self.cache_ttl,
+            name="web_search",
+        )
+        self.db_cache: bool = db_cache if db_cache is not None else tool_settings.search_db_cache
+        self.max_workers: int = max_workers or tool_settings.search_max_workers
+        self._in_flight: Dict[Tuple[str, str, int], Future] = {}
+        self._lock = Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="search")
+            return self._executor
+
+    def search(self, query: str, max_results: int = 5, kind: str = "text") -> List[Dict[str, Any]]:
+        """
+        Search the web for `query`.
+
+        Args:
+            query (str): The query to search for.
+            max_results (int): Maximum number of results to return.
+            kind (str): "text" for web results, "news" for news articles.
+
+        Returns:
+            List[Dict[str, Any]]: Search results as returned by the backend.
+        """
+        if kind not in SEARCH_KINDS:
+            raise ValueError(f"kind must be one of {SEARCH_KINDS}, got '{kind}'")
+        key = (kind, " ".join(query.casefold().split()), max_results)
+        with span("web.search", kind=kind, query=query, max_results=max_results) as search_span:
+            results = self.cache.get(key)
+            search_span.set_attribute("cache_hit", results is not None)
+            if results is not None:
+                log_debug(f"Search cache hit for: {query}")
+                return results
+
+            # Coalesce concurrent requests for the same search into one backend call
+            with self._lock:
+                future = self._in_flight.get(key)
+                is_owner = future is None
+                if future is None:
+                    future = self._in_flight[key] = Future()
+            if not is_owner:
+                search_span.set_attribute("coalesced", True)
+                log_debug(f"Waiting for in-flight search: {query}")
+                return future.result()
+
+            try:
+                results = self._load(key, query)
+                self.cache.set(key, results)
+                future.set_result(results)
+                return results
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+
+    def search_many(
+        self, queries: List[str], max_results: int = 5, kind: str = "text"
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Run several searches concurrently and merge their results by url.
+
+        Args:
+            queries (List[str]): The queries to search for.
+            max_results (int): Maximum number of results per query.
+            kind (str): "text" for web results, "news" for news articles.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[str]]: The merged results, in query then rank order, each with the
+            `queries` that found it, and the queries that failed.
+        """
+        unique_queries = list(dict.fromkeys(query for query in queries if query.strip()))
+        futures = [submit_in_context(self.executor, self.search, query, max_results, kind) for query in unique_queries]
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        failed: List[str] = []
+        for query, future in zip(unique_queries, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.warning(f"Search failed for '{query}': {e}")
+                failed.append(query)
+                continue
+            for result in results:
+                url = result_url(result)
+                if url is None:
+                    continue
+                if url not in merged:
+                    merged[url] = {**result, "queries": []}
+                merged[url]["queries"].append(query)
+        return list(merged.values()), failed
+
+    def _load(self, key: Tuple[str, str, int], query: str) -> List[Dict[str, Any]]:
+        kind, _, max_results = key
+        db_key = sha256(json.dumps(key).encode()).hexdigest()
+        if self.db_cache:
+            results = self._read_db_cache(db_key)
+            if results is not None:
+                return results
+
+        log_debug(f"Searching {kind} for: {query}")
+        results = self.backend.news(query, max_results) if kind == "news" else self.backend.text(query, max_results)
+        if self.db_cache:
+            self._write_db_cache(db_key, query, results)
+        return results
+
+    def _read_db_cache(self, db_key: str) -> Optional[List[Dict[str, Any]]]:
+        expires_before = datetime.now(timezone.utc) - timedelta(seconds=self.cache_ttl)
+        stmt = select(SearchResult.results).where(SearchResult.key == db_key, SearchResult.created_at > expires_before)
+        try:
+            with SessionLocal() as sess:
+                results = sess.execute(stmt).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Could not read search cache: {e}")
+            return None
+        record_cache_lookup("web_search_db", results is not None)
+        return results
+
+    def _write_db_cache(self, db_key: str, query: str, results: List[Dict[str, Any]]) -> None:
+        insert_stmt = postgresql.insert(SearchResult).values(key=db_key, query=query, results=results)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[SearchResult.key],
+            set_={"results": insert_stmt.excluded.results, "created_at": datetime.now(timezone.utc)},
+        )
+        try:
+            with SessionLocal() as sess, sess.begin():
+                sess.execute(upsert_stmt)
+        except Exception as e:
+            logger.warning(f"Could not write search cache: {e}")
+
+
+# Shared by every agent in the process
+search_service = SearchService()
+
+
+class WebSearchTools(Toolkit):
+    """Web search tools backed by the shared `SearchService`.
+
+    Keeps the function names of agno's DuckDuckGoTools, so existing instructions keep working.
+    """
+
+    def __init__(self, service: Optional[SearchService] = None, news: bool = True, multi_search: bool = True):
+        super().__init__(name="duckduckgo")
+
+        self.service = service or search_service
+
+        self.register(self.duckduckgo_search)
+        if news:
+            self.register(self.duckduckgo_news)
+        if multi_search:
+            self.register(self.duckduckgo_multi_search)
+
+    def duckduckgo_search(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search DuckDuckGo for a query.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The result from DuckDuckGo.
+        """
+        try:
+            return json.dumps(self.service.search(query, max_results), indent=2)
+        except Exception as e:
+            logger.warning(f"Search failed for '{query}': {e}")
+            return json.dumps({"error": f"Search failed: {e}"})
+
+    def duckduckgo_news(self, query: str, max_results: int = 5) -> str:
+        """Use this function to get the latest news from DuckDuckGo.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The latest news from DuckDuckGo.
+        """
+        try:
+            return json.dumps(self.service.search(query, max_results, kind="news"), indent=2)
+        except Exception as e:
+            logger.warning(f"News search failed for '{query}': {e}")
+            return json.dumps({"error": f"Search failed: {e}"})
+
+    def duckduckgo_multi_search(self, queries: List[str], max_results: int = 5) -> str:
+        """Use this function to run several DuckDuckGo searches at once, e.g. variations of the same query.
+        Prefer it over calling duckduckgo_search repeatedly.
+
+        Args:
+            queries(List[str]): The queries to search for.
+            max_results (optional, default=5): The maximum number of results per query.
+
+        Returns:
+            The results of all queries, de-duplicated by url. Each result lists the queries that found it.
+        """
+        results, failed = self.service.search_many(queries, max_results)
+        return json.dumps({"results": results, "failed_queries": failed}, indent=2)
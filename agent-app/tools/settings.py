@@ -0,0 +1,32 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class ToolSettings(BaseSettings):
+    """Tool settings that can be set using environment variables.
+
+    Reference: https://docs.pydantic.dev/latest/usage/pydantic_settings/
+    """
+
+    # Number of web search results kept in the process-wide cache, 0 disables it
+    search_cache_size: int = 2048
+    # Seconds a web search result is served from the caches
+    search_cache_ttl: int = 3600
+    # Also cache web search results in Postgres, shared by every process
+    search_db_cache: bool = False
+    # Number of queries a multi-query search runs concurrently
+    search_max_workers: int = 8
+    # Seconds to wait for a search backend response
+    search_timeout: int = 10
+    # Search a JSON search API at this url instead of DuckDuckGo, e.g. the stand-in server of the load test.
+    # GET {url}/text and {url}/news, with the query in `q` and `max_results`, return a list of results.
+    search_backend_url: Optional[str] = None
+    # ContactOut API, point it at a stand-in server to run without the paid API
+    contactout_base_url: str = "https://api.contactout.com/v1"
+    # Number of LinkedIn profiles the discovery pipeline enriches concurrently
+    linkedin_enrich_max_workers: int = 5
+
+
+# Create ToolSettings object
+tool_settings = ToolSettings()
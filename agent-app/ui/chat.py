@@ -0,0 +1,250 @@
+"""Chat page engine shared by the agent pages.
+
+A page declares its agent factory, texts and sidebar widgets in a `ChatPage` and calls `run()`. The engine does
+the rest: agent (re)creation, session loading, incremental history hydration, windowed rendering and throttled
+streaming, and it times every rerun. Add `?timings=1` to the page url to see the timings in the sidebar.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+import nest_asyncio
+import streamlit as st
+from agno.agent import Agent
+from agno.tools.streamlit.components import check_password
+from agno.utils.log import logger
+
+from agents.routing import AUTO_MODEL, initial_model, model_router
+from agents.usage import track_usage
+from ui.css import CUSTOM_CSS
+from ui.streaming import StreamRenderer
+from ui.utils import (
+    about_agno,
+    add_message,
+    display_messages,
+    example_inputs,
+    hydrate_history,
+    initialize_agent_session_state,
+    mark_history_hydrated,
+    selected_model,
+    session_selector,
+    utilities_widget,
+)
+from utils.log import configure_logging
+from utils.tracing import run_span
+
+# A sidebar widget, called with the agent name and the agent
+Widget = Callable[[str, Agent], Awaitable[None]]
+
+
+@dataclass
+class ChatTimings:
+    """Where the time of a rerun went, in milliseconds."""
+
+    rerun_ms: float = 0.0
+    # Loading the session and adding new runs to the messages
+    hydrate_ms: float = 0.0
+    # Rendering the message history
+    render_ms: float = 0.0
+    # Only set on reruns that respond to a message
+    time_to_first_token_ms: Optional[float] = None
+    response_ms: Optional[float] = None
+    chunks: int = 0
+    repaints: int = 0
+    # Model that served the response, picked per message with the "auto" model
+    model: Optional[str] = None
+    # Tokens of the prompt assembled for the response, for agents with a context budget
+    prompt_tokens: Optional[int] = None
+    # Share of the prompt tokens served from the provider's prompt cache
+    cached_tokens_ratio: Optional[float] = None
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+@dataclass
+class ChatPage:
+    """A chat page for one agent."""
+
+    # Key of the page state in st.session_state, also used in export file names
+    agent_name: str
+    title: str
+    subtitle: str
+    # Called with user_id, model_id and optionally session_id
+    get_agent: Callable[..., Agent]
+    page_icon: str = ":robot_face:"
+    page_title: Optional[str] = None
+    input_placeholder: str = "✨ How can I help, bestie?"
+    spinner_text: str = ":thinking_face: Thinking..."
+    # Widgets shown in the sidebar above the session selector, e.g. `knowledge_widget`
+    widgets: List[Widget] = field(default_factory=list)
+
+    def run(self) -> None:
+        """Configure the page and render it, call once from the page script."""
+        configure_logging()
+        nest_asyncio.apply()
+        st.set_page_config(page_title=self.page_title or self.title, page_icon=self.page_icon, layout="wide")
+        st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+        if check_password():
+            asyncio.run(self.main())
+
+    async def main(self) -> None:
+        start = time.perf_counter()
+        timings = ChatTimings()
+        await initialize_agent_session_state(self.agent_name)
+        await self.header()
+        await self.body(timings)
+        await about_agno()
+        timings.rerun_ms = _elapsed_ms(start)
+        self.record(timings)
+
+    async def header(self) -> None:
+        st.markdown(f"<h1 class='heading'>{self.title}</h1>", unsafe_allow_html=True)
+        st.markdown(f"<p class='subheading'>{self.subtitle}</p>", unsafe_allow_html=True)
+
+    def get_or_create_agent(self, user_id: str, model_id: str) -> Agent:
+        """The agent of this browser session, created again when the model changes."""
+        state = st.session_state[self.agent_name]
+        if state["agent"] is None or st.session_state.get("selected_model") != model_id:
+            logger.info(f"---*--- Creating {self.title} Agent ---*---")
+            # With the "auto" model every message is routed to a model later
+            state["agent"] = self.get_agent(user_id=user_id, model_id=initial_model(model_id))
+            st.session_state["selected_model"] = model_id
+        return state["agent"]
+
+    async def body(self, timings: ChatTimings) -> None:
+        ####################################################################
+        # Initialize User and Session State
+        ####################################################################
+        user_id = st.sidebar.text_input(":technologist: Username", value="Ava")
+
+        ####################################################################
+        # Model selector
+        ####################################################################
+        model_id = await selected_model()
+
+        ####################################################################
+        # Initialize Agent
+        ####################################################################
+        agent = self.get_or_create_agent(user_id, model_id)
+
+        ####################################################################
+        # Load Agent Session from the database
+        ####################################################################
+        start = time.perf_counter()
+        try:
+            st.session_state[self.agent_name]["session_id"] = agent.load_session()
+        except Exception:
+            st.warning(f"Could not create {self.title} session, is the database running?")
+            return
+
+        ####################################################################
+        # Add agent runs (i.e. chat history) not yet in messages
+        ####################################################################
+        await hydrate_history(self.agent_name, agent)
+        timings.hydrate_ms = _elapsed_ms(start)
+
+        ####################################################################
+        # Get user input
+        ####################################################################
+        if prompt := st.chat_input(self.input_placeholder):
+            await add_message(self.agent_name, "user", prompt)
+
+        ####################################################################
+        # Show example inputs
+        ####################################################################
+        await example_inputs(self.agent_name)
+
+        ####################################################################
+        # Display agent messages
+        ####################################################################
+        start = time.perf_counter()
+        await display_messages(self.agent_name)
+        timings.render_ms = _elapsed_ms(start)
+
+        ####################################################################
+        # Generate response for user message
+        ####################################################################
+        messages = st.session_state[self.agent_name]["messages"]
+        last_message = messages[-1] if messages else None
+        if last_message and last_message.get("role") == "user":
+            await self.respond(agent, last_message["content"], timings)
+
+        ####################################################################
+        # Sidebar widgets
+        ####################################################################
+        for widget in self.widgets:
+            await widget(self.agent_name, agent)
+
+        ####################################################################
+        # Session selector
+        ####################################################################
+        await session_selector(self.agent_name, agent, self.get_agent, user_id, initial_model(model_id))
+
+        ####################################################################
+        # About section
+        ####################################################################
+        await utilities_widget(self.agent_name, agent)
+
+    async def respond(self, agent: Agent, user_message: str, timings: ChatTimings) -> None:
+        """Stream the agent's response to `user_message` and add it to the messages."""
+        logger.info(f"Responding to message: {user_message}")
+        with st.chat_message("assistant"):
+            # Create container for tool calls
+            tool_calls_container = st.empty()
+            resp_container = st.empty()
+            with st.spinner(self.spinner_text):
+                # Coalesces chunks into a few repaints
+                renderer = StreamRenderer(resp_container, tool_calls_container)
+                start = time.perf_counter()
+                try:
+                    with (
+                        track_usage(agent.agent_id or self.agent_name, agent, source="ui"),
+                        run_span(self.agent_name, agent, source="ui", stream=True),
+                    ):
+                        # Run the agent and stream the response
+                        if st.session_state.get("selected_model") == AUTO_MODEL:
+                            decision = model_router.route(user_message, agent.agent_id)
+                            run_response = model_router.astream(agent, user_message, decision)
+                        else:
+                            run_response = await agent.arun(user_message, stream=True)
+                        async for resp_chunk in run_response:
+                            # Display tool calls when one starts or finishes
+                            renderer.tools(resp_chunk.tools)
+                            # Display response
+                            if resp_chunk.content and timings.time_to_first_token_ms is None:
+                                timings.time_to_first_token_ms = _elapsed_ms(start)
+                            renderer.add(resp_chunk.content)
+                    renderer.flush()
+
+                    # Add the response to the messages
+                    tools = agent.run_response.tools if agent.run_response is not None else None
+                    await add_message(self.agent_name, "assistant", renderer.response, tools)
+                except Exception as e:
+                    logger.error(f"Error during agent run: {str(e)}", exc_info=True)
+                    renderer.flush()
+                    error_message = f"Sorry, I encountered an error: {str(e)}"
+                    await add_message(self.agent_name, "assistant", error_message)
+                    st.error(error_message)
+                # The new run is already in messages
+                mark_history_hydrated(self.agent_name, agent)
+                timings.response_ms = _elapsed_ms(start)
+                timings.model = agent.model.id if agent.model is not None else None
+                timings.chunks = renderer.chunks
+                timings.repaints = renderer.repaints
+                timings.prompt_tokens = getattr(agent, "prompt_tokens", None)
+                timings.cached_tokens_ratio = getattr(agent, "cached_tokens_ratio", None)
+
+    def record(self, timings: ChatTimings) -> None:
+        """Log the timings of this rerun and keep them for the sidebar."""
+        if timings.response_ms is not None:
+            logger.info(f"{self.agent_name} response timings: {asdict(timings)}")
+        else:
+            logger.debug(f"{self.agent_name} rerun timings: {asdict(timings)}")
+        st.session_state[self.agent_name]["timings"] = asdict(timings)
+        if st.query_params.get("timings"):
+            with st.sidebar.expander("⏱️ Timings", expanded=True):
+                st.json(st.session_state[self.agent_name]["timings"])
@@ -0,0 +1,70 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ui.utils import display_tool_calls
+
+# Repaint a streaming response at most this often, in seconds
+RENDER_INTERVAL = 0.1
+# Or as soon as this many characters are waiting to be painted
+RENDER_MAX_PENDING_CHARS = 2000
+
+
+class StreamRenderer:
+    """Renders a streaming response, coalescing chunks into repaints on a time or size budget.
+
+    Streamlit repaints the whole markdown element on every update, so painting each token costs O(n²) and a
+    websocket message per token. Chunks are accumulated and painted every `interval` seconds, or once
+    `max_pending_chars` characters are waiting. Tool calls are repainted only when a call starts or finishes.
+    """
+
+    def __init__(
+        self,
+        response_container: Any,
+        tool_calls_container: Any,
+        interval: float = RENDER_INTERVAL,
+        max_pending_chars: int = RENDER_MAX_PENDING_CHARS,
+    ):
+        self.response_container = response_container
+        self.tool_calls_container = tool_calls_container
+        self.interval = interval
+        self.max_pending_chars = max_pending_chars
+
+        self.response: str = ""
+        self.chunks: int = 0
+        self.repaints: int = 0
+        self.tool_repaints: int = 0
+        self._pending_chars: int = 0
+        self._last_paint: float = 0.0
+        self._tools_state: Optional[Tuple[Tuple[Any, bool], ...]] = None
+
+    def add(self, content: Optional[str]) -> None:
+        """Add a chunk of the response, repainting if the budget is spent."""
+        if not content:
+            return
+        self.response += content
+        self.chunks += 1
+        self._pending_chars += len(content)
+        if self._pending_chars >= self.max_pending_chars or time.perf_counter() - self._last_paint >= self.interval:
+            self.flush()
+
+    def tools(self, tools: Optional[List[Dict[str, Any]]]) -> None:
+        """Repaint the tool calls if one started or finished since the last repaint."""
+        if not tools:
+            return
+        state = tuple(
+            (tool.get("tool_call_id") or index, tool.get("content") is not None) for index, tool in enumerate(tools)
+        )
+        if state == self._tools_state:
+            return
+        self._tools_state = state
+        self.tool_repaints += 1
+        display_tool_calls(self.tool_calls_container, tools)
+
+    def flush(self) -> None:
+        """Paint the chunks not painted yet."""
+        if self._pending_chars == 0:
+            return
+        self.response_container.markdown(self.response)
+        self.repaints += 1
+        self._pending_chars = 0
+        self._last_paint = time.perf_counter()
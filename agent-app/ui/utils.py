@@ -1,16 +1,23 @@
+from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional
 
 import streamlit as st
 from agno.agent import Agent
 from agno.document import Document
 from agno.document.reader import Reader
-from agno.document.reader.csv_reader import CSVReader
-from agno.document.reader.docx_reader import DocxReader
-from agno.document.reader.pdf_reader import PDFReader
-from agno.document.reader.text_reader import TextReader
-from agno.document.reader.website_reader import WebsiteReader
+from agno.storage.agent.postgres import PostgresAgentStorage
 from agno.utils.log import logger
 
+from agents.exports import chat_to_markdown, iter_chat_runs, to_json_array
+from agents.routing import AUTO_MODEL
+from knowledge import KnowledgeVectorDb
+from knowledge.jobs import ACTIVE_STATUSES, get_jobs, ingestion_jobs, reader_for
+
+# Messages rendered on a page, older ones are shown by "Load earlier messages" this many at a time
+HISTORY_WINDOW = 20
+# Seconds between refreshes of the upload progress while documents are loading
+INGESTION_POLL_INTERVAL = 2
+
 
 async def initialize_agent_session_state(agent_name: str):
     logger.info(f"---*--- Initializing session state for {agent_name} ---*---")
@@ -19,6 +26,10 @@ async def initialize_agent_session_state(agent_name: str):
             "agent": None,
             "session_id": None,
             "messages": [],
+            # Session whose runs are in messages, and how many of its runs were added
+            "history_session_id": None,
+            "history_runs": 0,
+            "history_window": HISTORY_WINDOW,
         }
 
 
@@ -27,6 +38,7 @@ async def selected_model() -> str:
     model_options = {
         "gpt-4o": "gpt-4o",
         "o3-mini": "o3-mini",
+        "auto (cheapest fit per message)": AUTO_MODEL,
     }
     selected_model = st.sidebar.selectbox(
         "Choose a model",
@@ -48,6 +60,69 @@ async def add_message(
     st.session_state[agent_name]["messages"].append({"role": role, "content": content, "tool_calls": tool_calls})
 
 
+async def hydrate_history(agent_name: str, agent: Agent) -> None:
+    """Add the agent's runs that are not in the page's messages yet.
+
+    Messages are rebuilt from the agent memory only when another session is loaded. On later reruns only the runs
+    added since are converted, so a rerun costs O(new runs) rather than O(session length).
+    """
+    state = st.session_state[agent_name]
+    if state.get("history_session_id") != agent.session_id:
+        logger.debug(f"Loading run history of session {agent.session_id}")
+        state["messages"] = []
+        state["history_session_id"] = agent.session_id
+        state["history_runs"] = 0
+        state["history_window"] = HISTORY_WINDOW
+
+    agent_runs = agent.memory.runs if agent.memory else []
+    for agent_run in agent_runs[state["history_runs"] :]:
+        if agent_run.message is not None:
+            await add_message(agent_name, agent_run.message.role, str(agent_run.message.content))
+        if agent_run.response is not None:
+            await add_message(agent_name, "assistant", str(agent_run.response.content), agent_run.response.tools)
+    state["history_runs"] = len(agent_runs)
+
+
+def mark_history_hydrated(agent_name: str, agent: Agent) -> None:
+    """Record that the runs in the agent memory are in the page's messages, e.g. after streaming a response."""
+    st.session_state[agent_name]["history_runs"] = len(agent.memory.runs) if agent.memory else 0
+
+
+def _load_earlier_messages(agent_name: str) -> None:
+    st.session_state[agent_name]["history_window"] += HISTORY_WINDOW
+
+
+async def display_messages(agent_name: str) -> None:
+    """Render the most recent messages, with a button to load earlier ones.
+
+    Tool calls of past messages are rendered only once their toggle is switched on, so the expanders and their
+    results are not rebuilt on every rerun.
+    """
+    state = st.session_state[agent_name]
+    messages = state["messages"]
+    start = max(0, len(messages) - state.get("history_window", HISTORY_WINDOW))
+    if start > 0:
+        st.button(
+            f"⬆️ Load earlier messages ({start} hidden)",
+            key=f"{agent_name}_load_earlier",
+            on_click=_load_earlier_messages,
+            args=(agent_name,),
+        )
+
+    for index in range(start, len(messages)):
+        message = messages[index]
+        if message["role"] not in ["user", "assistant"] or message["content"] is None:
+            continue
+        with st.chat_message(message["role"]):
+            tool_calls = message.get("tool_calls")
+            if tool_calls and st.toggle(
+                f"🛠️ Show tool calls ({len(tool_calls)})",
+                key=f"{agent_name}_tool_calls_{state.get('history_session_id')}_{index}",
+            ):
+                display_tool_calls(st.empty(), tool_calls)
+            st.markdown(message["content"])
+
+
 def display_tool_calls(tool_calls_container, tools):
     """Display tool calls in a streamlit container with expandable sections.
 
@@ -173,10 +248,21 @@ async def knowledge_widget(agent_name: str, agent: Agent) -> None:
             "Add URL to Knowledge Base", type="default", key=st.session_state[agent_name]["url_scrape_key"]
         )
         add_url_button = st.sidebar.button("Add URL")
-        if add_url_button:
+        vector_db = agent.knowledge.vector_db
+        if add_url_button and input_url and isinstance(vector_db, KnowledgeVectorDb):
+            # The whole site is crawled in the background, progress is shown below
+            try:
+                ingestion_jobs.submit_crawl(vector_db, input_url)
+            except RuntimeError as e:
+                st.sidebar.error(str(e))
+            else:
+                st.session_state[f"{vector_db.table_name}_ingestion_active"] = True
+        elif add_url_button:
             if input_url is not None:
                 alert = st.sidebar.info("Processing URLs...", icon="ℹ️")
                 if f"{input_url}_scraped" not in st.session_state:
+                    from agno.document.reader.website_reader import WebsiteReader
+
                     scraper = WebsiteReader(max_links=2, max_depth=1)
                     web_documents: List[Document] = scraper.read(input_url)
                     if web_documents:
@@ -194,21 +280,21 @@ async def knowledge_widget(agent_name: str, agent: Agent) -> None:
             key=st.session_state[agent_name]["file_uploader_key"],
         )
         if uploaded_file is not None:
-            alert = st.sidebar.info("Processing document...", icon="🧠")
             document_name = uploaded_file.name.split(".")[0]
-            if f"{document_name}_uploaded" not in st.session_state:
-                file_type = uploaded_file.name.split(".")[-1].lower()
-
-                reader: Reader
-                if file_type == "pdf":
-                    reader = PDFReader()
-                elif file_type == "csv":
-                    reader = CSVReader()
-                elif file_type == "txt":
-                    reader = TextReader()
-                elif file_type == "docx":
-                    reader = DocxReader()
-                else:
+            if f"{document_name}_uploaded" not in st.session_state and isinstance(vector_db, KnowledgeVectorDb):
+                # Parsed, embedded and stored in the background, progress is shown below
+                try:
+                    ingestion_jobs.submit(vector_db, uploaded_file.name, uploaded_file.getvalue())
+                except (ValueError, RuntimeError) as e:
+                    st.sidebar.error(str(e))
+                    return
+                st.session_state[f"{document_name}_uploaded"] = True
+                st.session_state[f"{vector_db.table_name}_ingestion_active"] = True
+            elif f"{document_name}_uploaded" not in st.session_state:
+                alert = st.sidebar.info("Processing document...", icon="🧠")
+                reader: Optional[Reader] = reader_for(uploaded_file.name)
+                if reader is None:
+                    alert.empty()
                     st.sidebar.error("Unsupported file type")
                     return
                 uploaded_file_documents: List[Document] = reader.read(uploaded_file)
@@ -217,14 +303,78 @@ async def knowledge_widget(agent_name: str, agent: Agent) -> None:
                 else:
                     st.sidebar.error("Could not read document")
                 st.session_state[f"{document_name}_uploaded"] = True
-            alert.empty()
+                alert.empty()
+
+        # Progress of the documents loading in the background
+        if isinstance(vector_db, KnowledgeVectorDb):
+            ingestion_progress(vector_db)
+
+        # Delete documents from the user's namespace
+        if isinstance(vector_db, KnowledgeVectorDb):
+            document_names = vector_db.document_names()
+            if document_names:
+                document_name = st.sidebar.selectbox("Your documents", options=document_names)
+                if st.sidebar.button("🗑️ Delete Document"):
+                    if vector_db.delete_document(document_name):
+                        st.sidebar.success(f"Deleted {document_name}")
+                    else:
+                        st.sidebar.error(f"Could not delete {document_name}")
 
-        # Load and delete knowledge
         if st.sidebar.button("🗑️ Delete Knowledge"):
             agent.knowledge.delete()
             st.sidebar.success("Knowledge deleted!")
 
 
+def _show_ingestion_jobs(table_name: str, namespace: str) -> None:
+    try:
+        jobs = get_jobs(table_name, namespace)
+    except Exception as e:
+        logger.warning(f"Could not read ingestion jobs: {e}")
+        return
+
+    active_jobs = [job for job in jobs if job.status in ACTIVE_STATUSES]
+    for job in active_jobs:
+        progress = job.chunks_stored / job.chunks_parsed if job.chunks_parsed else 0.0
+        if job.kind == "crawl":
+            text = (
+                f"{job.file_name}: {job.pages_crawled} pages crawled, "
+                f"{job.chunks_stored} of {job.chunks_parsed} chunks stored"
+            )
+        else:
+            text = (
+                f"{job.file_name}: {job.chunks_parsed} chunks parsed, {job.chunks_embedded} embedded, "
+                f"{job.chunks_stored} stored"
+            )
+        st.progress(progress, text=text)
+    recently = datetime.now(timezone.utc) - timedelta(minutes=5)
+    for job in jobs:
+        if job.status == "failed" and job.updated_at > recently:
+            st.error(f"Could not load {job.file_name}: {job.error}")
+
+    # Rerun the whole page when loading starts or ends, to start or stop polling and refresh the documents list
+    active_key = f"{table_name}_ingestion_active"
+    if st.session_state.get(active_key, False) != bool(active_jobs):
+        st.session_state[active_key] = bool(active_jobs)
+        st.rerun()
+
+
+@st.fragment(run_every=INGESTION_POLL_INTERVAL)
+def _poll_ingestion_jobs(table_name: str, namespace: str) -> None:
+    _show_ingestion_jobs(table_name, namespace)
+
+
+def ingestion_progress(vector_db: KnowledgeVectorDb) -> None:
+    """Show the progress of the user's uploads and crawls in the sidebar.
+
+    While a document is loading, only this fragment reruns to refresh the progress, so the chat stays responsive.
+    """
+    with st.sidebar:
+        if st.session_state.get(f"{vector_db.table_name}_ingestion_active"):
+            _poll_ingestion_jobs(vector_db.table_name, vector_db.namespace)
+        else:
+            _show_ingestion_jobs(vector_db.table_name, vector_db.namespace)
+
+
 async def session_selector(agent_name: str, agent: Agent, get_agent: Callable, user_id: str, model_id: str) -> None:
     """Display a session selector in the sidebar, if a new session is selected, the agent is restarted with the new session."""
 
@@ -304,32 +454,22 @@ async def session_selector(agent_name: str, agent: Agent, get_agent: Callable, u
         st.sidebar.error("Failed to load sessions")
 
 
-def export_chat_history(agent_name: str):
-    """Export chat history in markdown format.
+def export_chat_history(agent_name: str, agent: Agent, format: str = "md") -> str:
+    """Export the chat history of the agent's session, read from storage, as markdown or JSON.
 
     Returns:
-        str: Formatted markdown string of the chat history
+        str: The formatted chat history
     """
-    if "messages" not in st.session_state[agent_name] or not st.session_state[agent_name]["messages"]:
+    if not isinstance(agent.storage, PostgresAgentStorage) or agent.session_id is None:
         return f"# {agent_name} - Chat History\n\nNo messages to export."
+    runs = iter_chat_runs(agent.storage.table_name, agent.session_id)
+    if format == "json":
+        return "".join(to_json_array(runs))
+    return "".join(chat_to_markdown(runs, agent_name))
 
-    chat_text = f"# {agent_name} - Chat History\n\n"
-    for msg in st.session_state[agent_name]["messages"]:
-        role_label = "🤖 Assistant" if msg["role"] == "assistant" else "👤 User"
-        chat_text += f"### {role_label}\n{msg['content']}\n\n"
-
-        # Include tool calls if present
-        if msg.get("tool_calls"):
-            chat_text += "#### Tool Calls:\n"
-            for i, tool_call in enumerate(msg["tool_calls"]):
-                tool_name = tool_call.get("name", "Unknown Tool")
-                chat_text += f"**{i + 1}. {tool_name}**\n\n"
-                if "arguments" in tool_call:
-                    chat_text += f"Arguments: ```json\n{tool_call['arguments']}\n```\n\n"
-                if "content" in tool_call:
-                    chat_text += f"Results: ```\n{tool_call['content']}\n```\n\n"
 
-    return chat_text
+def _request_export(agent_name: str) -> None:
+    st.session_state[agent_name]["export_requested"] = True
 
 
 async def utilities_widget(agent_name: str, agent: Agent) -> None:
@@ -339,16 +479,22 @@ async def utilities_widget(agent_name: str, agent: Agent) -> None:
     with col1:
         if st.button("🔄 Start New Chat"):
             restart_agent(agent_name)
-    with col2:
-        fn = f"{agent_name}_chat_history.md"
-        if "session_id" in st.session_state[agent_name]:
-            fn = f"{agent_name}_{st.session_state[agent_name]['session_id']}.md"
-        if st.download_button(
-            ":file_folder: Export Chat History",
-            export_chat_history(agent_name),
+    # Chat history is exported straight from the Postgres storage table
+    can_export = isinstance(agent.storage, PostgresAgentStorage)
+    if can_export:
+        with col2:
+            # The export is only built once asked for, not on every rerun
+            st.button(":file_folder: Export Chat History", on_click=_request_export, args=(agent_name,))
+    if can_export and st.session_state[agent_name].get("export_requested"):
+        export_format = st.sidebar.radio("Format", ["md", "json"], horizontal=True, key=f"{agent_name}_export_format")
+        fn = f"{agent_name}_{st.session_state[agent_name].get('session_id') or 'chat_history'}.{export_format}"
+        if st.sidebar.download_button(
+            "⬇️ Download",
+            export_chat_history(agent_name, agent, export_format),
             file_name=fn,
-            mime="text/markdown",
+            mime="application/json" if export_format == "json" else "text/markdown",
         ):
+            st.session_state[agent_name]["export_requested"] = False
             st.sidebar.success("Chat history exported!")
 
 
@@ -357,6 +503,8 @@ def restart_agent(agent_name: str):
     st.session_state[agent_name]["agent"] = None
     st.session_state[agent_name]["session_id"] = None
     st.session_state[agent_name]["messages"] = []
+    st.session_state[agent_name]["history_session_id"] = None
+    st.session_state[agent_name]["history_runs"] = 0
     if "url_scrape_key" in st.session_state[agent_name]:
         st.session_state[agent_name]["url_scrape_key"] += 1
     if "file_uploader_key" in st.session_state[agent_name]:
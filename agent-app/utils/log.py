@@ -1,12 +1,93 @@
+"""Logging of the app and of agno.
+
+In dev, records go to a RichHandler. Elsewhere they are written as JSON lines, one object per record. Either way
+the record is only put on a queue in the calling thread. A QueueListener thread formats and writes it, so log I/O
+stays off the request path. DEBUG records can be sampled, as agents in debug mode log whole prompts and responses.
+The level, format and sampling come from RUNTIME_ENV and the LOG_* settings in `utils/settings.py`.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional, TextIO, Tuple
 
+from agno.utils.log import LOGGER_NAME, TEAM_LOGGER_NAME
+from rich.console import Console
 from rich.logging import RichHandler
 
+from utils.settings import observability_settings
 
-def get_logger(logger_name: str) -> logging.Logger:
+# agno's loggers, configured alongside the app's so their records take the same path
+AGNO_LOGGER_NAMES = (LOGGER_NAME, TEAM_LOGGER_NAME)
+# Attributes every LogRecord has, anything else was passed in `extra` and is added to the JSON object
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class RecordQueueHandler(QueueHandler):
+    """Queues records without formatting them, so the listener's handler formats them and their exception.
+
+    `QueueHandler.prepare` formats the whole record in the calling thread, with its traceback folded into the
+    message and `exc_info` cleared.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Only the message is resolved here, its arguments may change before the listener writes it
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class DebugSampler(logging.Filter):
+    """Keeps a `ratio` of DEBUG records, chosen at random, and every record of a higher level."""
+
+    def __init__(self, ratio: float):
+        super().__init__()
+        self.ratio = ratio
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.ratio >= 1 or random.random() < self.ratio
+
+
+def get_output_handler(log_format: str, stream: Optional[TextIO] = None) -> logging.Handler:
+    """The handler that writes records to `stream`, stderr by default, run by the queue listener."""
+    if log_format == "json":
+        handler: logging.Handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        return handler
     # https://rich.readthedocs.io/en/latest/reference/logging.html#rich.logging.RichHandler
     # https://rich.readthedocs.io/en/latest/logging.html#handle-exceptions
     rich_handler = RichHandler(
+        console=Console(file=stream) if stream is not None else None,
         show_time=False,
         rich_tracebacks=False,
         show_path=True,
@@ -18,11 +99,53 @@ def get_logger(logger_name: str) -> logging.Logger:
             datefmt="[%X]",
         )
     )
+    return rich_handler
 
-    _logger = logging.getLogger(logger_name)
-    _logger.addHandler(rich_handler)
-    _logger.setLevel(logging.DEBUG)
+
+def get_queue_handler(output_handler: logging.Handler, debug_sample_ratio: float) -> Tuple[QueueHandler, QueueListener]:
+    """A handler that queues records for `output_handler`, and the started listener that writes them."""
+    queue: SimpleQueue = SimpleQueue()
+    queue_handler = RecordQueueHandler(queue)
+    # Sample before queueing, so dropped records cost nothing more
+    queue_handler.addFilter(DebugSampler(debug_sample_ratio))
+    listener = QueueListener(queue, output_handler, respect_handler_level=False)
+    listener.start()
+    return queue_handler, listener
+
+
+def configure_logging() -> None:
+    """Route the app's and agno's loggers through a queue to the output handler of the runtime environment.
+
+    Safe to call more than once, only the first call configures logging.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    _queue_handler, listener = get_queue_handler(
+        get_output_handler(observability_settings.get_log_format()),
+        observability_settings.get_log_debug_sample_ratio(),
+    )
+    # Write what is still queued when the process exits
+    atexit.register(listener.stop)
+    # Agents set the level of agno's loggers from their debug mode
+    for name in AGNO_LOGGER_NAMES:
+        _use_queue(logging.getLogger(name))
+
+
+def _use_queue(_logger: logging.Logger) -> None:
+    assert _queue_handler is not None
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+    _logger.addHandler(_queue_handler)
     _logger.propagate = False
+
+
+def get_logger(logger_name: str) -> logging.Logger:
+    configure_logging()
+    _logger = logging.getLogger(logger_name)
+    _use_queue(_logger)
+    _logger.setLevel(observability_settings.get_log_level())
     return _logger
 
 
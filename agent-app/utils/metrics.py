@@ -0,0 +1,145 @@
+"""Prometheus metrics of the app, served by the API at /metrics.
+
+The API records agent runs, the tools they call and their tokens. The database engine records pool checkouts and
+caches record their lookups. With several worker processes, e.g. `uvicorn --workers 2`, set
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers. Each process then writes its samples there
+and a scrape of any worker aggregates all of them.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+run_seconds = Histogram(
+    "agent_run_seconds",
+    "Duration of agent runs",
+    ["agent", "model", "status"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300),
+)
+time_to_first_token_seconds = Histogram(
+    "agent_time_to_first_token_seconds",
+    "Time from the start of a streamed agent run to its first content",
+    ["agent", "model"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+run_tokens = Counter("agent_tokens", "Tokens used by agent runs", ["agent", "model", "type"])
+# Summed over the live processes
+runs_in_flight = Gauge("agent_runs_in_flight", "Agent runs in progress", ["agent"], multiprocess_mode="livesum")
+tool_calls = Counter("agent_tool_calls", "Tool calls made by agent runs", ["tool", "status"])
+tool_call_seconds = Histogram(
+    "agent_tool_call_seconds",
+    "Duration of tool calls made by agent runs",
+    ["tool"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+db_pool_checkouts = Counter("db_pool_checkouts", "Connections checked out of the database pool")
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time waited for a connection from the database pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out_connections", "Connections currently checked out", multiprocess_mode="livesum"
+)
+# The hit ratio of a cache is rate(hits) / rate(hits + misses)
+cache_lookups = Counter("cache_lookups", "Cache lookups", ["cache", "result"])
+
+
+def record_cache_lookup(cache: Optional[str], hit: bool) -> None:
+    if cache is not None:
+        cache_lookups.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_tool_calls(tools: Optional[List[Dict[str, Any]]]) -> None:
+    """Count the tool calls of a run and observe their durations."""
+    for tool in tools or []:
+        tool_name = tool.get("tool_name")
+        if tool_name is None or "content" not in tool:
+            # Started but not finished
+            continue
+        tool_calls.labels(tool=tool_name, status="error" if tool.get("tool_call_error") else "ok").inc()
+        metrics = tool.get("metrics")
+        elapsed = getattr(metrics, "time", None) if not isinstance(metrics, dict) else metrics.get("time")
+        if elapsed is not None:
+            tool_call_seconds.labels(tool=tool_name).observe(elapsed)
+
+
+class RunTracker:
+    """Times one agent run, see `track_run`."""
+
+    def __init__(self, agent_id: str, agent: Any):
+        self.agent_id = agent_id
+        self.agent = agent
+        self.start = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+
+    @property
+    def model_id(self) -> str:
+        # Read when the run ends, routed runs may have moved to another model
+        model = getattr(self.agent, "model", None)
+        return getattr(model, "id", None) or "unknown"
+
+    def first_token(self) -> None:
+        """Call on every chunk of content, only the first one is recorded."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            time_to_first_token_seconds.labels(agent=self.agent_id, model=self.model_id).observe(
+                self.first_token_at - self.start
+            )
+
+    def finish(self, status: str) -> None:
+        model_id = self.model_id
+        run_seconds.labels(agent=self.agent_id, model=model_id, status=status).observe(time.perf_counter() - self.start)
+        run_response = getattr(self.agent, "run_response", None)
+        if run_response is None or status != "ok":
+            return
+        metrics = run_response.metrics or {}
+        for token_type in ("input_tokens", "output_tokens"):
+            tokens = sum(metrics.get(token_type, []))
+            if tokens:
+                run_tokens.labels(agent=self.agent_id, model=model_id, type=token_type.split("_")[0]).inc(tokens)
+        record_tool_calls(run_response.tools)
+
+
+@contextmanager
+def track_run(agent_id: str, agent: Any) -> Iterator[RunTracker]:
+    """Record an agent run: in flight while the block runs, then its duration, tokens and tool calls."""
+    tracker = RunTracker(agent_id, agent)
+    runs_in_flight.labels(agent=agent_id).inc()
+    status = "error"
+    try:
+        yield tracker
+        status = "ok"
+    finally:
+        runs_in_flight.labels(agent=agent_id).dec()
+        tracker.finish(status)
+
+
+def latest_metrics() -> bytes:
+    """The metrics in the Prometheus text format, of all worker processes in multiprocess mode."""
+    if os.getenv(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this process from the multiprocess samples, call when a worker exits."""
+    if os.getenv(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
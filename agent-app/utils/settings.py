@@ -0,0 +1,55 @@
+import logging
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class ObservabilitySettings(BaseSettings):
+    """Observability settings that can be set using environment variables.
+
+    Reference: https://docs.pydantic.dev/latest/usage/pydantic_settings/
+    """
+
+    # Runtime environment: "dev", "stg" or "prd". Sets the defaults of the logging settings below.
+    runtime_env: str = "dev"
+    # Log level name, defaults to DEBUG in dev and INFO elsewhere
+    log_level: Optional[str] = None
+    # "rich" for colored console output or "json" for one JSON object per line, defaults to rich in dev only
+    log_format: Optional[str] = None
+    # Share of DEBUG records kept, defaults to all in dev and 1 in 10 elsewhere. Other levels are never sampled.
+    log_debug_sample_ratio: Optional[float] = None
+    # Debug mode of the agents, which logs prompts, responses and tool calls of every run. Defaults to on in dev only.
+    agent_debug_mode: Optional[bool] = None
+
+    # Where spans are exported: "otlp", "file", "console" or "none". "otlp" sends them to the collector set with
+    # the standard OTEL_EXPORTER_OTLP_* variables. Needs the optional `tracing` dependencies.
+    tracing_exporter: str = "none"
+    # File the "file" exporter appends spans to, one JSON object per line
+    tracing_file_path: str = "traces.jsonl"
+    # Share of runs traced. Spans of a run are sampled together, with their root span.
+    tracing_sample_ratio: float = 1.0
+    tracing_service_name: str = "agent-app"
+
+    @property
+    def is_dev(self) -> bool:
+        return self.runtime_env == "dev"
+
+    def get_log_level(self) -> int:
+        if self.log_level is not None:
+            return logging.getLevelName(self.log_level.upper())
+        return logging.DEBUG if self.is_dev else logging.INFO
+
+    def get_log_format(self) -> str:
+        return self.log_format or ("rich" if self.is_dev else "json")
+
+    def get_log_debug_sample_ratio(self) -> float:
+        if self.log_debug_sample_ratio is not None:
+            return self.log_debug_sample_ratio
+        return 1.0 if self.is_dev else 0.1
+
+    def get_agent_debug_mode(self) -> bool:
+        return self.agent_debug_mode if self.agent_debug_mode is not None else self.is_dev
+
+
+# Create ObservabilitySettings object
+observability_settings = ObservabilitySettings()
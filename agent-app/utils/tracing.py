@@ -0,0 +1,177 @@
+"""OpenTelemetry tracing of agent runs.
+
+Every API or UI run has an `agent.run` root span, with child spans for each model call (`model.invoke`), tool
+call (`tool.<name>`), knowledge search (`knowledge.search`), web search (`web.search`), ContactOut enrichment made by
+a pipeline tool (`contactout.enrich`) and session storage read or write (`storage.read`, `storage.upsert`). Spans
+carry attributes such as tokens, HTTP status and cache hits.
+
+Tracing is off unless TRACING_EXPORTER is set and the optional `tracing` dependencies are installed
+(`pip install -e ".[tracing]"`). When it is off, `span` only costs a function call. When it is on, spans are
+exported in batches from a background thread and runs are sampled with TRACING_SAMPLE_RATIO, so tracing can be
+left on in production.
+"""
+
+import json
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import copy_context
+from functools import lru_cache, wraps
+from inspect import isasyncgenfunction, iscoroutinefunction
+from threading import Lock
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from agno.utils.log import logger
+
+from utils.settings import observability_settings
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:
+    trace = None  # type: ignore
+    SpanExporter = object  # type: ignore
+
+
+class NoopSpan:
+    """Stands in for a span when tracing is off."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException, **kwargs: Any) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class JsonLinesSpanExporter(SpanExporter):  # type: ignore
+    """Appends finished spans to a file, one JSON object per line, for offline use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+
+    def export(self, spans: Sequence["ReadableSpan"]) -> "SpanExportResult":
+        lines = "".join(json.dumps(json.loads(span.to_json())) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+@lru_cache(maxsize=None)
+def get_tracer() -> Optional[Any]:
+    """The app's tracer, None if tracing is off or its dependencies are not installed."""
+    exporter_name = observability_settings.tracing_exporter
+    if exporter_name == "none":
+        return None
+    if trace is None:
+        logger.warning(f'TRACING_EXPORTER is "{exporter_name}" but opentelemetry is not installed, tracing is off')
+        return None
+
+    if exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter: SpanExporter = OTLPSpanExporter()
+    elif exporter_name == "file":
+        exporter = JsonLinesSpanExporter(observability_settings.tracing_file_path)
+    elif exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        raise ValueError(f"Unknown tracing exporter: {exporter_name}")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": observability_settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(observability_settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer("agent-app")
+
+
+def _attributes(attributes: dict) -> dict:
+    # Span attributes are primitives and never None
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Trace the block as a child of the current span. Exceptions are recorded on the span and raised."""
+    tracer = get_tracer()
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    with tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def submit_in_context(executor: Executor, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+    """Submit `fn` to a thread pool with a copy of the current context, so the spans it starts are children of the
+    current span. Without it, the work runs outside the span and its attributes are dropped."""
+    return executor.submit(copy_context().run, fn, *args, **kwargs)
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span, e.g. the HTTP status of a call made by a tool."""
+    if get_tracer() is not None:
+        trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+@contextmanager
+def run_span(agent_id: str, agent: Any, **attributes: Any) -> Iterator[Any]:
+    """The root span of an agent run, with the model that served it and its tokens once it is done."""
+    with span("agent.run", agent=agent_id, session_id=agent.session_id, **attributes) as current:
+        yield current
+        model = getattr(agent, "model", None)
+        run_response = getattr(agent, "run_response", None)
+        metrics = (run_response.metrics if run_response is not None else None) or {}
+        current.set_attributes(
+            _attributes(
+                {
+                    "model": getattr(model, "id", None),
+                    "input_tokens": sum(metrics.get("input_tokens", [])),
+                    "output_tokens": sum(metrics.get("output_tokens", [])),
+                    "tool_calls": len(run_response.tools or []) if run_response is not None else 0,
+                }
+            )
+        )
+
+
+def traced_tool(name: str, entrypoint: Callable) -> Callable:
+    """`entrypoint` of a tool, called in a `tool.<name>` span."""
+    if get_tracer() is None or isasyncgenfunction(entrypoint):
+        return entrypoint
+
+    if iscoroutinefunction(entrypoint):
+
+        @wraps(entrypoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(f"tool.{name}", tool=name):
+                return await entrypoint(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(entrypoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(f"tool.{name}", tool=name):
+            return entrypoint(*args, **kwargs)
+
+    return wrapper
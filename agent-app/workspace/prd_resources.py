@@ -233,7 +233,8 @@ prd_fastapi = FastApi(
     load_balancer_security_groups=[prd_lb_sg],
     create_load_balancer=True,
     health_check_path="/v1/health",
-    env_vars=container_env,
+    # The API workers share their metrics through this directory
+    env_vars={**container_env, "PROMETHEUS_MULTIPROC_DIR": "/tmp/prometheus"},
     skip_delete=skip_delete,
     save_output=save_output,
     # Do not wait for the service to stabilize